@@ -0,0 +1,339 @@
+"""Offline benchmark: drive the bot's real handlers with fake Discord objects.
+
+Nothing connects to Discord. The cogs are loaded as setup_hook would load
+them, and their slash command callbacks and event handlers are called
+directly with stand-in interactions, channels and voice states. The quote and cat APIs are served by a local aiohttp stub, and state
+goes to a throwaway SQLite file. Every user count runs in a fresh process,
+so the peak RSS figures only hold that run's state and the cold start
+figures include every import.
+
+    python benchmark.py                       # 1k and 10k users
+    python benchmark.py --users 1000,10000,100000 --json
+"""
+import argparse
+import asyncio
+import functools
+import importlib
+import itertools
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from aiohttp import web
+
+GUILD_ID = 1
+STUDY_ROOM_ID = 100
+TEXT_CHANNEL_ID = 200
+
+
+# Stand-ins for the discord.py objects the handlers touch
+
+_ids = itertools.count(10_000)
+
+
+class FakeMessage:
+    def __init__(self, channel, embed=None):
+        self.id = next(_ids)
+        self.channel = channel
+        self.embed = embed
+
+    async def edit(self, embed=None, **kwargs):
+        self.embed = embed
+
+    async def delete(self):
+        pass
+
+
+class FakeChannel:
+    def __init__(self, channel_id, guild):
+        self.id = channel_id
+        self.guild = guild
+
+    async def send(self, content=None, embed=None, **kwargs):
+        return FakeMessage(self, embed)
+
+    async def create_thread(self, **kwargs):
+        return FakeChannel(next(_ids), self.guild)
+
+
+class FakeGuild:
+    def __init__(self, guild_id):
+        self.id = guild_id
+        self.channels = {}
+        self._voice_states = {}
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def get_member(self, member_id):
+        return None
+
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def send_message(self, content=None, embed=None, **kwargs):
+        self._done = True
+        self._interaction.message = FakeMessage(self._interaction.channel, embed)
+
+    async def defer(self, **kwargs):
+        self._done = True
+
+    async def edit_message(self, embed=None, **kwargs):
+        self._done = True
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self._interaction = interaction
+
+    async def send(self, content=None, embed=None, wait=False, **kwargs):
+        return FakeMessage(self._interaction.channel, embed)
+
+
+class FakeInteraction:
+    def __init__(self, user, guild, channel):
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id
+        self.channel = channel
+        self.channel_id = channel.id
+        self.message = None
+        self.extras = {}
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def original_response(self):
+        return self.message
+
+
+def fake_user(user_id, guild):
+    return SimpleNamespace(
+        id=user_id, name=f"user{user_id}", display_name=f"User {user_id}", mention=f"<@{user_id}>",
+        bot=False, guild=guild,
+    )
+
+
+# Local stand-in for ZenQuotes, cataas and meowfacts
+
+async def start_api_stub():
+    cat_bytes = b'\xff\xd8\xff' + os.urandom(20_000)
+
+    async def quotes(request):
+        return web.json_response([{"q": f"Quote {random.random()}", "a": "Stub"} for _ in range(50)])
+
+    async def cat(request):
+        return web.Response(body=cat_bytes, content_type='image/jpeg')
+
+    async def fact(request):
+        return web.json_response({"data": [f"Cat fact {random.random()}"]})
+
+    app = web.Application()
+    app.router.add_get('/api/quotes', quotes)
+    app.router.add_get('/cat', cat)
+    app.router.add_get('/cat/gif', cat)
+    app.router.add_get('/meowfacts', fact)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+# Benchmark runs
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def measure(name, calls):
+    """Await every zero-argument coroutine function in ``calls`` in turn and time each one."""
+    latencies = []
+    started = time.perf_counter()
+    for call in calls:
+        call_started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "scenario": name,
+        "ops": len(latencies),
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_us": percentile(latencies, 0.5) * 1e6,
+        "p99_us": percentile(latencies, 0.99) * 1e6,
+    }
+
+
+def slash(bot, name):
+    """The callback of slash command ``name``, bound to its cog."""
+    command = bot.tree.get_command(name)
+    return functools.partial(command.callback, command.binding)
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # ru_maxrss is in KiB on Linux
+
+
+async def run_scale(users, max_ops):
+    """Run every scenario for ``users`` users; called in a fresh process by ``main``."""
+    # Cold start without the gateway: importing the entry point, then what setup_hook does before connecting
+    import_started = time.perf_counter()
+    importlib.import_module('main')  # Timed for its side effects: the entry point loads .env and sets up logging
+    from studybot import core
+    imported = time.perf_counter()
+
+    from studybot.bot_logging import setup_logging
+
+    setup_logging(level='WARNING')
+    stub, base_url = await start_api_stub()
+    setup_started = time.perf_counter()
+    await asyncio.to_thread(core.session_store.open)
+    await core.restore_state()
+    core.session_store.start()
+    await core.http_client.start()
+    await core.load_extensions(core.bot)
+    startup = {"import_s": imported - import_started, "setup_s": time.perf_counter() - setup_started}
+
+    from studybot.cogs import cat as cat_cog, motivation, pomodoro, study
+    motivation.ZENQUOTES_API_URL = f"{base_url}/api/quotes"
+    cat_cog.CATAAS_API_URL = f"{base_url}/cat"
+    cat_cog.CATAAS_GIF_API_URL = f"{base_url}/cat/gif"
+    cat_cog.MEOW_FACTS_API_URL = f"{base_url}/meowfacts"
+    bot = core.bot
+
+    guild = FakeGuild(GUILD_ID)
+    study_room = guild.channels[STUDY_ROOM_ID] = FakeChannel(STUDY_ROOM_ID, guild)
+    text_channel = guild.channels[TEXT_CHANNEL_ID] = FakeChannel(TEXT_CHANNEL_ID, guild)
+    core.guilds[GUILD_ID].tracked_channels.add(STUDY_ROOM_ID)
+    members = [fake_user(user_id, guild) for user_id in range(1, users + 1)]
+    sample = random.Random(users)
+    rss_before = peak_rss_mb()
+    results = []
+
+    def interaction(member):
+        return FakeInteraction(member, guild, text_channel)
+
+    joined, left = SimpleNamespace(channel=study_room), SimpleNamespace(channel=None)
+    on_voice_state_update = bot.get_cog('Study').on_voice_state_update
+    results.append(await measure("voice join", [
+        lambda member=member: on_voice_state_update(member, left, joined) for member in members
+    ]))
+    # Let every session run for a while so the leaderboard has distinct totals
+    for member in members:
+        core.guilds[GUILD_ID].voice_channel_start_times[str(member.id)] -= sample.randrange(60, 36_000)
+    results.append(await measure("voice leave", [
+        lambda member=member: on_voice_state_update(member, joined, left) for member in members
+    ]))
+
+    add_task = slash(bot, 'add_task')
+    results.append(await measure("/add_task", [
+        lambda member=member: add_task(interaction(member), "read chapter 3, flashcards, past paper")
+        for member in members
+    ]))
+    mark_done = slash(bot, 'mark_tasks_done')
+    results.append(await measure("/mark_tasks_done", [
+        lambda member=member: mark_done(interaction(member), "1, 2") for member in members
+    ]))
+
+    readers = [sample.choice(members) for _ in range(min(users, max_ops))]
+    results.append(await measure("/show_leaderboard", [
+        lambda member=member: study.send_leaderboard(text_channel, interaction=interaction(member))
+        for member in readers
+    ]))
+
+    start_pomodoro = slash(bot, 'pomodoro')
+    starters = members[:min(users, max_ops)]
+    results.append(await measure("/pomodoro", [
+        lambda member=member: start_pomodoro(interaction(member), 25, 5) for member in starters
+    ]))
+    for session in list(pomodoro.user_timers.values()):
+        session.cancel()
+
+    await motivation.quote_buffer.refill()
+    motivate = slash(bot, 'motivate')
+    results.append(await measure("/motivate", [
+        lambda: motivate(interaction(members[0])) for _ in range(min(users, max_ops, 1000))
+    ]))
+
+    await cat_cog.cat_media_cache.prefetch()
+    cat = slash(bot, 'cat')
+    results.append(await measure("/cat", [
+        lambda: cat(interaction(members[0])) for _ in range(min(users, max_ops, 1000))
+    ]))
+
+    await core.session_store.flush()
+    memory = {"peak_rss_mb": peak_rss_mb(), "peak_rss_growth_mb": peak_rss_mb() - rss_before}
+    await core.http_client.close()
+    await core.session_store.close()
+    await stub.cleanup()
+    return {"users": users, "startup": startup, "results": results, "memory": memory}
+
+
+def run_in_subprocess(users, max_ops):
+    with tempfile.TemporaryDirectory(prefix='studybot_bench_') as directory:
+        env = dict(os.environ)
+        env.update({
+            'DATABASE_PATH': os.path.join(directory, 'bench.db'),
+            'CAT_CACHE_DIR': os.path.join(directory, 'cat_cache'),
+            'KEEP_ALIVE': '0',
+            'SHARD_COUNT': '0',
+        })
+        env.pop('SHARD_IDS', None)
+        env.pop('PROFILE_SLOW_CALLBACKS', None)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', str(users), '--max-ops', str(max_ops)],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_report(runs):
+    print(f"{'users':>8} {'scenario':<18} {'ops':>8} {'ops/sec':>10} {'p50 us':>9} {'p99 us':>9}")
+    for run in runs:
+        for result in run["results"]:
+            print(f"{run['users']:>8} {result['scenario']:<18} {result['ops']:>8} {result['ops_per_sec']:>10.0f}"
+                  f" {result['p50_us']:>9.1f} {result['p99_us']:>9.1f}")
+        startup = run["startup"]
+        print(f"{run['users']:>8} {'cold start':<18} import {startup['import_s'] * 1000:.0f} ms,"
+              f" setup {startup['setup_s'] * 1000:.0f} ms (without the gateway)")
+        memory = run["memory"]
+        print(f"{run['users']:>8} {'peak RSS':<18} {memory['peak_rss_mb']:.1f} MiB"
+              f" (+{memory['peak_rss_growth_mb']:.1f} MiB while running)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', default='1000,10000', help="Comma-separated user counts to run")
+    parser.add_argument('--max-ops', type=int, default=10_000, help="Cap for scenarios that do not scale with users")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(asyncio.run(run_scale(args.worker, args.max_ops))))
+        return
+
+    runs = [run_in_subprocess(int(users), args.max_ops) for users in args.users.split(',')]
+    if args.json:
+        print(json.dumps(runs, indent=2))
+    else:
+        print_report(runs)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +0,0 @@
-from flask import Flask
-from threading import Thread
-
-app = Flask('')
-
-@app.route('/')
-def home():
-    return "Yes, Thank God I'm alive :)"
-
-def run():
-    app.run(host='0.0.0.0', port=8080)
-
-def keep_alive():
-    thread = Thread(target=run)
-    thread.start()
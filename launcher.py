@@ -0,0 +1,81 @@
+"""Run the bot as several AutoShardedBot processes on one machine.
+
+Shards are spread round-robin over ``WORKERS`` processes (default: one per
+CPU core). Every worker runs main.py with its own ``SHARD_IDS`` and shares
+the SQLite session store, which also serves the cross-server leaderboard.
+The launcher itself serves the health server on ``PORT`` (``/ready`` reports
+whether every worker is alive) and restarts workers that crash; worker ``n``
+serves its own health server and ``/metrics`` on ``PORT + 1 + n``.
+"""
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import sys
+
+from dotenv import load_dotenv
+
+from studybot.bot_logging import setup_logging
+from studybot.keep_alive import HealthServer
+
+logger = logging.getLogger(__name__)
+
+RESTART_DELAY = 5  # Seconds to wait before restarting a crashed worker
+
+
+def plan_workers(shard_count, workers):
+    """Split shard IDs 0..shard_count-1 round-robin into at most ``workers`` groups."""
+    workers = max(1, min(workers, shard_count))
+    return [list(range(worker, shard_count, workers)) for worker in range(workers)]
+
+
+def start_worker(index, shard_ids, shard_count):
+    env = dict(os.environ)
+    env['SHARD_COUNT'] = str(shard_count)
+    env['SHARD_IDS'] = ','.join(str(shard_id) for shard_id in shard_ids)
+    env['PORT'] = str(int(os.getenv('PORT', '8080')) + 1 + index)  # For the worker's /metrics
+    logger.info("Starting worker for shards %s of %s", env['SHARD_IDS'], shard_count)
+    return subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')], env=env)
+
+
+async def supervise(plan, shard_count):
+    processes = [start_worker(i, shard_ids, shard_count) for i, shard_ids in enumerate(plan)]
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopping.set)
+
+    server = HealthServer(readiness=lambda: {
+        f"worker_{i}": process.poll() is None for i, process in enumerate(processes)
+    })
+    await server.start()
+    try:
+        while not stopping.is_set():
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=1)
+            except asyncio.TimeoutError:
+                pass
+            for i, process in enumerate(processes):
+                if process.poll() is not None and not stopping.is_set():
+                    logger.warning("Worker for shards %s exited with %s, restarting", plan[i], process.returncode)
+                    await asyncio.sleep(RESTART_DELAY)
+                    processes[i] = start_worker(i, plan[i], shard_count)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            await asyncio.to_thread(process.wait)
+        await server.stop()
+
+
+def main():
+    load_dotenv()
+    setup_logging()
+    workers = int(os.getenv('WORKERS', '0')) or os.cpu_count() or 1
+    shard_count = int(os.getenv('SHARD_COUNT', '0')) or workers
+    asyncio.run(supervise(plan_workers(shard_count, workers), shard_count))
+
+
+if __name__ == '__main__':
+    main()
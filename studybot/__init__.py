@@ -0,0 +1,10 @@
+"""The study bot: shared services in ``core``, one extension per feature in ``cogs``.
+
+The building blocks both use (session store, per-server state, schedulers,
+rate limits, caches, metrics, logging) are the other modules of this package.
+
+Importing ``studybot.core`` builds the bot and the state every feature
+shares (session store, per-server state, HTTP client, metrics). The features
+themselves are only imported when ``core.load_extensions`` loads them from
+``setup_hook``, so ``COGS`` can leave out features a deployment does not use.
+"""
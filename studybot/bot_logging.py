@@ -0,0 +1,119 @@
+"""Logging for the bot: records are queued on the event loop and written by a background thread.
+
+``setup_logging()`` installs a ``QueueHandler`` on the root logger, so a log
+call on the event loop only builds a ``LogRecord`` and puts it on a queue.
+Formatting (including ``%`` argument merging and tracebacks) and the actual
+write happen in a ``QueueListener`` thread. Output is one JSON object per line
+by default, or plain text with ``LOG_FORMAT=text``.
+
+High-frequency loggers (per-member voice events, per-edit embed updates) get a
+``SamplingFilter``, which lets every record at WARNING and above through but
+only one in ``LOG_SAMPLE_EVERY`` of the quieter ones for each message.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from collections import defaultdict
+
+# Loggers that fire for every member or every message on busy servers
+SAMPLED_LOGGERS = ('studybot.voice', 'studybot.embed_updater')
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, with any ``extra=`` fields as top-level keys."""
+
+    converter = time.gmtime
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Pass the first of every ``every`` records per message template below ``min_level``."""
+
+    def __init__(self, every, min_level=logging.WARNING):
+        super().__init__()
+        self.every = every
+        self.min_level = min_level
+        self.seen = defaultdict(int)
+        self.dropped = 0
+
+    def filter(self, record):
+        if record.levelno >= self.min_level or self.every <= 1:
+            return True
+        count = self.seen[record.msg]
+        self.seen[record.msg] = count + 1
+        if count % self.every == 0:
+            return True
+        self.dropped += 1
+        return False
+
+
+_listener = None
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    # The stock QueueHandler formats the message before queueing it, which is
+    # exactly the work we want off the event loop; the listener formats instead.
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=None, log_format=None, sample_every=None, stream=None):
+    """Route all logging through a background thread; returns the running ``QueueListener``."""
+    global _listener
+    stop_logging()
+    level = level or os.getenv('LOG_LEVEL', 'INFO')
+    log_format = log_format or os.getenv('LOG_FORMAT', 'json')
+    sample_every = sample_every or int(os.getenv('LOG_SAMPLE_EVERY', '20'))
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if log_format == 'json':
+        output.setFormatter(JsonLinesFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_LazyQueueHandler(records))
+    root.setLevel(level)
+
+    for name in SAMPLED_LOGGERS:
+        logger = logging.getLogger(name)
+        for existing in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+            logger.removeFilter(existing)
+        logger.addFilter(SamplingFilter(sample_every))
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+@atexit.register
+def stop_logging():
+    """Write out everything still queued and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
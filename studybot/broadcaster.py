@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+from collections import Counter, defaultdict
+
+import discord
+
+from studybot.metrics import Histogram
+from studybot.rate_limit import TokenBucket, TokenBuckets
+
+logger = logging.getLogger(__name__)
+
+# Delivery latency reaches seconds when hundreds of channels share the rate limits
+DELIVERY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Broadcaster:
+    """Send one message to many channels concurrently, within Discord's rate limits.
+
+    The caller renders the message once; every channel gets the same one.
+    Sends run at most ``max_in_flight`` at a time and are paced by a token
+    bucket per channel and one global bucket, which can be shared with the
+    other senders of the bot. A channel that is gone, forbids sending or
+    fails is counted and logged without holding up the others; one that hits
+    a 429 is backed off and retried. Delivery latency is the time from the
+    start of the broadcast until a channel's message went out.
+    """
+
+    def __init__(self, get_channel, channel_rate=1.0, channel_burst=5, global_bucket=None, max_in_flight=10,
+                 retries=2):
+        self.get_channel = get_channel
+        self._global_bucket = global_bucket or TokenBucket(40.0, 40)
+        self._channel_buckets = TokenBuckets(channel_rate, channel_burst)  # Idle channels are dropped
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self.retries = retries
+        self.latency = defaultdict(lambda: Histogram(DELIVERY_BUCKETS))  # Broadcast name -> delivery latency
+        self.deliveries = Counter()  # (broadcast name, 'sent', 'missing', 'forbidden' or 'error') -> channels
+
+    async def send(self, name, channel_ids, **message):
+        """Send ``message`` (``channel.send`` arguments) to every channel in ``channel_ids``; returns how many got it."""
+        started = time.monotonic()
+        outcomes = await asyncio.gather(*(self._deliver(name, channel_id, message, started) for channel_id in channel_ids))
+        sent = outcomes.count('sent')
+        if sent < len(outcomes):
+            logger.warning("Broadcast %s reached %s of %s channels in %.2fs", name, sent, len(outcomes),
+                           time.monotonic() - started)
+        else:
+            logger.info("Broadcast %s reached %s channels in %.2fs", name, sent, time.monotonic() - started)
+        return sent
+
+    async def _acquire(self, bucket):
+        while True:
+            now = time.monotonic()
+            delay = max(bucket.delay(now), self._global_bucket.delay(now))
+            if delay <= 0:
+                bucket.try_acquire(now)
+                self._global_bucket.try_acquire(now)
+                return
+            await asyncio.sleep(delay)
+
+    async def _deliver(self, name, channel_id, message, started):
+        outcome = await self._try_deliver(channel_id, message)
+        self.deliveries[name, outcome] += 1
+        if outcome == 'sent':
+            self.latency[name].observe(time.monotonic() - started)
+        return outcome
+
+    async def _try_deliver(self, channel_id, message):
+        channel = self.get_channel(channel_id)
+        if channel is None:
+            logger.warning("Channel %s not found, it may have been deleted", channel_id)
+            return 'missing'
+        bucket = self._channel_buckets.get(channel_id)
+        for attempt in range(self.retries + 1):
+            async with self._in_flight:
+                await self._acquire(bucket)
+                try:
+                    await channel.send(**message)
+                    return 'sent'
+                except discord.Forbidden:
+                    logger.warning("Missing permission to send messages in channel %s", channel_id)
+                    return 'forbidden'
+                except discord.HTTPException as e:
+                    if e.status != 429 or attempt == self.retries:
+                        logger.error("Error sending to channel %s: %s", channel_id, e)
+                        return 'error'
+                    bucket.drain()  # Back off this channel and try again
+                except Exception:
+                    logger.exception("Error sending to channel %s", channel_id)
+                    return 'error'
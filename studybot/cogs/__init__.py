@@ -0,0 +1 @@
+"""Feature extensions, loaded with ``bot.load_extension('studybot.cogs.<name>')``."""
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import os
+import random
+from io import BytesIO
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from studybot.core import caches, http_client, rate_limited, registry
+from studybot.media_cache import CatMediaCache
+
+logger = logging.getLogger(__name__)
+
+CATAAS_API_URL = "https://cataas.com/cat"
+CATAAS_GIF_API_URL = "https://cataas.com/cat/gif"
+
+MEOW_FACTS_API_URL = "https://meowfacts.herokuapp.com/"
+
+CAT_CACHE_DIR = os.getenv('CAT_CACHE_DIR', 'cat_cache')
+CAT_FETCH_DEADLINE = 4  # Seconds /cat waits for live fetches when the cache misses
+
+# meow.png sits at the top of the repository, next to main.py
+MEOW_IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "meow.png")
+DEFAULT_CAT_FACT = "Did you know? Cats have five toes on their front paws, but only four on their back paws. 🐾🐱"
+
+async def fetch_cat_fact():
+    cat_fact_data = await http_client.get_json(MEOW_FACTS_API_URL)
+    return cat_fact_data["data"][0] + " 🐾🐱"
+
+async def fetch_cat_media():
+    """Download a random cat image or GIF, returned as (filename, bytes)."""
+    if random.choice([True, False]):
+        return "cat_image.jpg", await http_client.get_bytes(CATAAS_API_URL)
+    return "cat_gif.gif", await http_client.get_bytes(CATAAS_GIF_API_URL)
+
+# Ready-to-send cats and facts, prefetched in the background
+cat_media_cache = CatMediaCache(fetch_cat_media, fetch_cat_fact, CAT_CACHE_DIR)
+
+async def fetch_cat_parts(cat_fact, cat_media):
+    """Fetch whichever of the fact and media the cache missed, concurrently and within one deadline.
+
+    Each part degrades on its own: a missing fact falls back to the last cached one (or a
+    built-in fact), missing media comes back as None so the caller sends meow.png instead.
+    """
+    fetches = {}
+    if cat_fact is None:
+        fetches["fact"] = asyncio.create_task(fetch_cat_fact())
+    if cat_media is None:
+        fetches["media"] = asyncio.create_task(fetch_cat_media())
+
+    done, pending = await asyncio.wait(fetches.values(), timeout=CAT_FETCH_DEADLINE)
+    for task in pending:
+        task.cancel()
+
+    results = {}
+    for part, task in fetches.items():
+        if task in done and task.exception() is None:
+            results[part] = task.result()
+        elif task in done:
+            logger.warning("Error fetching cat %s: %s", part, task.exception())
+        else:
+            logger.warning("Timed out fetching cat %s", part)
+
+    if cat_fact is None:
+        cat_fact = results.get("fact") or cat_media_cache.last_fact() or DEFAULT_CAT_FACT
+    if cat_media is None:
+        cat_media = results.get("media")
+    return cat_fact, cat_media
+
+class Cat(commands.Cog):
+    """Cat :3"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.metrics = []
+
+    async def cog_load(self):
+        caches['cat'] = cat_media_cache
+        self.metrics = [
+            registry.callback('cat_cache_spills_total', 'counter', 'Cat media moved from memory to disk',
+                              lambda: [((), cat_media_cache.spills)]),
+            registry.callback('cat_cache_evictions_total', 'counter', 'Cat media dropped from disk to stay under the size limit',
+                              lambda: [((), cat_media_cache.evictions)]),
+            registry.callback('cat_cache_bytes', 'gauge', 'Size of the cat media cache by where it is kept',
+                              lambda: [(('memory',), cat_media_cache.memory_used), (('disk',), cat_media_cache.disk_used)],
+                              ('storage',)),
+        ]
+        await cat_media_cache.start()
+
+    async def cog_unload(self):
+        caches.pop('cat', None)
+        for family in self.metrics:
+            registry.remove(family)
+
+    @app_commands.command(name='cat', description='Get a random funny cat image or GIF and a cat fact')
+    @rate_limited(2)
+    async def cat(self, interaction: discord.Interaction):
+        """Send a random funny cat image or GIF and a cat fact."""
+        await interaction.response.defer()
+
+        cat_fact = cat_media_cache.get_fact()
+        cat_media = await cat_media_cache.get_media()
+        if cat_fact is None or cat_media is None:
+            cat_fact, cat_media = await fetch_cat_parts(cat_fact, cat_media)
+
+        embed = discord.Embed(title="🐱 Silly Cats Time :3 🐱", color=discord.Color.blue())
+        embed.add_field(name="A Lil Cat Fun Fact", value=cat_fact, inline=False)
+
+        if cat_media:
+            filename, data = cat_media
+            cat_media_file = discord.File(BytesIO(data), filename=filename)
+        else:
+            cat_media_file = discord.File(MEOW_IMAGE_PATH, filename="meow.png")
+        await interaction.followup.send(embed=embed, file=cat_media_file)
+
+async def setup(bot):
+    await bot.add_cog(Cat(bot))
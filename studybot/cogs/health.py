@@ -0,0 +1,114 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from studybot.core import broadcaster, cron_scheduler, guilds, rate_limited, schedule_broadcasts, shuffle_bags
+from studybot.cron_scheduler import CronSchedule
+from studybot.guild_state import DM_GUILD_ID
+
+HEALTH_REMINDER_SCHEDULE = CronSchedule('0 */6 * * *')  # Every six hours on the hour, adjust as needed
+
+reminders = [
+    "Time to drink some water! 💧",
+    "Take a deep breath and relax. 🌬️",
+    "Fix your posture! Sit up straight. 🪑",
+    "Stretch your arms and legs. 🧘‍♀️",
+    "Remember to blink and focus on your screen time. 👀",
+    "Stand up and walk around for a few minutes. 🚶‍♀️",
+    "Take a short break from your work. 🌻",
+    "Breathe in for 4 seconds, hold for 4 seconds, breathe out for 4 seconds. 🌬️",
+    "Check your eyes! Look away from the screen and focus on something far. 🧘‍♂️",
+    "Have a healthy snack! 🍎",
+    "Practice mindfulness for a few minutes. 🧘",
+    "Do some light stretching exercises. 🏃‍♀️",
+    "Give your eyes a break from screens. 🛑",
+    "Remember to drink herbal tea to relax. 🍵",
+    "Check your water intake for today. 💧",
+    "Do some light yoga poses. 🧘‍♀️",
+    "Try deep breathing exercises. 🌬️",
+    "Focus on your mental health today. 💆‍♀️",
+    "Take a short walk outside. 🌳",
+    "Adjust your screen brightness for better eye comfort. 📱",
+    "Stay hydrated throughout the day! 💧",
+    "Make time to meditate. 🧘‍♂️"
+    "Stretch your neck gently side to side. 🧘",
+    "Relax your shoulders. Let go of any tension. 🫂",
+    "Take a moment to smile! 😊",
+    "Wash your hands if you haven’t in a while. 🧼",
+    "Stand up and do 10 squats! 🏋️",
+    "Take a deep breath and count to five. 🌬️",
+    "Do a quick wrist stretch to avoid strain. ✋",
+    "Close your eyes for 20 seconds to relax them. 😌",
+    "Check your surroundings for a moment of mindfulness. 🌱",
+    "Take a sip of your favorite tea or coffee. ☕",
+    "Write down something you're grateful for today. 📓",
+    "Let your eyes wander and notice something beautiful. 🌸",
+    "Open a window for some fresh air. 🌬️",
+    "Add some green plants to your workspace for a fresh vibe. 🌿",
+    "Do a quick shoulder roll exercise. 🔄",
+    "Keep a glass of water handy and sip frequently. 💧",
+    "Check your ergonomics: is your chair and desk setup comfortable? 🪑",
+    "Step outside for a breath of fresh air. 🌤️",
+    "Play your favorite calming music for 5 minutes. 🎶",
+    "Take a moment to appreciate yourself—you’re doing great! 🌟",
+    "Massage your temples or the back of your neck. 💆",
+    "Roll your ankles in small circles for better blood flow. 🔄",
+    "Take a 5-minute break to rest your mind. 🌻",
+    "Eat a piece of fruit for a healthy energy boost. 🍓",
+    "Organize your desk to create a more focused workspace. 📚",
+    "Drink a glass of water before you continue working. 💧",
+    "Take three slow, deep breaths to reset. 🌬️",
+    "Shake out your arms and legs to release tension. 🤲",
+    "Have a quick stretch or walk—it’s good for your back. 🚶",
+    "Take a quick mindfulness pause and notice 3 things around you. 🧘",
+    "Journal one positive thought or goal for the day. 📝",
+    "Do a quick hand massage to relax your fingers. 🤲",
+    "Look outside for a moment and connect with nature. 🌳",
+    "Lightly tap your shoulders and upper back for better circulation. 🖐️",
+    "Tidy up your immediate space—it helps your mental clarity. 🧹",
+    "Switch up your sitting position to avoid stiffness. 🪑",
+    "Give your wrists a gentle shake to release tension. ✋",
+    "Place your palms together and stretch your fingers outward. 🤝",
+    "Take a mindful sip of water and enjoy its refreshment. 💦"
+]
+
+# A broadcast picks for the whole server (channel 0), /health_reminder for its channel
+health_reminder_bags = shuffle_bags('health_reminders', reminders)
+
+async def pick_health_reminder(guild_id, channel_id=0):
+    """Pick a reminder that was not picked recently in the server or channel."""
+    return await health_reminder_bags.pick((guild_id, channel_id))
+
+class Health(commands.Cog):
+    """Health reminders on demand and every few hours in the configured channels."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_unload(self):
+        cron_scheduler.cancel('health_reminder')
+
+    async def send_health_reminders(self, guild_id):
+        embed = discord.Embed(
+            title="Health Reminder",
+            description=await pick_health_reminder(guild_id),
+            color=discord.Color.blue()
+        )
+        await broadcaster.send('health_reminder', guilds[guild_id].channel_ids, embed=embed)
+
+    @app_commands.command(name="health_reminder", description="Get a health reminder")
+    @rate_limited()
+    async def health_reminder_command(self, interaction: discord.Interaction):
+        embed = discord.Embed(
+            title="Health Reminder",
+            description=await pick_health_reminder(interaction.guild_id or DM_GUILD_ID, interaction.channel_id),
+            color=discord.Color.blue()
+        )
+        await interaction.response.send_message(embed=embed)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        schedule_broadcasts('health_reminder', HEALTH_REMINDER_SCHEDULE, self.send_health_reminders)
+
+async def setup(bot):
+    await bot.add_cog(Health(bot))
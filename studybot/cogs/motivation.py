@@ -0,0 +1,142 @@
+import os
+import random
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from studybot.core import (
+    broadcaster, caches, cron_scheduler, guilds, http_client, rate_limited, schedule_broadcasts, shuffle_bags,
+)
+from studybot.cron_scheduler import CronSchedule
+from studybot.guild_state import DM_GUILD_ID
+from studybot.quote_buffer import QuoteBuffer
+
+MOTIVATIONAL_QUOTES_SCHEDULE = CronSchedule('0 */3 * * *')  # Every three hours on the hour, adjust as needed
+
+# Quotes are fetched in bulk in the background; set ZENQUOTES_API_URL to point at a local stub when testing
+ZENQUOTES_API_URL = os.getenv('ZENQUOTES_API_URL', "https://zenquotes.io/api/quotes")
+
+async def fetch_zen_quotes():
+    """Fetch a batch of quotes from ZenQuotes."""
+    data = await http_client.get_json(ZENQUOTES_API_URL)
+    return [quote['q'] + " -" + quote['a'] + " ✨" for quote in data]
+
+quote_buffer = QuoteBuffer(fetch_zen_quotes)
+
+motivational_quotes = [
+    "You can do it! 💪",
+    "Believe in yourself! 🌟",
+    "Keep pushing forward, no matter what. 🚀",
+    "Every step counts. Take it one at a time. 👣",
+    "Don't forget how amazing you are! 🌈",
+    "You’ve got this! 💯",
+    "Success doesn’t come from what you do occasionally, it comes from what you do consistently. 🌈",
+    "Stay focused, go after your dreams and keep moving toward your goals. 🚶‍♀️",
+    "You are capable of more than you know. 🌟",
+    "Embrace the unknown. 🌌",
+    "Strength doesn’t come from what you can do; it comes from overcoming the things you once thought you couldn’t. 💪",
+    "Hardships often prepare ordinary people for an extraordinary destiny. 🌄",
+    "Progress, not perfection. 🏆",
+    "The only limit to your success is your own imagination. 💭",
+    "Believe in your infinite potential. 🌈",
+    "Opportunities don’t happen, you create them. 🏞️",
+    "Your only limit is your mind. 🔄",
+    "Dream it. Wish it. Do it. 🌈",
+    "Your time is now! ⏳",
+    "Your potential is endless. 🌟",
+    "Stay positive, work hard, and make it happen. 💪",
+    "Challenges are what make life interesting. Overcoming them is what makes life meaningful. 💪",
+    "Happiness is a choice. 🎭",
+    "Good things take time, but worth waiting for. 🕰️",
+    "Every day is a new beginning. Take a deep breath, smile, and start again. 🌅",
+    "Success is not in what you have, but who you are. 💎",
+    "You are stronger than you think. 💪",
+    "Small progress is still progress. 🚶‍♂️",
+    "Believe you can, and you're halfway there. 💪",
+    "You are braver than you believe, stronger than you seem, and smarter than you think. 🧠",
+    "Your hard work will pay off. 🌱",
+    "The best time for new beginnings is now. 🌱",
+    "You are more capable than you give yourself credit for. 💪",
+    "Take a moment to reflect on your accomplishments. 🏅",
+    "Stay patient, work hard, and make it happen. 💪",
+    "You are worthy of great things. ✨",
+    "The only way to do great work is to love what you do. ❤️",
+    "Keep going! You're closer than you think. ⛷️",
+    "A positive mindset brings positive results. 🌈",
+    "Embrace the journey and trust the process. 🛤️",
+    "Your journey matters, so keep moving forward. 🚶‍♂️",
+    "Be proud of how far you've come. 🌟",
+    "Life begins at the end of your comfort zone. 🌈",
+    "Start where you are. Use what you have. Do what you can. 🏞️",
+    "Don’t watch the clock; do what it does. Keep going. ⏰",
+    "A journey of a thousand miles begins with a single step. 🚶‍♂️",
+    "Every day is a chance to begin again. 🌄",
+    "Your only limit is your mindset. 💭",
+    "Your dreams are valid. 🌈",
+    "Inhale confidence, exhale doubt. 🌬️",
+    "The best way to predict the future is to create it. 🚀",
+    "You have what it takes to succeed. 💪",
+    "Believe in your dreams and never give up. 🌟",
+    "Each day brings new opportunities. 🌱",
+    "Strength grows in the moments when you think you can’t go on, but you keep going. 💪",
+    "You are enough just as you are. 💖",
+    "Great things take time. 🌈",
+    "You’re capable of amazing things. 🌟",
+    "It’s never too late to be what you might have been. 🌄",
+    "Your story isn’t over yet. 🌌",
+    "Your potential is limitless. 🌟",
+    "Do something today that your future self will thank you for. ✨",
+    "You are braver than you feel, stronger than you seem, and loved more than you know. 💖",
+    "Everything is going to be okay.. Keep going, you got this you've always have. 🥹"
+]
+
+# A broadcast picks for the whole server (channel 0), /motivate for its channel
+motivational_quote_bags = shuffle_bags('motivational_quotes', motivational_quotes)
+
+async def pick_motivational_quote(guild_id, channel_id=0):
+    """A buffered ZenQuotes quote half the time, otherwise a built-in one not picked recently in the server or channel."""
+    new_quote = quote_buffer.pop() if random.random() < 0.5 else None
+    return new_quote or await motivational_quote_bags.pick((guild_id, channel_id))
+
+class Motivation(commands.Cog):
+    """Motivational quotes on demand and every few hours in the configured channels."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        caches['quotes'] = quote_buffer
+        quote_buffer.request_refill()
+
+    async def cog_unload(self):
+        cron_scheduler.cancel('motivational_quotes')
+        caches.pop('quotes', None)
+
+    async def send_motivational_quotes(self, guild_id):
+        embed = discord.Embed(
+            title="Motivational Quote",
+            description=await pick_motivational_quote(guild_id),
+            color=discord.Color.blue()
+        )
+        await broadcaster.send('motivational_quotes', guilds[guild_id].channel_ids, embed=embed)
+
+    @app_commands.command(name='motivate', description='Get a motivational message')
+    @rate_limited()
+    async def motivate_slash(self, interaction: discord.Interaction):
+        new_quote = await pick_motivational_quote(interaction.guild_id or DM_GUILD_ID, interaction.channel_id)
+
+        embed = discord.Embed(
+            title="Motivational Quote :)",
+            description=new_quote,
+            color=discord.Color.blue()
+        )
+
+        await interaction.response.send_message(embed=embed)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        schedule_broadcasts('motivational_quotes', MOTIVATIONAL_QUOTES_SCHEDULE, self.send_motivational_quotes)
+
+async def setup(bot):
+    await bot.add_cog(Motivation(bot))
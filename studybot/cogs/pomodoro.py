@@ -0,0 +1,367 @@
+import asyncio
+import logging
+import math
+import time
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from studybot.core import guilds, pending_pomodoro_restores, rate_limited, registry, rest_budget, session_store, timer_scheduler
+from studybot.embed_updater import EmbedUpdateQueue
+from studybot.guild_state import DM_GUILD_ID
+from studybot.study_history import from_wall_time, to_wall_time
+
+logger = logging.getLogger(__name__)
+
+user_timers = {}
+embed_updates = EmbedUpdateQueue(global_bucket=rest_budget)
+
+max_chunk = 14 * 60  # Max 14-minute chunk (840 seconds), interaction messages expire after 15 minutes
+bar_length = 20
+
+def display_interval(remaining_time):
+    """Seconds until the next progress bar update: every second near the end, rarely otherwise."""
+    if remaining_time <= 10:
+        return 1
+    if remaining_time <= 60:
+        return 5
+    if remaining_time <= 10 * 60:
+        return 15
+    return 30
+
+class PomodoroSession:
+    """A running Pomodoro for one user, driven by the shared timer scheduler."""
+
+    def __init__(self, guild_id, user_id, user_name, channel, message, work_minutes, break_minutes,
+                 phase="Work", total_time=None, remaining_time=None, thread=None):
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.user_name = user_name
+        self.channel = channel
+        self.message = message
+        self.thread = thread
+        self.work_minutes = work_minutes
+        self.break_minutes = break_minutes
+        self.handle = None
+        self.cancelled = False
+        self.begin_phase(phase, work_minutes * 60 if total_time is None else total_time, remaining_time)
+
+    def begin_phase(self, phase, total_time, remaining_time=None, schedule=True):
+        """Start (or, with ``remaining_time``, resume) a phase on the current message.
+
+        With ``schedule=False`` the phase is only recorded; call ``schedule_next``
+        once the message it is shown on is ready.
+        """
+        now = timer_scheduler.time()
+        if remaining_time is None:
+            remaining_time = total_time
+        self.phase = phase
+        self.total_time = total_time
+        self.phase_start = now - (total_time - remaining_time)
+        self.deadline = self.phase_start + total_time
+        self.chunk_deadline = now + max_chunk
+        if schedule:
+            self.schedule_next()
+        self.persist()
+
+    def persist(self):
+        """Record where this session stands so it can be resumed after a restart."""
+        session_store.save_pomodoro(self.guild_id, self.user_id, {
+            "guild_id": self.guild_id,
+            "user_id": self.user_id,
+            "user_name": self.user_name,
+            "channel_id": self.channel.id,
+            "thread_id": self.thread.id if self.thread else None,
+            "phase": self.phase,
+            "work_minutes": self.work_minutes,
+            "break_minutes": self.break_minutes,
+            "phase_total": self.total_time,
+            "phase_ends_at": time.time() + (self.deadline - timer_scheduler.time()),
+        })
+
+    def elapsed(self, now):
+        """Seconds spent in the current phase, measured on the monotonic clock."""
+        return min(max(0.0, now - self.phase_start), self.total_time)
+
+    def remaining(self, now):
+        """Whole seconds left in the current phase, rounded up so 00:00 only shows at the end."""
+        return max(0, math.ceil(self.deadline - now))
+
+    def schedule_next(self):
+        """Wake up at the next display update, chunk boundary or phase end, whichever comes first."""
+        now = timer_scheduler.time()
+        interval = display_interval(self.deadline - now)
+        next_update = (now // interval + 1) * interval  # Aligned so sessions share wakeups
+        self.handle = timer_scheduler.call_at(min(next_update, self.chunk_deadline, self.deadline), self.tick)
+
+    def cancel(self):
+        self.cancelled = True
+        if self.handle:
+            self.handle.cancel()
+        embed_updates.discard(self.message)
+        session_store.save_pomodoro(self.guild_id, self.user_id, None)
+
+    def stop(self):
+        """Cancel the session and return the work seconds it earned so far."""
+        self.cancel()
+        if self.phase != "Work":
+            return 0
+        return round(self.elapsed(timer_scheduler.time()))
+
+    async def tick(self):
+        if self.cancelled:
+            return
+        now = timer_scheduler.time()
+        if now >= self.deadline:
+            await self.finish_phase()
+            return
+        if now >= self.chunk_deadline:
+            await self.continue_in_new_message()
+            self.chunk_deadline = now + max_chunk
+        await self.update_timer_embed(now)
+        if not self.cancelled:
+            self.schedule_next()
+
+    async def send(self, embed):
+        if self.thread:
+            return await self.thread.send(embed=embed)
+        return await self.message.channel.send(embed=embed)
+
+    async def update_timer_embed(self, now):
+        """Queue the progress bar update; stale states are replaced before they are sent."""
+        remaining_time = self.remaining(now)
+        minutes, seconds = divmod(remaining_time, 60)
+        elapsed_time = self.total_time - remaining_time
+        progress = elapsed_time / self.total_time
+        filled_length = int(bar_length * progress)
+        bar = "█" * filled_length + "–" * (bar_length - filled_length)
+
+        embed = self.message.embeds[0].copy()
+        if self.phase == "Work":
+            embed.description = f"Work Timer: [{bar}] {minutes:02d}:{seconds:02d}\nWork for {self.work_minutes} minutes."
+        else:
+            embed.description = f"Break Timer: [{bar}] {minutes:02d}:{seconds:02d}\nTake a break for {self.break_minutes} minutes."
+
+        embed_updates.submit(self.message, embed, on_missing=self.replace_missing_message)
+
+    async def replace_missing_message(self):
+        """Send a fresh timer message when the one being edited was deleted."""
+        if self.cancelled:
+            return
+        embed = discord.Embed(
+            title="Timer Continues...",
+            description="Timer is still running...",
+            color=discord.Color.blue() if self.phase == "Work" else discord.Color.green()
+        )
+        embed.set_footer(text="Pomodoro Timer in progress")
+        self.message = await self.message.channel.send(embed=embed)
+
+    async def continue_in_new_message(self):
+        """Move the timer to a fresh message before the current one can no longer be edited."""
+        new_embed = discord.Embed(
+            title=f"{self.phase} Timer Continues...",
+            description=f"Continue {self.phase.lower()}ing for the remaining time.",
+            color=discord.Color.blue() if self.phase == "Work" else discord.Color.green()
+        )
+        new_embed.set_footer(text="Pomodoro Timer in progress")
+
+        if not self.thread and self.total_time > max_chunk:
+            thread_embed = discord.Embed(
+                title="Timer Continues in Thread",
+                description=f"To keep things organized, the timer will continue in a new thread. You can follow the updates there. Thank you :)",
+                color=discord.Color.blue()
+            )
+            await self.channel.send(embed=thread_embed)
+
+            self.thread = await self.channel.create_thread(
+                name=f"{self.user_name}'s {self.phase} Timer Thread", message=self.message
+            )
+            if not self.thread:
+                logger.error("Failed to create a thread for %s's timer", self.user_name)
+            self.persist()
+        embed_updates.discard(self.message)
+        self.message = await self.send(new_embed)
+
+    async def finish_phase(self):
+        embed_updates.discard(self.message)
+        if self.phase == "Work":
+            credit_work_time(self.guild_id, self.user_id, round(self.elapsed(timer_scheduler.time())))
+            # The break starts before the first await: a /stop_timer while the messages below are sent
+            # (or a restart) must find the work phase already credited.
+            self.begin_phase("Break", self.break_minutes * 60, schedule=False)
+
+            embed = discord.Embed(
+                title="Work Session Complete",
+                description=f"**Work session complete! You worked for {self.work_minutes} minutes. It's time for a break. Don't forget to breathe :)** 🎉",
+                color=discord.Color.green()
+            )
+            await self.send(embed)
+
+            break_embed = discord.Embed(
+                title="Break Timer",
+                description=f"Take a break for {self.break_minutes} minutes. Timer updates every few seconds.",
+                color=discord.Color.blue()
+            )
+            break_embed.set_footer(text="Break Timer in progress")
+            self.message = await self.send(break_embed)
+            if not self.cancelled:
+                self.schedule_next()
+        else:
+            if user_timers.get(self.user_id) is self:
+                del user_timers[self.user_id]
+                session_store.save_pomodoro(self.guild_id, self.user_id, None)
+
+            embed = discord.Embed(
+                title="Break Over",
+                description="**You've completed a Pomodoro session! Great job buddy :)** ✅",
+                color=discord.Color.green()
+            )
+            await self.send(embed)
+
+def credit_work_time(guild_id, user_id, seconds, ended=None):
+    """Add Pomodoro work that ended at ``ended`` (default: now) to the user's totals in the server the timer was started in."""
+    ended = timer_scheduler.time() if ended is None else ended
+    state = guilds[guild_id]
+    state.credit_work(user_id, seconds, ended)
+    session_store.save_work_time(guild_id, user_id, state.work_times[user_id])
+    ended_at = to_wall_time(ended)
+    session_store.record_study(guild_id, user_id, 'work', ended_at - seconds, ended_at)
+
+class Pomodoro(commands.Cog):
+    """Pomodoro timers with a live progress bar; finished work counts towards the leaderboard."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.metrics = []
+
+    async def cog_load(self):
+        self.metrics = [
+            registry.callback('pomodoro_sessions_active', 'gauge', 'Running Pomodoro timers',
+                              lambda: [((), len(user_timers))]),
+            registry.callback('discord_embed_edits_total', 'counter', 'Timer embed edits by result',
+                              lambda: [((result.removeprefix('edits_'),), value) for result, value in embed_updates.stats().items()
+                                       if result != 'edits_pending'], ('result',)),
+            registry.callback('discord_embed_edits_pending', 'gauge', 'Timer embed edits waiting to be sent',
+                              lambda: [((), len(embed_updates))]),
+        ]
+
+    async def cog_unload(self):
+        for family in self.metrics:
+            registry.remove(family)
+
+    @app_commands.command(name='pomodoro', description='Start a Pomodoro timer with custom durations.')
+    @rate_limited(2)
+    async def pomodoro_slash(self, interaction: discord.Interaction, work_minutes: int = 25, break_minutes: int = 5):
+        """Start a Pomodoro timer with custom durations and a live progress bar."""
+        user_id = str(interaction.user.id)
+
+        if work_minutes <= 0:
+            embed = discord.Embed(
+                title="Invalid Input",
+                description="Please enter a positive number for work minutes.",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed)
+            return
+
+        if break_minutes <= 0:
+            break_minutes = 5  # Default break time
+
+        # Initial Work Timer Embed
+        embed = discord.Embed(
+            title="Pomodoro Timer",
+            description=f"Work for {work_minutes} minutes. Timer updates every few seconds.",
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text="Pomodoro Timer in progress")
+
+        await interaction.response.defer()
+        message = await interaction.followup.send(embed=embed, wait=True)
+
+        # Stop previous timer if running
+        if user_id in user_timers:
+            user_timers.pop(user_id).cancel()
+
+        user_timers[user_id] = PomodoroSession(
+            interaction.guild_id or DM_GUILD_ID, user_id, interaction.user.display_name, interaction.channel,
+            message, work_minutes, break_minutes
+        )
+
+    @app_commands.command(name='stop_timer', description='Stop the Pomodoro timer if it is running.')
+    @rate_limited()
+    async def stop_timer(self, interaction: discord.Interaction):
+        """Stop the Pomodoro timer if running."""
+        user_id = str(interaction.user.id)
+        if user_id in user_timers:
+            session = user_timers.pop(user_id)
+            elapsed_work_time = session.stop()
+            credit_work_time(session.guild_id, user_id, elapsed_work_time)
+
+            embed = discord.Embed(
+                title="Pomodoro Timer Stopped",
+                description=f"The timer has been stopped successfully. You worked for {elapsed_work_time // 60} minutes.",
+                color=discord.Color.blue()
+            )
+            await interaction.response.send_message(embed=embed)
+        else:
+            embed = discord.Embed(
+                title="No Timer Running",
+                description="No timer is currently running.",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        await self.restore_pomodoro_sessions()
+
+    async def restore_pomodoro_session(self, row):
+        """Resume one saved Pomodoro session in a fresh message."""
+        guild_id, user_id = row["guild_id"], row["user_id"]
+        channel = self.bot.get_channel(row["channel_id"])
+        thread = self.bot.get_channel(row["thread_id"]) if row["thread_id"] else None
+        if channel is None:
+            session_store.save_pomodoro(guild_id, user_id, None)
+            return
+
+        phase, total_time = row["phase"], row["phase_total"]
+        remaining_time = row["phase_ends_at"] - time.time()
+        if remaining_time <= 0 and phase == "Work":
+            # The work phase ended while the bot was down, so credit it and resume the break
+            credit_work_time(guild_id, user_id, total_time, from_wall_time(row["phase_ends_at"]))
+            phase, total_time = "Break", row["break_minutes"] * 60
+            remaining_time += total_time
+        if remaining_time <= 0:
+            # The break ended too, which completes the session; there is no work left to credit
+            session_store.save_pomodoro(guild_id, user_id, None)
+            embed = discord.Embed(
+                title="Break Over",
+                description="**Your Pomodoro session finished while the bot was offline. Great job buddy :)** ✅",
+                color=discord.Color.green()
+            )
+            await (thread or channel).send(embed=embed)
+            return
+
+        embed = discord.Embed(
+            title=f"{phase} Timer Resumed",
+            description=f"The bot restarted, but your {phase.lower()} timer picks up right where it left off.",
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text="Pomodoro Timer in progress")
+        message = await (thread or channel).send(embed=embed)
+        user_timers[user_id] = PomodoroSession(
+            guild_id, user_id, row["user_name"], channel, message, row["work_minutes"], row["break_minutes"],
+            phase=phase, total_time=total_time, remaining_time=remaining_time, thread=thread
+        )
+
+    async def restore_pomodoro_sessions(self):
+        rows = pending_pomodoro_restores[:]
+        pending_pomodoro_restores.clear()
+        results = await asyncio.gather(*(self.restore_pomodoro_session(row) for row in rows), return_exceptions=True)
+        for row, result in zip(rows, results):
+            if isinstance(result, Exception):
+                logger.error("Error restoring Pomodoro session for %s", row['user_id'], exc_info=result)
+
+async def setup(bot):
+    await bot.add_cog(Pomodoro(bot))
@@ -0,0 +1,424 @@
+import asyncio
+import functools
+import itertools
+import logging
+import os
+import time
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from studybot.core import caches, cron_scheduler, guilds, rate_limited, session_store
+from studybot.cron_scheduler import CronSchedule
+from studybot.global_leaderboard import GlobalLeaderboardCache
+from studybot.guild_state import DM_GUILD_ID
+from studybot.paginator import PaginatedView
+from studybot.study_history import from_wall_time, load_timezone, timezone_names, to_wall_time
+
+logger = logging.getLogger(__name__)
+voice_logger = logging.getLogger('studybot.voice')  # Sampled, it logs every member's voice update
+
+# Study rooms (tracked voice channels) are added per server with /add_study_room
+
+# Leaderboard period -> (title, whose top studiers, across which time)
+PERIOD_NAMES = {
+    'daily': ("Daily", "Today's", "today"),
+    'weekly': ("Weekly", "This Week's", "this week"),
+    'monthly': ("Monthly", "This Month's", "this month"),
+    'all_time': ("All-Time", "All-Time", "of all time"),
+}
+PERIOD_CHOICES = [
+    app_commands.Choice(name="Today", value='daily'),
+    app_commands.Choice(name="This week", value='weekly'),
+    app_commands.Choice(name="This month", value='monthly'),
+    app_commands.Choice(name="All time", value='all_time'),
+]
+
+# Voice updates sent while the bot is disconnected are never replayed, so after
+# startup and after every resume the study room sessions are checked against
+# the voice states Discord sent with the (re)connection.
+RECONCILE_BATCH_SIZE = 500  # Voice states checked between yields to the event loop
+
+LEADERBOARD_PAGE_SIZE = 10
+
+# /show_leaderboard all_servers:True aggregates every server's history, so its result is reused for this many seconds
+GLOBAL_LEADERBOARD_TTL = float(os.getenv('GLOBAL_LEADERBOARD_TTL', '60'))
+global_leaderboards = GlobalLeaderboardCache(session_store.global_top, k=10, ttl=GLOBAL_LEADERBOARD_TTL)
+
+# Every period ends at a midnight, so the leaderboards are checked at each midnight in the server's timezone
+ROLLOVER_SCHEDULE = CronSchedule('0 0 * * *')
+
+def format_time(minutes):
+    """Format time from minutes to hours and minutes."""
+    hours = minutes // 60
+    remaining_minutes = minutes % 60
+    if hours > 0:
+        return f"{hours} hours and {remaining_minutes} minutes"
+    else:
+        return f"{remaining_minutes} minutes"
+
+def voice_states_covering(guild, channel_ids):
+    """``(member_id, voice_state)`` pairs for everyone in the voice channels ``channel_ids``, and maybe others.
+
+    Every ``VoiceChannel.voice_states`` access filters the guild's whole voice
+    state cache, so when discord.py keeps that cache as ``Guild._voice_states``
+    it is read once instead of once per channel. discord.py is not pinned, so
+    without it the public per-channel property is used.
+    """
+    cache = getattr(guild, '_voice_states', None)
+    if isinstance(cache, dict):
+        return list(cache.items())
+    pairs = []
+    for channel_id in channel_ids:
+        channel = guild.get_channel(channel_id)
+        pairs.extend(getattr(channel, 'voice_states', {}).items())
+    return pairs
+
+def save_ended_session(state, user_id, seconds, ended):
+    """Persist a study room session ``end_voice_session`` just credited; ``ended`` is time.monotonic()."""
+    ended_at = to_wall_time(ended)
+    session_store.save_study_time(state.guild_id, user_id, state.study_times[user_id])
+    session_store.record_study(state.guild_id, user_id, 'study', ended_at - seconds, ended_at)
+    session_store.save_voice(state.guild_id, user_id, None)
+
+async def send_leaderboard(channel, interaction=None, period='weekly'):
+    """Generate and send the leaderboard of ``period`` to a specified channel."""
+    leaderboard = guilds.get_for(getattr(channel, 'guild', None)).periods[period].leaderboard
+    title, whose, _ = PERIOD_NAMES[period]
+    if not leaderboard:
+        embed = discord.Embed(
+            title="No Study Times Logged",
+            description="No study times logged yet.",
+            color=discord.Color.blue()
+        )
+        if interaction:
+            await interaction.response.send_message(embed=embed)
+        else:
+            await channel.send(embed=embed)
+        return
+
+    def render(start):
+        # Only the requested page is merged out of the index and formatted; running study room sessions count live
+        for i, (user_id, seconds) in enumerate(leaderboard.top(LEADERBOARD_PAGE_SIZE, start), start + 1):
+            yield f"{i}. <@{user_id}>: {format_time(int(seconds) // 60)}"
+
+    if not interaction:
+        # Announcements are posted right before the weekly reset, so there is nothing left to page through
+        leaderboard_text = "\n".join(render(0))
+        await channel.send(embed=discord.Embed(
+            title="Weekly Study Leaderboard",
+            description=f"Top {LEADERBOARD_PAGE_SIZE} of This Week! Congratulations keep up the good work :):\n{leaderboard_text}",
+            color=discord.Color.blue()
+        ))
+        return
+
+    user_id = str(interaction.user.id)
+
+    def make_embed(leaderboard_text):
+        embed = discord.Embed(
+            title=f"{title} Study Leaderboard",
+            description=f"{whose} Top Studiers! Congratulations keep up the good work :):\n{leaderboard_text}",
+            color=discord.Color.blue()
+        )
+        rank = leaderboard.rank(user_id)
+        if rank is not None:
+            embed.set_footer(text=f"Your rank: #{rank} of {len(leaderboard)} with {format_time(int(leaderboard.score(user_id)) // 60)}")
+        return embed
+
+    view = PaginatedView(make_embed, render, lambda: len(leaderboard), page_size=LEADERBOARD_PAGE_SIZE, owner_id=interaction.user.id)
+    await view.send(interaction)
+
+async def send_global_leaderboard(interaction, period='weekly'):
+    """Send the top 10 of ``period`` across every server, aggregated from the shared session store."""
+    top_users = await global_leaderboards.top(period)
+    title, _, across = PERIOD_NAMES[period]
+    if not top_users:
+        embed = discord.Embed(
+            title="No Study Times Logged",
+            description="No study times logged yet.",
+            color=discord.Color.blue()
+        )
+    else:
+        leaderboard_text = "\n".join(
+            [f"{i + 1}. <@{user_id}>: {format_time(minutes)}" for i, (user_id, minutes) in enumerate(top_users)]
+        )
+        embed = discord.Embed(
+            title=f"{title} Study Leaderboard (All Servers)",
+            description=f"Top 10 across every server {across}! Keep up the good work :):\n{leaderboard_text}",
+            color=discord.Color.blue()
+        )
+    await interaction.response.send_message(embed=embed)
+
+class Study(commands.Cog):
+    """Study room time tracking and the daily, weekly, monthly and all-time leaderboards."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.reconcile_lock = asyncio.Lock()
+        # Until when voice updates are known to have been received: the last flush of the previous run, if any
+        last_heartbeat = session_store.last_heartbeat
+        self.gateway_last_seen = time.monotonic() if last_heartbeat is None else from_wall_time(last_heartbeat)
+
+    async def cog_load(self):
+        caches['global_leaderboard'] = global_leaderboards
+
+    async def cog_unload(self):
+        cron_scheduler.cancel('leaderboard_rollover')
+        caches.pop('global_leaderboard', None)
+
+    def schedule_rollover(self, guild_id):
+        cron_scheduler.add('leaderboard_rollover', guild_id, ROLLOVER_SCHEDULE,
+                           functools.partial(self.roll_leaderboards, guild_id), guilds[guild_id].timezone)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        if member.bot:
+            return
+
+        user_id = str(member.id)
+        state = guilds[member.guild.id]
+        tracked_channels = state.tracked_channels
+
+        if before.channel != after.channel:
+            now = time.monotonic()
+            # User leaves a tracked voice channel or moves to an untracked voice channel
+            if before.channel and before.channel.id in tracked_channels:
+                voice_logger.debug("%s left tracked channel %s", member.name, before.channel.id)
+                elapsed_seconds = state.end_voice_session(user_id, now)
+                if elapsed_seconds is not None:
+                    save_ended_session(state, user_id, elapsed_seconds, now)
+                    voice_logger.debug("Added %s seconds to %s's study time", elapsed_seconds, member.name)
+                else:
+                    voice_logger.debug("%s was not tracked in %s", member.name, before.channel.id)
+
+            # User joins a tracked voice channel
+            if after.channel and after.channel.id in tracked_channels:
+                voice_logger.debug("%s joined tracked channel %s", member.name, after.channel.id)
+                state.start_voice_session(user_id, after.channel.id, now)
+                session_store.save_voice(state.guild_id, user_id, (after.channel.id, to_wall_time(now)))
+            else:
+                voice_logger.debug("%s joined an untracked or no channel", member.name)
+
+    @app_commands.command(name='log_study', description='Check your total Pomodoro study time')
+    @rate_limited()
+    async def log_study_slash(self, interaction: discord.Interaction):
+        """Check your total Pomodoro study time."""
+        user_id = str(interaction.user.id)
+        state = guilds.get_for(interaction.guild)
+        total_pomodoro_time = state.work_times.get(user_id, 0) // 60
+        description = f"{interaction.user.name}, you have studied for a total of {total_pomodoro_time} minutes using Pomodoro sessions!"
+        study_room_time = int(state.study_seconds(user_id, time.monotonic())) // 60
+        if study_room_time or user_id in state.voice_channel_start_times:
+            in_progress = " (including the session you are in now)" if user_id in state.voice_channel_start_times else ""
+            description += f"\nYou have also spent {format_time(study_room_time)} in study rooms{in_progress}."
+
+        embed = discord.Embed(
+            title="Pomodoro Study Time",
+            description=description,
+            color=discord.Color.blue()
+        )
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name='show_leaderboard', description='Display the daily, weekly, monthly or all-time study leaderboard')
+    @rate_limited(2)
+    @app_commands.choices(period=PERIOD_CHOICES)
+    async def show_leaderboard_slash(self, interaction: discord.Interaction, all_servers: bool = False, period: str = 'weekly'):
+        if all_servers:
+            await send_global_leaderboard(interaction, period)
+        else:
+            await send_leaderboard(interaction.channel, interaction=interaction, period=period)
+
+    @app_commands.command(name='set_timezone', description="Set when this server's days, weeks and months start (admin command)")
+    @rate_limited()
+    @app_commands.guild_only()
+    @app_commands.checks.has_permissions(administrator=True)
+    async def set_timezone(self, interaction: discord.Interaction, timezone: str):
+        """Set the server's timezone, e.g. Europe/Berlin (admin command)."""
+        try:
+            tz = load_timezone(timezone)
+        except ValueError:
+            embed = discord.Embed(
+                title="Unknown Timezone",
+                description=f"{timezone} is not a timezone. Pick one from the list, e.g. Europe/Berlin.",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        state = guilds[interaction.guild_id]
+        state.set_timezone(tz, time.time())
+        session_store.save_timezone(state.guild_id, tz.key)
+        cron_scheduler.set_timezone(state.guild_id, tz)
+        embed = discord.Embed(
+            title="Timezone Set",
+            description=f"Leaderboards now start over at midnight {tz.key} time, beginning with the current ones.",
+            color=discord.Color.blue()
+        )
+        await interaction.response.send_message(embed=embed)
+
+    @set_timezone.autocomplete('timezone')
+    async def timezone_autocomplete(self, interaction: discord.Interaction, current: str):
+        current = current.lower()
+        matches = (name for name in timezone_names() if current in name.lower())
+        return [app_commands.Choice(name=name, value=name) for name in itertools.islice(matches, 25)]  # Discord's limit
+
+    @app_commands.command(name='add_study_room', description='Add a study room')
+    @rate_limited()
+    @commands.has_permissions(administrator=True)
+    async def add_study_room(self, interaction: discord.Interaction, room_id: str):
+        """Add a study room (admin command)."""
+        tracked_channels = guilds.get_for(interaction.guild).tracked_channels
+        try:
+            room_id_int = int(room_id)
+            if room_id_int in tracked_channels:
+                embed = discord.Embed(
+                    title="Study Room Already Added",
+                    description=f"Study room with ID {room_id_int} is already added.",
+                    color=discord.Color.yellow()
+                )
+                await interaction.response.send_message(embed=embed)
+            else:
+                tracked_channels.add(room_id_int)  # Add the integer to the set
+                session_store.save_tracked_channel(interaction.guild_id or DM_GUILD_ID, room_id_int, True)
+                embed = discord.Embed(
+                    title="Study Room Added",
+                    description=f"Study room with ID {room_id_int} added!",
+                    color=discord.Color.blue()
+                )
+                await interaction.response.send_message(embed=embed)
+        except ValueError:
+            embed = discord.Embed(
+                title="Invalid Room ID",
+                description="Invalid room ID. Please provide a numeric ID.",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name='remove_study_room', description='Remove a study room')
+    @rate_limited()
+    @commands.has_permissions(administrator=True)
+    async def remove_study_room(self, interaction: discord.Interaction, room_id: str):
+        """Remove a study room (admin command)."""
+        tracked_channels = guilds.get_for(interaction.guild).tracked_channels
+        try:
+            room_id_int = int(room_id)
+            if room_id_int not in tracked_channels:
+                embed = discord.Embed(
+                    title="Study Room Not Found",
+                    description=f"Study room with ID {room_id_int} is not in the list.",
+                    color=discord.Color.red()
+                )
+                await interaction.response.send_message(embed=embed)
+            else:
+                tracked_channels.discard(room_id_int)
+                session_store.save_tracked_channel(interaction.guild_id or DM_GUILD_ID, room_id_int, False)
+                embed = discord.Embed(
+                    title="Study Room Removed",
+                    description=f"Study room with ID {room_id_int} removed!",
+                    color=discord.Color.blue()
+                )
+                await interaction.response.send_message(embed=embed)
+        except ValueError:
+            embed = discord.Embed(
+                title="Invalid Room ID",
+                description="Invalid room ID. Please provide a numeric ID.",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    async def roll_leaderboards(self, guild_id):
+        """Start a server's daily, weekly and monthly leaderboards over when their period ended (weeks start Monday).
+
+        The week's leaderboard is announced first. Nothing is deleted: past periods stay in the study history.
+        """
+        state = guilds[guild_id]
+        if time.time() >= state.periods['weekly'].ends_at:
+            channel = self.bot.get_channel(state.announcement_channel_id)
+            if channel and channel.permissions_for(channel.guild.me).send_messages:
+                await send_leaderboard(channel)
+                await channel.send(embed=discord.Embed(
+                    title="Weekly Leaderboard Reset",
+                    description="Weekly leaderboard has been reset! Log your study times for the new week!",
+                    color=discord.Color.blue()
+                ))
+        rolled = state.roll_periods(time.time(), time.monotonic())
+        if rolled:
+            logger.info("Started new %s leaderboards in server %s", ", ".join(rolled), state.guild_id)
+
+    async def reconcile_voice_sessions(self):
+        """Start sessions for people found in study rooms and credit sessions of people who left meanwhile.
+
+        Time of people who left while the bot was away is credited up to when it
+        lost the gateway connection (or last saved its state, after a restart).
+        """
+        async with self.reconcile_lock:
+            lost_at = self.gateway_last_seen
+            started = moved = ended = checked = 0
+            for guild in list(self.bot.guilds):
+                state = guilds[guild.id]
+                in_study_rooms = {}  # Member ID -> voice state, as found by the scan
+                for member_id, voice_state in voice_states_covering(guild, state.tracked_channels):
+                    checked += 1
+                    if checked % RECONCILE_BATCH_SIZE == 0:
+                        await asyncio.sleep(0)
+                    channel_id = voice_state.channel.id if voice_state.channel else None
+                    if channel_id not in state.tracked_channels:
+                        continue
+                    in_study_rooms[member_id] = voice_state
+                    member = guild.get_member(member_id)
+                    if member is not None and member.bot:
+                        continue
+                    user_id = str(member_id)
+                    if user_id not in state.voice_channel_start_times:
+                        now = time.monotonic()
+                        state.start_voice_session(user_id, channel_id, now)
+                        session_store.save_voice(state.guild_id, user_id, (channel_id, to_wall_time(now)))
+                        started += 1
+                    elif state.voice_channels.get(user_id) != channel_id:
+                        state.voice_channels[user_id] = channel_id
+                        session_store.save_voice(
+                            state.guild_id, user_id, (channel_id, to_wall_time(state.voice_channel_start_times[user_id]))
+                        )
+                        moved += 1
+
+                # Checked against each member's live voice state, so sessions started by events during the
+                # scan are kept; members missing from the member cache are checked against the scan
+                for index, (user_id, channel_id) in enumerate(list(state.voice_channels.items()), 1):
+                    if index % RECONCILE_BATCH_SIZE == 0:
+                        await asyncio.sleep(0)
+                    if state.voice_channels.get(user_id) != channel_id:
+                        continue  # Moved or left while yielding; the voice event already took care of it
+                    member = guild.get_member(int(user_id))
+                    voice_state = member.voice if member is not None else in_study_rooms.get(int(user_id))
+                    if (channel_id in state.tracked_channels and voice_state is not None
+                            and voice_state.channel is not None and voice_state.channel.id == channel_id):
+                        continue
+                    elapsed_seconds = state.end_voice_session(user_id, lost_at)
+                    if elapsed_seconds is not None:
+                        save_ended_session(state, user_id, elapsed_seconds, lost_at)
+                        ended += 1
+                await asyncio.sleep(0)
+            logger.info("Reconciled voice sessions: %s voice states checked, %s sessions started, %s moved and %s ended",
+                        checked, started, moved, ended)
+
+    @commands.Cog.listener()
+    async def on_disconnect(self):
+        self.gateway_last_seen = time.monotonic()
+
+    @commands.Cog.listener()
+    async def on_resumed(self):
+        await self.reconcile_voice_sessions()
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.schedule_rollover(guild.id)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        await self.reconcile_voice_sessions()
+        for guild_id in {DM_GUILD_ID, *guilds, *(guild.id for guild in self.bot.guilds)}:
+            self.schedule_rollover(guild_id)
+
+async def setup(bot):
+    await bot.add_cog(Study(bot))
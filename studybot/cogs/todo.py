@@ -0,0 +1,141 @@
+import itertools
+import re
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from studybot.core import guilds, rate_limited, session_store
+from studybot.paginator import PaginatedView
+
+# Tasks keep the number they were given when added, so removing or finishing
+# one task never renumbers the others.
+def parse_task_ids(text):
+    """Turn "1, 3 4" into [1, 3, 4], dropping repeats. Raises ValueError on anything else."""
+    return list(dict.fromkeys(int(i) for i in re.split('[, ]+', text) if i.strip()))
+
+TASKS_PER_PAGE = 15
+
+def format_task(task):
+    return f"{task.id}. {task.text} {'✅' if task.done else ''}"
+
+class Todo(commands.Cog):
+    """Personal to-do lists, one per user and server."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name='add_task', description='Add a task to your to-do list')
+    @rate_limited()
+    async def add_task_slash(self, interaction: discord.Interaction, task: str):
+        """Adds a task to the user's personal to-do list."""
+        user_id = str(interaction.user.id)
+        state = guilds.get_for(interaction.guild)
+        to_do_list = await state.to_do_list.load(user_id)
+        added_tasks = []
+        for text in task.split(','):
+            new_task = to_do_list.add(text.strip())  # Add tasks as "not done"
+            session_store.save_task(state.guild_id, user_id, new_task)
+            added_tasks.append(new_task)
+
+        view = PaginatedView(
+            lambda tasks_display: discord.Embed(title="To-Do List Update", description=f"Added tasks:\n{tasks_display}", color=discord.Color.blue()),
+            lambda start: map(format_task, itertools.islice(added_tasks, start, None)),
+            lambda: len(added_tasks),
+            page_size=TASKS_PER_PAGE,
+            owner_id=interaction.user.id,
+        )
+        await view.send(interaction)
+
+    @app_commands.command(name='show_tasks', description='Show all tasks in your to-do list')
+    @rate_limited()
+    async def show_tasks_slash(self, interaction: discord.Interaction):
+        """Shows all tasks in the user's personal to-do list."""
+        user_id = str(interaction.user.id)
+        state = guilds.get_for(interaction.guild)
+        to_do_list = await state.to_do_list.load(user_id)
+        if not to_do_list:
+            embed = discord.Embed(title="To-Do List", description="Your to-do list is empty!", color=discord.Color.blue())
+            await interaction.response.send_message(embed=embed)
+            return
+
+        view = PaginatedView(
+            lambda tasks_list: discord.Embed(
+                title="To-Do List",
+                description=f"Your to-do list:\n{tasks_list}\n\n**Completion: {to_do_list.completion_percentage():.2f}%**",
+                color=discord.Color.blue()
+            ),
+            lambda start: map(format_task, to_do_list.tasks_from(start)),
+            lambda: len(to_do_list),
+            page_size=TASKS_PER_PAGE,
+            owner_id=interaction.user.id,
+        )
+        await view.send(interaction)
+
+    @app_commands.command(name="remove_tasks", description="Remove multiple tasks by their numbers.")
+    @rate_limited()
+    async def remove_tasks_slash(self, interaction: discord.Interaction, indexes: str):
+        user_id = str(interaction.user.id)
+        state = guilds.get_for(interaction.guild)
+        to_do_list = await state.to_do_list.load(user_id)
+        try:
+            task_ids = parse_task_ids(indexes)
+            if not task_ids or to_do_list.missing(task_ids):
+                embed = discord.Embed(title="Error", description="Invalid task numbers! Make sure the numbers match tasks in your list.", color=discord.Color.red())
+            else:
+                removed_tasks = to_do_list.remove(task_ids)
+                for removed_task in removed_tasks:
+                    session_store.delete_task(state.guild_id, user_id, removed_task.id)
+                embed = discord.Embed(title="To-Do List Update", description=f"Removed tasks: {', '.join(t.text for t in removed_tasks)}", color=discord.Color.blue())
+        except ValueError:
+            embed = discord.Embed(title="Error", description="Invalid task numbers! Please enter valid integers for the task indexes separated by spaces or commas.", color=discord.Color.red())
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name='mark_tasks_done', description='Mark multiple tasks as done by their numbers.')
+    @rate_limited()
+    async def mark_tasks_done_slash(self, interaction: discord.Interaction, indexes: str):
+        user_id = str(interaction.user.id)
+        state = guilds.get_for(interaction.guild)
+        to_do_list = await state.to_do_list.load(user_id)
+        try:
+            task_ids = parse_task_ids(indexes)
+            if not task_ids or to_do_list.missing(task_ids):
+                embed = discord.Embed(title="Error", description="Invalid task numbers! Make sure the numbers match tasks in your list.", color=discord.Color.red())
+            else:
+                marked_tasks = to_do_list.mark_done(task_ids)
+
+                # Check if all tasks are completed
+                if to_do_list.all_done():
+                    completed = to_do_list.take_all()
+                    session_store.clear_todo(state.guild_id, user_id)
+                    view = PaginatedView(
+                        lambda completed_tasks: discord.Embed(
+                            title="To-Do List Completed",
+                            description=f"Congratulations! All tasks have been completed:\n{completed_tasks}\n\nYour to-do list has been cleared. Feel free to add new tasks!",
+                            color=discord.Color.green()
+                        ),
+                        lambda start: map(format_task, completed.tasks_from(start)),
+                        lambda: len(completed),
+                        page_size=TASKS_PER_PAGE,
+                        owner_id=interaction.user.id,
+                    )
+                    await view.send(interaction)
+                    return
+                else:
+                    embed = discord.Embed(
+                        title="To-Do List Update",
+                        description=f"Marked tasks: {', '.join(t.text for t in marked_tasks)} as done ✅. Look at you finishing those tasks, good luck with your other tasks :)",
+                        color=discord.Color.green()
+                    )
+                    for task in marked_tasks:
+                        session_store.save_task(state.guild_id, user_id, task)
+        except ValueError:
+            embed = discord.Embed(
+                title="Error",
+                description="Invalid task numbers! Please enter valid integers for the task indexes separated by spaces or commas.",
+                color=discord.Color.red()
+            )
+        await interaction.response.send_message(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(Todo(bot))
@@ -0,0 +1,375 @@
+import asyncio
+import functools
+import logging
+import math
+import os
+import time
+from datetime import timezone
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from studybot.broadcaster import Broadcaster
+from studybot.cron_scheduler import CronScheduler
+from studybot.guild_state import GuildStates
+from studybot.http_client import HttpClient
+from studybot.metrics import LoopLagMonitor, MetricsRegistry
+from studybot.profiler import Profiler
+from studybot.rate_limit import CommandLimiter, CommandRateLimited, TokenBucket
+from studybot.session_store import SessionStore
+from studybot.shuffle_bag import ShuffleBags
+from studybot.study_history import PERIODS, from_wall_time, load_timezone, period_bounds
+from studybot.timer_scheduler import TimerScheduler
+
+logger = logging.getLogger('studybot')
+
+DATABASE_PATH = os.getenv('DATABASE_PATH', 'bot_state.db')
+
+# Sharding: set SHARD_COUNT (and optionally SHARD_IDS) to run as an AutoShardedBot, see launcher.py
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', '0')) or None
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv('SHARD_IDS', '').split(',') if shard_id.strip()] or None
+
+# Features to load, see studybot/cogs; COGS=pomodoro,todo runs only those two
+ALL_COGS = ('pomodoro', 'todo', 'study', 'motivation', 'health', 'cat')
+COGS = [name.strip() for name in os.getenv('COGS', ','.join(ALL_COGS)).split(',') if name.strip()]
+
+# Quotes and health reminders do not repeat within this many picks in a server (broadcasts) or channel (commands)
+NO_REPEAT_WINDOW = int(os.getenv('NO_REPEAT_WINDOW', '20'))
+
+# Specify the channel ID for automatic announcements and resets
+announcement_channel_id = 10  # Replace with your specific channel ID
+channel_ids = [10, 10, 10]  # Just add commas to add another channel for motivation and health reminder
+
+# Initialize the bot
+intents = discord.Intents.default()
+intents.message_content = True
+intents.voice_states = True
+intents.members = True
+
+# Persistent state, written behind the in-memory guild state below
+session_store = SessionStore(DATABASE_PATH)
+pending_pomodoro_restores = []  # Picked up by the pomodoro cog once the bot is ready
+
+# Per-server state: study rooms, announcement channels, times, to-do lists and leaderboards
+guilds = GuildStates(session_store)
+
+# Shared, pooled HTTP client for the quote and cat APIs
+http_client = HttpClient()
+
+# One background task for every Pomodoro timer and scheduled job
+timer_scheduler = TimerScheduler()
+
+# Leaderboard rollovers and reminder broadcasts, at cron times in each server's timezone
+cron_scheduler = CronScheduler(timer_scheduler, session_store.save_next_fire)
+
+# Metrics, served on /metrics by the health server; the values other objects already keep are registered in
+# register_metrics() here and in each cog's cog_load
+registry = MetricsRegistry(prefix='studybot_')
+command_latency = registry.histogram(
+    'command_duration_seconds', 'Time from receiving a slash command to finishing it', ('command', 'outcome')
+)
+messages_sent = registry.counter('discord_messages_sent_total', 'Messages posted by the bot').labels()
+caches = {}  # Cache name -> object with hits/misses, filled in by the cogs that own them
+loop_lag = LoopLagMonitor()
+profiler = Profiler(loop_lag)  # Wired up in setup_profiling()
+
+# Uptime, readiness and metrics endpoints, served on the bot's own loop (with the launcher, every shard
+# process serves them on its own port)
+health_server = None
+if os.getenv('KEEP_ALIVE', '1') == '1':
+    from studybot.keep_alive import HealthServer
+
+    health_server = HealthServer(readiness=lambda: readiness_checks(), render_metrics=registry.render)
+    health_server.add_json_route('/profile', lambda query: profiler.report(int(query.get('top', 10))))
+
+
+class StartupTimer:
+    """Seconds from process start to each startup phase; main.py hands over the start time."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+
+    def mark(self, phase):
+        if phase not in self.phases:
+            self.phases[phase] = time.perf_counter() - self.started
+
+
+startup_timer = StartupTimer()
+
+
+def observe_command(interaction, command, outcome):
+    started = interaction.extras.get('started')
+    if started is not None and command is not None:
+        command_latency.labels(command.qualified_name, outcome).observe(time.perf_counter() - started)
+
+
+# Slash command budgets: a user may burst 5 commands and then run one every 2 seconds, a server 30 and then 5 a
+# second. Every command is decorated with @rate_limited(), the ones that cost Discord or API calls with a higher cost.
+command_limiter = CommandLimiter(user_rate=0.5, user_burst=5, guild_rate=5.0, guild_burst=30)
+rate_limited = command_limiter.check
+
+
+class StudyCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction):
+        # Runs before every slash command; on_app_command_completion/on_error record the duration
+        interaction.extras['started'] = time.perf_counter()
+        return True
+
+    async def on_error(self, interaction, error):
+        if isinstance(error, CommandRateLimited):
+            observe_command(interaction, interaction.command, 'rate_limited')
+            if not interaction.response.is_done():
+                await interaction.response.send_message(
+                    f"Slow down a little! Try again in {math.ceil(error.retry_after)} seconds.", ephemeral=True
+                )
+            return
+        observe_command(interaction, interaction.command, 'error')
+        await super().on_error(interaction, error)
+
+
+class StudyBot(commands.AutoShardedBot if SHARD_COUNT else commands.Bot):
+    async def setup_hook(self):
+        if health_server is not None:
+            await health_server.start()
+        loop_lag.start()
+        await asyncio.to_thread(session_store.open)
+        await restore_state()
+        session_store.start()
+        await http_client.start()
+        await load_extensions(self)
+        setup_profiling()  # After the cogs, so their commands are instrumented too
+        startup_timer.mark('setup')
+
+    async def close(self):
+        await super().close()
+        await http_client.close()
+        await session_store.close()
+        loop_lag.stop()
+        if health_server is not None:
+            await health_server.stop()
+
+
+bot_options = {'shard_count': SHARD_COUNT, 'shard_ids': SHARD_IDS} if SHARD_COUNT else {}
+bot = StudyBot(command_prefix='/', intents=intents, tree_cls=StudyCommandTree, **bot_options)
+
+# Discord allows 50 requests a second per bot; timer embed edits and broadcasts share this budget
+rest_budget = TokenBucket(40.0, 40)
+
+# Motivational quotes and health reminders, sent to every reminder channel of a server at once
+broadcaster = Broadcaster(lambda channel_id: bot.get_channel(channel_id), global_bucket=rest_budget)
+
+
+async def load_extensions(bot, names=None):
+    """Import and load the feature cogs in ``names`` (default: ``COGS``); a broken cog is logged and skipped."""
+    for name in COGS if names is None else names:
+        try:
+            await bot.load_extension(f'studybot.cogs.{name}')
+        except commands.ExtensionError:
+            logger.exception("Could not load the %s cog", name)
+
+
+def shuffle_bags(name, items):
+    """``ShuffleBags`` over ``items`` keyed by ``(guild_id, channel_id)``, remembered in the session store as ``name``."""
+    return ShuffleBags(
+        items, NO_REPEAT_WINDOW,
+        load=lambda key: session_store.load_recent_picks(name, *key),
+        save=lambda key, recent: session_store.save_recent_picks(name, *key, recent),
+    )
+
+
+def schedule_broadcasts(name, schedule, send):
+    """Schedule ``send(guild_id)`` for every server with motivation and health reminder channels."""
+    for state in list(guilds.values()):
+        if state.channel_ids:
+            cron_scheduler.add(name, state.guild_id, schedule, functools.partial(send, state.guild_id), state.timezone)
+        else:
+            cron_scheduler.remove(name, state.guild_id)
+
+
+# Help Commands
+@bot.tree.command(name='help', description='Shows available commands')
+@rate_limited()
+async def help_slash(interaction: discord.Interaction):
+    embed = discord.Embed(
+        title="Help Commands",
+        description="Here are the commands you can use:",
+        color=discord.Color.blue()
+    )
+
+    embed.add_field(name="/pomodoro [work_minutes] [break_minutes]", value="Start a Pomodoro timer (default 25 work, 5 break)", inline=False)
+    embed.add_field(name="/add_task [task]", value="Add a task to your to-do list (Use comma to add more than one tasks)", inline=False)
+    embed.add_field(name="/show_tasks", value="Show your current to-do list", inline=False)
+    embed.add_field(name="/remove_task [task_number]", value="Remove a task from your to-do list by its number (Use comma to delete multiple tasks)", inline=False)
+    embed.add_field(name="/motivate", value="Get a motivational message", inline=False)
+    embed.add_field(name="/health_reminder", value="Receive health reminders every 30 minutes (running in the background)", inline=False)
+    embed.add_field(name="/log_study", value="Check your total Pomodoro study time", inline=False)
+    embed.add_field(name="/show_leaderboard", value="Display the daily, weekly, monthly or all-time study leaderboard", inline=False)
+    embed.add_field(name="/set_timezone [timezone]", value="Set when this server's days, weeks and months start (admin command)", inline=False)
+    embed.add_field(name="/mark_tasks_done", value="Mark your tasks as finish (Use comma to mark multiple tasks)", inline=False)
+    embed.add_field(name="/cat", value="Get a random funny cat image or GIF with a cat fact hehehe :)", inline=False)
+
+    await interaction.response.send_message(embed=embed)
+
+
+# Restoring State After A Restart
+async def restore_state():
+    """Load saved totals and open sessions of this process's shards before the bot connects."""
+    shard_ids = SHARD_IDS or (list(range(SHARD_COUNT)) if SHARD_COUNT else None)
+    wall_now = time.time()
+    saved = await asyncio.to_thread(session_store.load, wall_now, SHARD_COUNT, shard_ids)
+    zones = {None: timezone.utc}  # Saved timezone name -> tzinfo; None for servers that never set one
+    for guild_id, name in saved["timezones"].items():
+        if name not in zones:
+            try:
+                zones[name] = load_timezone(name)
+            except ValueError:
+                logger.warning("Unknown timezone %r saved for server %s, using UTC", name, guild_id)
+                zones[name] = timezone.utc
+        guilds[guild_id].timezone = zones[name]
+        guilds[guild_id].start_periods(wall_now)
+    for (guild_id, user_id), seconds in saved["work_times"].items():
+        guilds[guild_id].work_times[user_id] = seconds
+    for (guild_id, user_id), seconds in saved["study_times"].items():
+        guilds[guild_id].study_times[user_id] = seconds
+    for (guild_id, user_id), (channel_id, started_at) in saved["voice_sessions"].items():
+        guilds[guild_id].voice_channel_start_times[user_id] = from_wall_time(started_at)
+        guilds[guild_id].voice_channels[user_id] = channel_id
+    for guild_id, channel_id in saved["tracked_channels"]:
+        guilds[guild_id].tracked_channels.add(channel_id)
+    # Servers whose rollover came due while the bot was down get back the periods that were running then,
+    # so the catch-up rollover can announce them before starting the current ones
+    restored_as_of = {
+        guild_id: next_fire - 1 for (job, guild_id), next_fire in saved["next_fires"].items()
+        if job == 'leaderboard_rollover' and next_fire <= wall_now
+    }
+    for guild_id, as_of in restored_as_of.items():
+        guilds[guild_id].start_periods(as_of)
+    period_groups = {(name, wall_now) for name in zones}  # Saved timezone name and when its periods are read
+    period_groups.update((saved["timezones"].get(guild_id), as_of) for guild_id, as_of in restored_as_of.items())
+    for name, as_of in period_groups:
+        period_starts = {
+            period: period_bounds(period, as_of, zones[name])[0] for period in PERIODS if period != 'all_time'
+        }
+        saved_periods = await asyncio.to_thread(
+            session_store.load_period_times, period_starts, name, SHARD_COUNT, shard_ids
+        )
+        for period, period_times in saved_periods.items():
+            for (guild_id, user_id), seconds in period_times.items():
+                if restored_as_of.get(guild_id, wall_now) == as_of:
+                    guilds[guild_id].periods[period].credited[user_id] = seconds
+    for state in guilds.values():
+        all_time = state.periods['all_time'].credited
+        for user_id in state.work_times.keys() | state.study_times.keys():
+            all_time[user_id] = state.work_times.get(user_id, 0) + state.study_times.get(user_id, 0)
+        state.rebuild_leaderboards()
+    pending_pomodoro_restores.extend(saved["pomodoro_sessions"])
+    cron_scheduler.restore(saved["next_fires"])
+    logger.info("Restored %s work totals, %s study totals, %s voice sessions and %s Pomodoro sessions across %s servers",
+                len(saved['work_times']), len(saved['study_times']), len(saved['voice_sessions']),
+                len(pending_pomodoro_restores), len(guilds))
+
+def assign_configured_channels():
+    """Hand the configured announcement and reminder channels to the servers they belong to."""
+    channel = bot.get_channel(announcement_channel_id)
+    if channel is not None and getattr(channel, 'guild', None) is not None:
+        guilds[channel.guild.id].announcement_channel_id = announcement_channel_id
+    for state in guilds.values():
+        state.channel_ids.clear()
+    for channel_id in channel_ids:
+        channel = bot.get_channel(channel_id)
+        if channel is not None and getattr(channel, 'guild', None) is not None:
+            guilds[channel.guild.id].channel_ids.append(channel_id)
+
+@bot.event
+async def on_app_command_completion(interaction, command):
+    observe_command(interaction, command, 'ok')
+
+@bot.listen('on_message')
+async def count_sent_messages(message):
+    if message.author == bot.user:
+        messages_sent.inc()
+
+@bot.event
+async def on_ready():
+    # Dispatched before the cogs' on_ready listeners, so they schedule broadcasts for the configured channels
+    assign_configured_channels()
+    await bot.tree.sync()
+    startup_timer.mark('ready')
+    logger.info("Logged in as %s and slash commands are synced!", bot.user)
+    logger.info("Cold start: imports took %.2fs, setup %.2fs, ready after %.2fs",
+                startup_timer.phases.get('imports', 0.0), startup_timer.phases.get('setup', 0.0),
+                startup_timer.phases['ready'])
+
+
+# Metrics And Profiling
+def setup_profiling():
+    """Profile every slash command and scheduled job; PROFILE_SLOW_CALLBACKS=<seconds> also records slow callbacks."""
+    if os.getenv('PROFILE_COMMANDS', '1') == '1':
+        profiler.instrument_tree(bot.tree)
+        cron_scheduler.wrap = profiler.wrap  # Jobs are added from the cogs' on_ready listeners, after this
+    slow_callback_threshold = os.getenv('PROFILE_SLOW_CALLBACKS')
+    if slow_callback_threshold:
+        profiler.enable_slow_callback_capture(asyncio.get_running_loop(), float(slow_callback_threshold))
+
+@bot.tree.command(name='profile', description='Show which commands and jobs hold the bot up the most (admin command)')
+@app_commands.checks.has_permissions(administrator=True)
+@rate_limited()
+async def profile_slash(interaction: discord.Interaction, top: int = 10):
+    """Show the top hot paths recorded by the profiler (admin command)."""
+    embed = discord.Embed(
+        title="Profile",
+        description=profiler.format_report(max(1, min(top, 25)))[:4000],
+        color=discord.Color.blue()
+    )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+def register_metrics():
+    """Expose the counters and sizes the shared components already keep; they are read on every scrape."""
+    registry.callback('event_loop_lag_seconds', 'histogram', 'How late the event loop runs a task that should wake up',
+                      lambda: [((), loop_lag.histogram)])
+    registry.callback('startup_seconds', 'gauge', 'Seconds from process start to each startup phase',
+                      lambda: [((phase,), seconds) for phase, seconds in startup_timer.phases.items()], ('phase',))
+    registry.callback('voice_sessions_active', 'gauge', 'People currently timed in a study room',
+                      lambda: [((), sum(len(state.voice_channel_start_times) for state in guilds.values()))])
+    registry.callback('scheduled_jobs', 'gauge', 'Leaderboard rollovers and reminder broadcasts waiting for their time',
+                      lambda: [((), len(cron_scheduler))])
+    registry.callback('scheduled_job_runs_total', 'counter', 'Scheduled job runs by outcome',
+                      lambda: [(key, count) for key, count in list(cron_scheduler.runs.items())], ('job', 'outcome'))
+    registry.callback('broadcast_deliveries_total', 'counter', 'Broadcast messages by channel outcome',
+                      lambda: [(key, count) for key, count in list(broadcaster.deliveries.items())],
+                      ('broadcast', 'outcome'))
+    registry.callback('broadcast_delivery_seconds', 'histogram', 'Time from the start of a broadcast until a channel got it',
+                      lambda: [((name,), histogram) for name, histogram in list(broadcaster.latency.items())],
+                      ('broadcast',))
+    registry.callback('command_rate_limit_decisions_total', 'counter', 'Slash commands let through or limited per user or server',
+                      lambda: [(key, count) for key, count in list(command_limiter.decisions.items())],
+                      ('command', 'decision'))
+    registry.callback('command_rate_limit_buckets', 'gauge', 'Users and servers with a command token bucket in memory',
+                      lambda: [((), len(command_limiter))])
+    registry.callback('guilds_tracked', 'gauge', 'Servers with state in this process', lambda: [((), len(guilds))])
+    registry.callback('http_request_duration_seconds', 'histogram', 'Latency of successful outbound API requests',
+                      lambda: [((host,), histogram) for host, histogram in http_client.latency.items()], ('host',))
+    registry.callback('http_request_errors_total', 'counter', 'Failed outbound API request attempts',
+                      lambda: [((host,), count) for host, count in http_client.errors.items()], ('host',))
+    registry.callback('cache_requests_total', 'counter', 'Quote and cat cache lookups by result',
+                      lambda: [
+                          ((name, result), count) for name, cache in list(caches.items())
+                          for result, count in (('hit', cache.hits), ('miss', cache.misses))
+                      ], ('cache', 'result'))
+    registry.callback('session_store_flushes_total', 'counter', 'Write-behind flushes to SQLite',
+                      lambda: [((), session_store.flushes)])
+    registry.callback('session_store_rows_written_total', 'counter', 'Rows written by the session store',
+                      lambda: [((), session_store.rows_written)])
+
+register_metrics()
+
+def readiness_checks():
+    """What /ready reports: the gateway is connected and every background task is running."""
+    return {
+        "gateway_connected": bot.is_ready() and not bot.is_closed() and math.isfinite(bot.latency),
+        "session_store_flushing": session_store.is_running(),
+        "loop_lag_monitor": loop_lag.is_running(),
+        "scheduled_jobs": cron_scheduler.is_running(),
+    }
@@ -0,0 +1,188 @@
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+MAX_SLEEP = 3600  # Longest single timer, so clock changes are noticed within the hour
+
+# Field name, lowest and highest value; weekday 7 is Sunday again, as in cron
+CRON_FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7))
+
+
+def _parse_field(field, name, low, high):
+    values = set()
+    for part in field.split(','):
+        spec, _, step = part.partition('/')
+        try:
+            if spec == '*':
+                first, last = low, high
+            elif '-' in spec:
+                first, last = map(int, spec.split('-', 1))
+            else:
+                first = int(spec)
+                last = high if step else first  # "5/15" runs from 5 to the end of the range
+            step = int(step) if step else 1
+        except ValueError:
+            raise ValueError(f"Invalid cron {name} {part!r}") from None
+        if not low <= first <= last <= high or step < 1:
+            raise ValueError(f"Cron {name} {part!r} is outside {low}-{high}")
+        values.update(range(first, last + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A five-field cron expression: minute, hour, day of month, month and weekday, e.g. ``0 */3 * * *``.
+
+    Fields take ``*``, numbers, ranges (``1-5``), lists (``1,15``) and steps
+    (``*/6``, ``0-30/10``). Weekdays run from 0 (Sunday) to 6. As in cron, when
+    both the day of month and the weekday are restricted, a day matching
+    either one fires.
+    """
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression {expression!r} needs {len(CRON_FIELDS)} fields")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(field, name, low, high) for field, (name, low, high) in zip(fields, CRON_FIELDS)
+        )
+        self.weekdays = {weekday % 7 for weekday in weekdays}
+        self._either_day = fields[2] != '*' and fields[4] != '*'
+
+    def __repr__(self):
+        return f"CronSchedule({self.expression!r})"
+
+    def _day_matches(self, local):
+        in_month = local.day in self.days
+        in_week = (local.weekday() + 1) % 7 in self.weekdays  # datetime counts from Monday, cron from Sunday
+        return in_month or in_week if self._either_day else in_month and in_week
+
+    def next_after(self, when, tz=timezone.utc):
+        """Wall-clock time of the first match strictly after ``when``, on the clock of ``tz``."""
+        start = datetime.fromtimestamp(when, tz).replace(tzinfo=None, second=0, microsecond=0)
+        local = start + timedelta(minutes=1)
+        while local.year <= start.year + 8:  # Long enough for 29 February
+            if local.month not in self.months:
+                local = (local.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(local):
+                local = local.replace(hour=0, minute=0) + timedelta(days=1)
+            elif local.hour not in self.hours:
+                local = local.replace(minute=0) + timedelta(hours=1)
+            elif local.minute not in self.minutes:
+                local += timedelta(minutes=1)
+            else:
+                fire = local.replace(tzinfo=tz).timestamp()
+                if fire > when:  # A repeated hour when the clocks go back only fires once
+                    return fire
+                local += timedelta(minutes=1)
+        raise ValueError(f"Cron expression {self.expression!r} never fires")
+
+
+class CronJob:
+    __slots__ = ('name', 'guild_id', 'schedule', 'callback', 'tz', 'next_fire', 'handle')
+
+    def __init__(self, name, guild_id, schedule, callback, tz):
+        self.name = name
+        self.guild_id = guild_id
+        self.schedule = schedule
+        self.callback = callback
+        self.tz = tz
+        self.next_fire = None  # Wall-clock time
+        self.handle = None
+
+
+class CronScheduler:
+    """Run jobs on cron schedules, each sleeping until its next fire time instead of polling.
+
+    Jobs are keyed by name and server and follow the server's timezone. Their
+    timers are set on the shared ``TimerScheduler``, at most ``MAX_SLEEP``
+    ahead, so a changed system clock only delays a job until the next check.
+    Every new fire time goes to ``save_next_fire``; after a restart, a job
+    whose saved time passed while the bot was down runs once as soon as it is
+    added again instead of every missed time.
+    """
+
+    def __init__(self, timers, save_next_fire=None):
+        self.timers = timers  # timer_scheduler.TimerScheduler
+        self.save_next_fire = save_next_fire  # Called with (name, guild_id, next fire time or None)
+        self.wrap = None  # Applied to callbacks as jobs are added, e.g. Profiler.wrap
+        self.jobs = {}  # (name, guild_id) -> CronJob
+        self.saved_fires = {}  # (name, guild_id) -> next fire time saved before a restart
+        self.runs = Counter()  # (name, 'ok' or 'error') -> runs
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def is_running(self):
+        return not self.jobs or self.timers.is_running()
+
+    def restore(self, next_fires):
+        """Hand over the fire times saved before a restart, keyed by ``(name, guild_id)``."""
+        self.saved_fires.update(next_fires)
+
+    def add(self, name, guild_id, schedule, callback, tz=timezone.utc):
+        """Run ``callback()`` (a coroutine function) at every fire time of ``schedule`` in ``tz``.
+
+        Adding a job that is already scheduled changes nothing.
+        """
+        key = (name, guild_id)
+        if key in self.jobs:
+            return self.jobs[key]
+        if self.wrap is not None:
+            callback = self.wrap(name, callback)
+        job = self.jobs[key] = CronJob(name, guild_id, schedule, callback, tz)
+        saved = self.saved_fires.pop(key, None)
+        self._set_next_fire(job, saved if saved is not None else schedule.next_after(time.time(), tz))
+        return job
+
+    def remove(self, name, guild_id):
+        """Unschedule a job and forget its saved fire time."""
+        job = self.jobs.pop((name, guild_id), None)
+        saved = self.saved_fires.pop((name, guild_id), None)
+        if job is not None:
+            job.handle.cancel()
+        if (job is not None or saved is not None) and self.save_next_fire is not None:
+            self.save_next_fire(name, guild_id, None)
+
+    def cancel(self, name):
+        """Stop every job called ``name`` but keep their fire times, e.g. while the cog is unloaded."""
+        for key, job in list(self.jobs.items()):
+            if job.name == name:
+                job.handle.cancel()
+                self.saved_fires[key] = job.next_fire
+                del self.jobs[key]
+
+    def set_timezone(self, guild_id, tz):
+        """Move every job of ``guild_id`` to ``tz``, from its next fire time on."""
+        for job in list(self.jobs.values()):
+            if job.guild_id == guild_id:
+                job.tz = tz
+                job.handle.cancel()
+                self._set_next_fire(job, job.schedule.next_after(time.time(), tz))
+
+    def _set_next_fire(self, job, next_fire):
+        job.next_fire = next_fire
+        if self.save_next_fire is not None:
+            self.save_next_fire(job.name, job.guild_id, next_fire)
+        self._arm(job)
+
+    def _arm(self, job):
+        delay = min(max(0.0, job.next_fire - time.time()), MAX_SLEEP)
+        job.handle = self.timers.call_later(delay, lambda: self._wake(job))
+
+    async def _wake(self, job):
+        now = time.time()
+        if now < job.next_fire:  # An intermediate wakeup, or the clock went back
+            self._arm(job)
+            return
+        self._set_next_fire(job, job.schedule.next_after(now, job.tz))
+        try:
+            await job.callback()
+        except Exception:
+            self.runs[job.name, 'error'] += 1
+            logger.exception("Scheduled job %s failed for server %s", job.name, job.guild_id)
+        else:
+            self.runs[job.name, 'ok'] += 1
@@ -0,0 +1,165 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections import OrderedDict
+
+import discord
+
+from studybot.rate_limit import TokenBucket, TokenBuckets
+
+logger = logging.getLogger(__name__)
+
+
+class PendingEdit:
+    __slots__ = ('message', 'embed', 'on_missing')
+
+    def __init__(self, message, embed, on_missing):
+        self.message = message
+        self.embed = embed
+        self.on_missing = on_missing
+
+
+class EmbedUpdateQueue:
+    """Coalescing, rate-limited pipeline for editing embeds.
+
+    Every message has at most one pending edit. Submitting a newer embed for a
+    message that has not been edited yet replaces the stale one, so a slow
+    channel only ever receives the latest state. Edits are paced by a token
+    bucket per channel and one global bucket, keeping the bot out of Discord's
+    429 backoff. Pass ``global_bucket`` to share the global one with other senders.
+    """
+
+    def __init__(self, channel_rate=1.0, channel_burst=5, global_rate=40.0, global_burst=40, max_in_flight=10,
+                 global_bucket=None):
+        self._global_bucket = global_bucket or TokenBucket(global_rate, global_burst)
+        self._channel_buckets = TokenBuckets(channel_rate, channel_burst)  # Idle channels are dropped
+        self._pending = {}  # channel id -> OrderedDict(message id -> PendingEdit)
+        self._ready = []  # heap of (time the channel may send again, channel id)
+        self._scheduled = set()
+        self._wakeup = asyncio.Event()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._sending = set()
+        self._task = None
+
+        self.edits_sent = 0
+        self.edits_coalesced = 0
+        self.edits_failed = 0
+
+    def __len__(self):
+        return sum(len(edits) for edits in self._pending.values())
+
+    def stats(self):
+        return {
+            "edits_sent": self.edits_sent,
+            "edits_coalesced": self.edits_coalesced,
+            "edits_failed": self.edits_failed,
+            "edits_pending": len(self),
+        }
+
+    def submit(self, message, embed, on_missing=None):
+        """Queue ``embed`` as the next state of ``message``, replacing any unsent state."""
+        channel_id = message.channel.id
+        edits = self._pending.setdefault(channel_id, OrderedDict())
+        pending = edits.get(message.id)
+        if pending is not None:
+            pending.message = message
+            pending.embed = embed
+            pending.on_missing = on_missing
+            self.edits_coalesced += 1
+        else:
+            edits[message.id] = PendingEdit(message, embed, on_missing)
+        self._schedule_channel(channel_id, time.monotonic())
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def discard(self, message):
+        """Drop an unsent edit, e.g. because the message was replaced."""
+        edits = self._pending.get(message.channel.id)
+        if edits is not None:
+            edits.pop(message.id, None)
+
+    def _schedule_channel(self, channel_id, now):
+        if channel_id in self._scheduled:
+            return
+        self._scheduled.add(channel_id)
+        ready_at = now + self._channel_buckets.get(channel_id).delay(now)
+        heapq.heappush(self._ready, (ready_at, channel_id))
+        if self._ready[0][1] == channel_id:
+            self._wakeup.set()
+
+    async def _sleep(self, delay):
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            ready_at, channel_id = self._ready[0]
+            if ready_at > now:
+                await self._sleep(ready_at - now)
+                continue
+
+            global_delay = self._global_bucket.delay(now)
+            if global_delay > 0:
+                await self._sleep(global_delay)
+                continue
+
+            heapq.heappop(self._ready)
+            self._scheduled.discard(channel_id)
+            edits = self._pending.get(channel_id)
+            if not edits:
+                self._pending.pop(channel_id, None)
+                continue
+
+            bucket = self._channel_buckets.get(channel_id)
+            if not bucket.try_acquire(now):
+                self._schedule_channel(channel_id, now)
+                continue
+            self._global_bucket.try_acquire(now)
+
+            _, pending = edits.popitem(last=False)
+            if edits:
+                self._schedule_channel(channel_id, now)
+            else:
+                del self._pending[channel_id]
+
+            await self._in_flight.acquire()
+            task = loop.create_task(self._send(pending))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, pending):
+        try:
+            await pending.message.edit(embed=pending.embed)
+            self.edits_sent += 1
+        except discord.NotFound:
+            self.edits_failed += 1
+            logger.warning("Message %s not found, it may have been deleted", pending.message.id)
+            if pending.on_missing is not None:
+                await pending.on_missing()
+        except discord.Forbidden:
+            self.edits_failed += 1
+            logger.warning("Missing permission to edit messages in channel %s", pending.message.channel.id)
+        except discord.HTTPException as e:
+            self.edits_failed += 1
+            if e.status == 429:
+                # Back off this channel and retry unless a newer state arrived meanwhile.
+                channel_id = pending.message.channel.id
+                self._channel_buckets.get(channel_id).drain()
+                edits = self._pending.setdefault(channel_id, OrderedDict())
+                edits.setdefault(pending.message.id, pending)
+                self._schedule_channel(channel_id, time.monotonic())
+            else:
+                logger.error("Error updating embed: %s", e)
+        finally:
+            self._in_flight.release()
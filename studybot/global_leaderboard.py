@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+from studybot.study_history import period_bounds
+
+
+class GlobalLeaderboardCache:
+    """Cross-server top lists per period, read from the shared store at most once every ``ttl`` seconds.
+
+    ``read_top(k, since)`` aggregates every server's history, so it runs in a
+    worker thread and its result is served to every request until it expires
+    or the period rolls over. Requests that miss at the same time share one
+    read. Nothing is flushed first: the lists lag by up to ``ttl`` plus the
+    store's flush interval.
+    """
+
+    def __init__(self, read_top, k=10, ttl=60.0, clock=time.monotonic):
+        self.read_top = read_top  # Blocking (k, since) -> [(user_id, minutes)], e.g. SessionStore.global_top
+        self.k = k
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = {}  # (period, since) -> (expires_at, rows)
+        self._reads = {}  # (period, since) -> task reading them
+        self.hits = 0
+        self.misses = 0
+
+    async def top(self, period):
+        """The top ``k`` ``(user_id, minutes)`` of ``period`` (UTC bounds) across every server."""
+        key = (period, None if period == 'all_time' else period_bounds(period, time.time())[0])
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > self.clock():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        read = self._reads.get(key)
+        if read is None:
+            read = self._reads[key] = asyncio.ensure_future(self._read(key))
+            read.add_done_callback(lambda _: self._reads.pop(key, None))
+        return await asyncio.shield(read)  # A cancelled request must not cancel the read others wait for
+
+    async def _read(self, key):
+        period, since = key
+        rows = await asyncio.to_thread(self.read_top, self.k, since)
+        # Entries of ended periods are dropped when the next one is stored
+        self._entries = {cached: entry for cached, entry in self._entries.items() if cached[0] != period}
+        self._entries[key] = (self.clock() + self.ttl, rows)
+        return rows
@@ -0,0 +1,153 @@
+import time
+from collections import defaultdict
+from datetime import timezone
+
+from studybot.leaderboard_index import LiveLeaderboard
+from studybot.study_history import PERIODS, from_wall_time, period_bounds
+from studybot.todo_store import TodoList
+
+DM_GUILD_ID = 0  # State for commands used outside of a server
+
+
+class TodoLists(dict):
+    """Per-user to-do lists, read from the session store the first time each user is seen."""
+
+    def __init__(self, load_todo):
+        super().__init__()
+        self._load_todo = load_todo  # async, returns the user's saved tasks
+
+    async def load(self, user_id):
+        """The user's to-do list, read from the session store (off the event loop) if it is not in memory yet."""
+        tasks = self.get(user_id)
+        if tasks is None:
+            rows = await self._load_todo(user_id)
+            tasks = self.setdefault(user_id, TodoList(rows))  # Another command may have loaded it meanwhile
+        return tasks
+
+
+class PeriodStanding:
+    """Seconds studied per user in one leaderboard period, plus its live leaderboard."""
+
+    __slots__ = ('period', 'started', 'ends_at', 'credited', 'leaderboard')
+
+    def __init__(self, period, started, ends_at):
+        self.period = period
+        self.started = started  # time.monotonic() of the period's start
+        self.ends_at = ends_at  # Wall-clock end, when the period rolls over
+        self.credited = defaultdict(int)  # Seconds credited this period, running study room sessions excluded
+        self.leaderboard = LiveLeaderboard()  # Seconds, including study room sessions in progress
+
+    def credit(self, user_id, seconds, now):
+        """Credit ``seconds`` that ended at ``now``; only the part after the period started counts."""
+        seconds = max(0, round(min(seconds, now - self.started)))
+        if seconds:
+            self.credited[user_id] += seconds
+            self.leaderboard.update(user_id, self.credited[user_id])
+
+    def roll(self, started, ends_at):
+        """Start the next period at ``started``; running sessions carry on, counted from there."""
+        self.started = started
+        self.ends_at = ends_at
+        self.credited.clear()
+        self.leaderboard.clear(started)
+
+
+class GuildState:
+    """Everything the bot tracks for one server, so servers never share data."""
+
+    def __init__(self, guild_id, load_todo):
+        self.guild_id = guild_id
+        self.tracked_channels = set()  # Voice channel IDs that count as study rooms
+        self.announcement_channel_id = None  # Where the weekly leaderboard is posted
+        self.channel_ids = []  # Where motivational quotes and health reminders are posted
+        self.work_times = defaultdict(int)  # All-time Pomodoro seconds per user
+        self.study_times = defaultdict(int)  # All-time voice channel seconds per user
+        self.voice_channel_start_times = {}  # User ID -> time.monotonic() when they joined a study room
+        self.voice_channels = {}  # User ID -> study room they are in
+        self.to_do_list = TodoLists(load_todo)
+        self.timezone = timezone.utc  # Where days, weeks and months start, set with /set_timezone
+        self.periods = {}  # Period name -> PeriodStanding, see study_history.PERIODS
+        self.start_periods(time.time())
+
+    def start_periods(self, wall_now):
+        """Start every period standing afresh at its bounds around ``wall_now``, in the server's timezone."""
+        for period in PERIODS:
+            start, end = period_bounds(period, wall_now, self.timezone)
+            self.periods[period] = PeriodStanding(period, from_wall_time(start), end)
+
+    def set_timezone(self, tz, wall_now):
+        """Switch to ``tz``: the running periods end at its next boundary and every later one follows it."""
+        self.timezone = tz
+        for period, standing in self.periods.items():
+            standing.ends_at = period_bounds(period, wall_now, tz)[1]
+
+    def study_seconds(self, user_id, now):
+        """All-time study room seconds of ``user_id``, counting the session they are in right now."""
+        seconds = self.study_times.get(user_id, 0)
+        started = self.voice_channel_start_times.get(user_id)
+        return seconds + now - started if started is not None else seconds
+
+    def credit_work(self, user_id, seconds, now):
+        """Credit Pomodoro work that ended at ``now`` (time.monotonic())."""
+        self.work_times[user_id] += seconds
+        for standing in self.periods.values():
+            standing.credit(user_id, seconds, now)
+
+    def rebuild_leaderboards(self):
+        for standing in self.periods.values():
+            standing.leaderboard.rebuild(standing.credited)
+            for user_id, started in self.voice_channel_start_times.items():
+                standing.leaderboard.start(user_id, standing.credited.get(user_id, 0), max(started, standing.started))
+
+    def start_voice_session(self, user_id, channel_id, started):
+        self.voice_channel_start_times[user_id] = started
+        self.voice_channels[user_id] = channel_id
+        for standing in self.periods.values():
+            standing.leaderboard.start(user_id, standing.credited.get(user_id, 0), max(started, standing.started))
+
+    def end_voice_session(self, user_id, now):
+        """Credit the user's running study room session; returns its seconds, or None if there was none."""
+        started = self.voice_channel_start_times.pop(user_id, None)
+        self.voice_channels.pop(user_id, None)
+        if started is None:
+            return None
+        seconds = max(0, round(now - started))
+        self.study_times[user_id] += seconds
+        for standing in self.periods.values():
+            standing.leaderboard.stop(user_id, standing.credited.get(user_id, 0))
+            standing.credit(user_id, seconds, now)
+        return seconds
+
+    def roll_periods(self, wall_now, now):
+        """Start over every period that ended by ``wall_now``; returns the names of those periods.
+
+        Only the in-memory standings start over: the time itself stays in the
+        session store's buckets.
+        """
+        rolled = []
+        for period, standing in self.periods.items():
+            if wall_now >= standing.ends_at:
+                start, end = period_bounds(period, wall_now, self.timezone)
+                standing.roll(now - (wall_now - start), end)
+                for user_id, started in self.voice_channel_start_times.items():
+                    if started > standing.started:  # Joined after the boundary but before this roll
+                        standing.leaderboard.start(user_id, 0, started)
+                rolled.append(period)
+        return rolled
+
+
+class GuildStates(dict):
+    """``GuildState`` objects keyed by guild ID, created on first use."""
+
+    def __init__(self, session_store):
+        super().__init__()
+        self._session_store = session_store
+
+    def __missing__(self, guild_id):
+        load_todo = lambda user_id: self._session_store.load_todo(guild_id, user_id)
+        state = self[guild_id] = GuildState(guild_id, load_todo)
+        return state
+
+    def get_for(self, guild):
+        """State for a ``discord.Guild`` (or the DM bucket when ``guild`` is None)."""
+        return self[guild.id if guild is not None else DM_GUILD_ID]
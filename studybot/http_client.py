@@ -0,0 +1,88 @@
+import asyncio
+import time
+from collections import defaultdict
+
+import aiohttp
+from yarl import URL
+
+from studybot.metrics import Histogram
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HttpClient:
+    """Application-wide pooled HTTP client for the quote and cat APIs.
+
+    One ``aiohttp.ClientSession`` is created when the bot starts, so
+    connections (and their TLS sessions) are kept alive and reused, DNS
+    answers are cached, and every request gets a timeout and a few retries.
+    Request latency is recorded per host.
+    """
+
+    def __init__(self, limit=100, limit_per_host=10, dns_cache_ttl=300, keepalive_timeout=30,
+                 timeout=10.0, retries=2, backoff=0.25):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.session = None
+        self.latency = defaultdict(Histogram)  # host -> Histogram of successful request latency
+        self.errors = defaultdict(int)  # host -> failed attempts
+
+    async def start(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def get_json(self, url, **kwargs):
+        return await self._get(url, lambda response: response.json(content_type=None), **kwargs)
+
+    async def get_bytes(self, url, **kwargs):
+        return await self._get(url, lambda response: response.read(), **kwargs)
+
+    async def _get(self, url, read, timeout=None):
+        """GET ``url`` and return ``await read(response)``, retrying transient failures.
+
+        Raises ``aiohttp.ClientError`` (timeouts included) once retries are used up.
+        """
+        await self.start()
+        host = URL(url).host
+        # Passing timeout=None would disable the session timeout, so only pass an override
+        options = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout is not None else {}
+        for attempt in range(self.retries + 1):
+            started = time.perf_counter()
+            try:
+                async with self.session.get(url, **options) as response:
+                    if response.status in RETRY_STATUSES and attempt < self.retries:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status
+                        )
+                    response.raise_for_status()
+                    result = await read(response)
+                self.latency[host].observe(time.perf_counter() - started)
+                return result
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.errors[host] += 1
+                if isinstance(e, aiohttp.ClientResponseError) and e.status not in RETRY_STATUSES:
+                    raise
+                if attempt == self.retries:
+                    if isinstance(e, aiohttp.ClientError):
+                        raise
+                    raise aiohttp.ServerTimeoutError(f"Timed out fetching {url}") from e
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    def latency_summary(self):
+        return {host: histogram.summary() for host, histogram in self.latency.items()}
@@ -0,0 +1,67 @@
+import json
+import logging
+import os
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+
+class HealthServer:
+    """Small HTTP server for uptime pings, readiness probes and metrics, run on the bot's own event loop.
+
+    ``/`` always answers while the process is up, ``/ready`` answers 200 only
+    when every check returned by ``readiness()`` passes (503 with the failing
+    checks otherwise), and ``/metrics`` serves ``render_metrics()``.
+    """
+
+    def __init__(self, port=None, readiness=None, render_metrics=None):
+        self.port = int(os.getenv('PORT', '8080')) if port is None else port
+        self.readiness = readiness  # Returns {check name: bool}
+        self.render_metrics = render_metrics
+        self._runner = None
+
+        self.app = web.Application()
+        self.app.router.add_get('/', self.home)
+        self.app.router.add_get('/ready', self.ready)
+        self.app.router.add_get('/metrics', self.metrics)
+
+    def add_json_route(self, path, render):
+        """Serve ``render(query)`` as JSON on ``path``; call before ``start``."""
+        async def handler(request):
+            try:
+                body = render(request.query)
+            except ValueError as e:
+                raise web.HTTPBadRequest(text=f"{e}\n")
+            return web.json_response(body)
+        self.app.router.add_get(path, handler)
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        self._runner = web.AppRunner(self.app, access_log=None, handle_signals=False)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, '0.0.0.0', self.port).start()
+        logger.info("Health server listening on port %s", self.port)
+
+    async def stop(self):
+        """Stop accepting connections and let in-flight requests finish."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def home(self, request):
+        return web.Response(text="Yes, Thank God I'm alive :)")
+
+    async def ready(self, request):
+        checks = self.readiness() if self.readiness is not None else {}
+        status = 200 if all(checks.values()) else 503
+        return web.Response(text=json.dumps(checks), status=status, content_type='application/json')
+
+    async def metrics(self, request):
+        if self.render_metrics is None:
+            raise web.HTTPNotFound(text="Metrics are not available\n")
+        return web.Response(
+            body=self.render_metrics().encode(),
+            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'},
+        )
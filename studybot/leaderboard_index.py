@@ -0,0 +1,186 @@
+import heapq
+import itertools
+import time
+from bisect import bisect_left, insort
+
+
+class LeaderboardIndex:
+    """Users ordered by score, updated in place whenever a score changes.
+
+    Entries are kept as ``(-score, user_id)`` in a sorted list, so the top K
+    is a slice and a user's rank is one binary search. An update is a binary
+    search plus a list insert/delete, which is a memmove of pointers and stays
+    cheap far beyond the size of any Discord server.
+    """
+
+    def __init__(self):
+        self._scores = {}
+        self._order = []
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, user_id):
+        return user_id in self._scores
+
+    def __iter__(self):
+        """Yield ``(user_id, score)`` pairs, best first."""
+        return ((user_id, -neg_score) for neg_score, user_id in self._order)
+
+    def score(self, user_id):
+        return self._scores.get(user_id, 0)
+
+    def update(self, user_id, score):
+        old = self._scores.get(user_id)
+        if old == score:
+            return
+        if old is not None:
+            del self._order[bisect_left(self._order, (-old, user_id))]
+        insort(self._order, (-score, user_id))
+        self._scores[user_id] = score
+
+    def remove(self, user_id):
+        old = self._scores.pop(user_id, None)
+        if old is not None:
+            del self._order[bisect_left(self._order, (-old, user_id))]
+
+    def rebuild(self, scores):
+        """Replace the whole index with ``scores`` (a mapping of user id to score)."""
+        self._scores = dict(scores)
+        self._order = sorted((-score, user_id) for user_id, score in self._scores.items())
+
+    def clear(self):
+        self._scores.clear()
+        self._order.clear()
+
+    def top(self, k, start=0):
+        """Return up to ``k`` ``(user_id, score)`` pairs, best first, skipping the first ``start``."""
+        return [(user_id, -neg_score) for neg_score, user_id in self._order[start:start + k]]
+
+    def rank(self, user_id):
+        """1-based rank of ``user_id`` (users with equal scores share a rank), or None if unranked."""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return self.count_above(score) + 1
+
+    def count_above(self, score):
+        """Number of users with a score strictly higher than ``score``."""
+        return bisect_left(self._order, (-score,))
+
+
+class LiveLeaderboard:
+    """Leaderboard of seconds studied that also counts sessions still in progress.
+
+    Users outside a session sit in a ``LeaderboardIndex`` of settled totals.
+    A user in a session scores ``credited + now - started``, which grows every
+    second; but ``now`` is the same for everyone, so running sessions are kept
+    in their own sorted list keyed by ``started - credited``, which does not
+    change while the session runs. A live score is then a dict lookup, a rank
+    is two binary searches and a page of K from any position is a binary
+    search for where it starts in each list plus a merge of K entries.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._settled = LeaderboardIndex()
+        self._running = {}  # user_id -> (credited, started)
+        self._running_order = []  # (started - credited, user_id), highest live score first
+
+    def __len__(self):
+        return len(self._settled) + len(self._running)
+
+    def __contains__(self, user_id):
+        return user_id in self._running or user_id in self._settled
+
+    def is_running(self, user_id):
+        return user_id in self._running
+
+    def score(self, user_id, now=None):
+        """Seconds credited to ``user_id`` plus their running session, if any."""
+        running = self._running.get(user_id)
+        if running is None:
+            return self._settled.score(user_id)
+        credited, started = running
+        return credited + (self.clock() if now is None else now) - started
+
+    def update(self, user_id, credited):
+        """Set the seconds already credited to ``user_id``, excluding any running session."""
+        running = self._running.get(user_id)
+        if running is None:
+            self._settled.update(user_id, credited)
+        else:
+            self._set_running(user_id, credited, running[1])
+
+    def start(self, user_id, credited, started):
+        """Start counting a session that began at ``started`` (on ``clock``) on top of ``credited``."""
+        self._settled.remove(user_id)
+        self._set_running(user_id, credited, started)
+
+    def stop(self, user_id, credited):
+        """End the running session of ``user_id``; ``credited`` now includes its time."""
+        self._remove_running(user_id)
+        self._settled.update(user_id, credited)
+
+    def rebuild(self, scores):
+        """Replace every settled total with ``scores`` and forget running sessions."""
+        self._running.clear()
+        self._running_order.clear()
+        self._settled.rebuild(scores)
+
+    def clear(self, now=None):
+        """Zero every score; running sessions carry on, counted from ``now``."""
+        now = self.clock() if now is None else now
+        self._settled.clear()
+        self._running = {user_id: (0, now) for user_id in self._running}
+        self._running_order = sorted((now, user_id) for user_id in self._running)
+
+    def top(self, k, start=0, now=None):
+        """Return up to ``k`` ``(user_id, seconds)`` pairs, best first, skipping the first ``start``."""
+        now = self.clock() if now is None else now
+        settled, running = self._settled._order, self._running_order
+        # Both lists are sorted best first, so the first ``start`` entries of the merge are a prefix of
+        # each: find how many come from the settled list by binary search instead of merging up to them.
+        # On equal scores settled users come first.
+        lo, hi = max(0, start - len(running)), min(start, len(settled))
+        while lo < hi:
+            i = (lo + hi) // 2
+            if -settled[i][0] >= now - running[start - i - 1][0]:
+                lo = i + 1
+            else:
+                hi = i
+        settled_from, running_from = lo, start - lo
+        merged = heapq.merge(
+            ((settled[i][1], -settled[i][0]) for i in range(settled_from, len(settled))),
+            ((running[i][1], now - running[i][0]) for i in range(running_from, len(running))),
+            key=lambda entry: -entry[1],
+        )
+        return list(itertools.islice(merged, k))
+
+    def rank(self, user_id, now=None):
+        """1-based rank of ``user_id`` by live score, or None if unranked."""
+        running = self._running.get(user_id)
+        if running is not None:
+            now = self.clock() if now is None else now
+            credited, started = running
+            threshold = started - credited
+            score = credited + now - started
+        elif user_id in self._settled:
+            now = self.clock() if now is None else now
+            score = self._settled.score(user_id)
+            threshold = now - score
+        else:
+            return None
+        running_above = bisect_left(self._running_order, (threshold,))
+        return self._settled.count_above(score) + running_above + 1
+
+    def _set_running(self, user_id, credited, started):
+        self._remove_running(user_id)
+        self._running[user_id] = (credited, started)
+        insort(self._running_order, (started - credited, user_id))
+
+    def _remove_running(self, user_id):
+        running = self._running.pop(user_id, None)
+        if running is not None:
+            credited, started = running
+            del self._running_order[bisect_left(self._running_order, (started - credited, user_id))]
@@ -0,0 +1,207 @@
+import asyncio
+import itertools
+import logging
+import os
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+
+class CachedMedia:
+    __slots__ = ('key', 'filename', 'size', 'data', 'path')
+
+    def __init__(self, key, filename, data):
+        self.key = key
+        self.filename = filename
+        self.size = len(data)
+        self.data = data  # None once the item has been spilled to disk
+        self.path = None
+
+
+class CatMediaCache:
+    """Pool of ready-to-send cat images/GIFs and cat facts, prefetched in the background.
+
+    Every downloaded file goes into an LRU bounded by ``memory_bytes``; items
+    pushed out of memory are spilled to ``directory`` (bounded by
+    ``disk_bytes``) and only dropped for good when the disk budget runs out.
+    Files that have not been sent yet are served first; once they run out,
+    the least recently sent cached file is reused while a refill runs, so
+    ``get_media`` only misses when the cache is completely empty.
+    """
+
+    def __init__(self, fetch_media, fetch_fact, directory, memory_bytes=32 * 1024 * 1024,
+                 disk_bytes=256 * 1024 * 1024, pool_size=6, fact_pool_size=20, concurrency=4):
+        self.fetch_media = fetch_media
+        self.fetch_fact = fetch_fact
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.pool_size = pool_size
+        self.fact_pool_size = fact_pool_size
+        self.concurrency = concurrency
+        self._items = OrderedDict()  # key -> CachedMedia, least recently used first
+        self._fresh = deque()  # keys that have not been sent yet
+        self._facts = deque()
+        self._last_fact = None
+        self._keys = itertools.count()
+        self._prefetch_task = None
+        self.memory_used = 0
+        self.disk_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.spills = 0
+        self.evictions = 0
+        self.fetch_errors = 0
+
+    async def start(self):
+        """Clear files spilled by a previous run and fill the pool."""
+        await asyncio.to_thread(_clear_spilled_files, self.directory)
+        self.request_prefetch()
+
+    def request_prefetch(self):
+        if self._prefetch_task is None or self._prefetch_task.done():
+            self._prefetch_task = asyncio.get_running_loop().create_task(self.prefetch())
+
+    async def prefetch(self):
+        """Top up the media pool and the fact pool, fetching concurrently."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(fetcher):
+            async with semaphore:
+                try:
+                    return await fetcher()
+                except Exception as e:
+                    self.fetch_errors += 1
+                    logger.warning("Error prefetching cat content: %s", e)
+                    return None
+
+        media_needed = max(0, self.pool_size - len(self._fresh))
+        facts_needed = max(0, self.fact_pool_size - len(self._facts))
+        results = await asyncio.gather(
+            asyncio.gather(*(fetch(self.fetch_media) for _ in range(media_needed))),
+            asyncio.gather(*(fetch(self.fetch_fact) for _ in range(facts_needed))),
+        )
+        for media in results[0]:
+            if media is not None:
+                filename, data = media
+                await self.add_media(filename, data)
+        for fact in results[1]:
+            if fact is not None and fact not in self._facts:
+                self._facts.append(fact)
+
+    async def add_media(self, filename, data):
+        item = CachedMedia(next(self._keys), filename, data)
+        self._items[item.key] = item
+        self._fresh.append(item.key)
+        self.memory_used += item.size
+        await self._enforce_limits()
+
+    async def get_media(self):
+        """Return ``(filename, data)`` for the next cat to send, or None on a miss."""
+        if len(self._fresh) < self.pool_size:
+            self.request_prefetch()
+
+        item = None
+        while self._fresh and item is None:
+            item = self._items.get(self._fresh.popleft())  # May have been evicted meanwhile
+        if item is None and self._items:
+            item = next(iter(self._items.values()))
+        if item is None:
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(item.key)
+        if item.data is not None:
+            self.hits += 1
+            return item.filename, item.data
+        try:
+            data = await asyncio.to_thread(_read_file, item.path)
+        except OSError:
+            self._items.pop(item.key, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return item.filename, data
+
+    def get_fact(self):
+        """Return a cached cat fact, or None on a miss."""
+        if len(self._facts) < self.fact_pool_size // 2:
+            self.request_prefetch()
+        if self._facts:
+            self._last_fact = self._facts.popleft()
+            self.hits += 1
+            return self._last_fact
+        self.misses += 1
+        return None
+
+    def last_fact(self):
+        """The most recently served fact, handy as a fallback when the fact API is down."""
+        return self._last_fact
+
+    async def _enforce_limits(self):
+        # Spill least recently used in-memory items to disk until the memory budget fits
+        for item in list(self._items.values()):
+            if self.memory_used <= self.memory_bytes:
+                break
+            if item.data is None:
+                continue
+            item.path = os.path.join(self.directory, _spilled_name(item.key, item.filename))
+            await asyncio.to_thread(_write_file, item.path, item.data)
+            item.data = None
+            self.memory_used -= item.size
+            self.disk_used += item.size
+            self.spills += 1
+
+        # Then drop least recently used spilled items until the disk budget fits
+        for item in list(self._items.values()):
+            if self.disk_used <= self.disk_bytes:
+                break
+            if item.path is None:
+                continue
+            del self._items[item.key]
+            self.disk_used -= item.size
+            self.evictions += 1
+            await asyncio.to_thread(_remove_file, item.path)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "spills": self.spills,
+            "evictions": self.evictions,
+            "fetch_errors": self.fetch_errors,
+            "items": len(self._items),
+            "fresh": len(self._fresh),
+            "facts": len(self._facts),
+            "memory_bytes": self.memory_used,
+            "disk_bytes": self.disk_used,
+        }
+
+
+def _spilled_name(key, filename):
+    return f"{key}-{filename}"
+
+
+def _clear_spilled_files(directory):
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        key, _, _ = name.partition('-')
+        if key.isdigit():
+            _remove_file(os.path.join(directory, name))
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _write_file(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
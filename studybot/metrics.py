@@ -0,0 +1,196 @@
+import asyncio
+import math
+import time
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (seconds), cheap enough to update on every request."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # The last slot counts values above every bucket
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the ``q`` quantile (inf if it is past the last bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Counter:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class MetricFamily:
+    """One named metric and its children, one per combination of label values."""
+
+    def __init__(self, name, kind, help_text, label_names, factory):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.factory = factory
+        self.children = {}
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = self.factory()
+        return child
+
+    def collect(self):
+        return self.children.items()
+
+
+class CallbackFamily(MetricFamily):
+    """A metric whose samples are read from elsewhere whenever it is scraped.
+
+    ``collect_fn`` returns ``(label_values, value)`` pairs, where ``value`` is
+    a number, or a ``Histogram`` for histogram metrics.
+    """
+
+    def __init__(self, name, kind, help_text, label_names, collect_fn):
+        super().__init__(name, kind, help_text, label_names, None)
+        self.collect = collect_fn
+
+
+class MetricsRegistry:
+    """Metrics rendered in the Prometheus text exposition format for a ``/metrics`` endpoint.
+
+    Counters and histograms updated by the bot itself are created with
+    ``counter``/``histogram``. Values that other objects already keep (queue
+    sizes, cache hit counts, ...) are registered with ``callback`` and read on
+    every scrape, so recording them costs nothing between scrapes.
+    """
+
+    def __init__(self, prefix=''):
+        self.prefix = prefix
+        self.families = {}
+
+    def _add(self, family):
+        family.name = self.prefix + family.name
+        if family.name in self.families:
+            raise ValueError(f"Metric {family.name} is already registered")
+        self.families[family.name] = family
+        return family
+
+    def counter(self, name, help_text, label_names=()):
+        return self._add(MetricFamily(name, 'counter', help_text, label_names, Counter))
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self._add(MetricFamily(name, 'histogram', help_text, label_names, lambda: Histogram(buckets)))
+
+    def callback(self, name, kind, help_text, collect_fn, label_names=()):
+        return self._add(CallbackFamily(name, kind, help_text, label_names, collect_fn))
+
+    def remove(self, family):
+        """Stop exporting ``family``, e.g. when the cog that registered it is unloaded."""
+        self.families.pop(family.name, None)
+
+    def render(self):
+        lines = []
+        for family in self.families.values():
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for label_values, value in family.collect():
+                labels = list(zip(family.label_names, label_values))
+                if family.kind == 'histogram':
+                    _render_histogram(lines, family.name, labels, value)
+                else:
+                    value = value.value if isinstance(value, Counter) else value
+                    lines.append(f"{family.name}{_format_labels(labels)} {_format_value(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a task that sleeps ``interval`` seconds.
+
+    Anything that blocks the loop (slow callbacks, synchronous I/O) shows up
+    as lag, so this is the quickest signal that something is hogging it.
+    """
+
+    def __init__(self, interval=0.5, buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)):
+        self.interval = interval
+        self.histogram = Histogram(buckets)
+        self.last = 0.0
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def is_running(self):
+        return self._task is not None and not self._task.done()
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.last = max(0.0, time.perf_counter() - started - self.interval)
+            self.histogram.observe(self.last)
+
+
+def _render_histogram(lines, name, labels, histogram):
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_format_labels(labels + [('le', _format_value(bound))])} {cumulative}")
+    lines.append(f"{name}_bucket{_format_labels(labels + [('le', '+Inf')])} {histogram.count}")
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
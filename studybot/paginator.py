@@ -0,0 +1,100 @@
+import itertools
+import math
+
+import discord
+
+EMBED_DESCRIPTION_LIMIT = 4096
+DESCRIPTION_HEADROOM = 256  # Room left for the header/footer text make_embed adds around the lines
+
+
+class PaginatedView(discord.ui.View):
+    """Previous/next buttons for flipping through a long list one embed page at a time.
+
+    Nothing is formatted up front: ``render(start)`` is a generator yielding
+    display lines from item ``start`` onwards, and only one page of it is
+    consumed per button press. As long as ``render`` finds item ``start`` by
+    position rather than by skipping the ones before it (as
+    ``TodoList.tasks_from`` and ``LiveLeaderboard.top`` do), the cost of a page
+    depends on ``page_size`` rather than on the length of the list or on which
+    page is shown. ``count()`` is asked again on every render, so the view
+    keeps working while the list changes underneath it. Over-long lines are
+    cut so a page always fits in one embed.
+    """
+
+    def __init__(self, make_embed, render, count, page_size=10, owner_id=None, timeout=180):
+        super().__init__(timeout=timeout)
+        self.make_embed = make_embed  # Page text -> discord.Embed
+        self.render = render
+        self.count = count
+        self.page_size = page_size
+        self.owner_id = owner_id  # Only this user may turn pages; None lets anyone
+        self.line_limit = (EMBED_DESCRIPTION_LIMIT - DESCRIPTION_HEADROOM) // page_size - 1
+        self.page = 0
+        self.message = None
+
+    def page_count(self):
+        return max(1, math.ceil(self.count() / self.page_size))
+
+    def render_page(self):
+        page_count = self.page_count()
+        self.page = max(0, min(self.page, page_count - 1))
+        lines = itertools.islice(self.render(self.page * self.page_size), self.page_size)
+        embed = self.make_embed("\n".join(_truncate(line, self.line_limit) for line in lines))
+
+        self.first_page.disabled = self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.last_page.disabled = self.page == page_count - 1
+        self.page_indicator.label = f"{self.page + 1}/{page_count}"
+        return embed
+
+    async def send(self, interaction):
+        """Answer ``interaction`` with the first page, adding buttons only when there is more than one."""
+        embed = self.render_page()
+        if self.page_count() == 1:
+            await interaction.response.send_message(embed=embed)
+            self.stop()
+            return
+        await interaction.response.send_message(embed=embed, view=self)
+        self.message = await interaction.original_response()
+
+    async def interaction_check(self, interaction):
+        if self.owner_id is None or interaction.user.id == self.owner_id:
+            return True
+        await interaction.response.send_message("Only the person who ran this command can turn its pages.", ephemeral=True)
+        return False
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+    async def show(self, interaction, page):
+        self.page = page
+        await interaction.response.edit_message(embed=self.render_page(), view=self)
+
+    @discord.ui.button(label='≪', style=discord.ButtonStyle.secondary)
+    async def first_page(self, interaction, button):
+        await self.show(interaction, 0)
+
+    @discord.ui.button(label='◀', style=discord.ButtonStyle.primary)
+    async def previous_page(self, interaction, button):
+        await self.show(interaction, self.page - 1)
+
+    @discord.ui.button(label='1/1', style=discord.ButtonStyle.secondary, disabled=True)
+    async def page_indicator(self, interaction, button):
+        pass
+
+    @discord.ui.button(label='▶', style=discord.ButtonStyle.primary)
+    async def next_page(self, interaction, button):
+        await self.show(interaction, self.page + 1)
+
+    @discord.ui.button(label='≫', style=discord.ButtonStyle.secondary)
+    async def last_page(self, interaction, button):
+        await self.show(interaction, self.page_count() - 1)
+
+
+def _truncate(line, limit):
+    return line if len(line) <= limit else line[:limit - 1] + '…'
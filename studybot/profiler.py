@@ -0,0 +1,190 @@
+import functools
+import logging
+import time
+from collections import deque
+
+import discord
+
+from studybot.metrics import Histogram
+
+
+class CallStats:
+    """What the profiler knows about one command or loop."""
+
+    __slots__ = ('name', 'calls', 'errors', 'awaits', 'busy', 'max_busy', 'wall', 'first_response')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.awaits = 0
+        self.busy = 0.0  # Seconds spent running on the loop, i.e. blocking everything else
+        self.max_busy = 0.0
+        self.wall = Histogram()
+        self.first_response = Histogram()
+
+    def summary(self):
+        responded = self.first_response.count > 0
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "busy_total": self.busy,
+            "busy_max": self.max_busy,
+            "awaits_mean": self.awaits / self.calls if self.calls else 0.0,
+            "wall_p50": self.wall.quantile(0.5),
+            "wall_p99": self.wall.quantile(0.99),
+            "first_response_p50": self.first_response.quantile(0.5) if responded else None,
+            "first_response_p99": self.first_response.quantile(0.99) if responded else None,
+        }
+
+
+class _Profiled:
+    """Drives a coroutine one step at a time, timing each step and counting the awaits in between."""
+
+    __slots__ = ('coro', 'interaction', 'started', 'busy', 'max_step', 'awaits', 'first_response')
+
+    def __init__(self, coro, interaction):
+        self.coro = coro
+        self.interaction = interaction
+        self.busy = 0.0
+        self.max_step = 0.0
+        self.awaits = 0
+        self.first_response = None
+
+    def __await__(self):
+        self.started = time.perf_counter()
+        send, throw = self.coro.send, self.coro.throw
+        value, error = None, None
+        while True:
+            step_started = time.perf_counter()
+            try:
+                yielded = throw(error) if error is not None else send(value)
+            except StopIteration as e:
+                self._end_step(step_started)
+                return e.value
+            except BaseException:
+                self._end_step(step_started)
+                raise
+            self._end_step(step_started)
+            self.awaits += 1
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+    def _end_step(self, step_started):
+        now = time.perf_counter()
+        step = now - step_started
+        self.busy += step
+        self.max_step = max(self.max_step, step)
+        if self.first_response is None and self.interaction is not None and self.interaction.response.is_done():
+            self.first_response = now - self.started
+
+
+class Profiler:
+    """Per-command and per-job profiling, plus event-loop lag and slow callbacks.
+
+    ``instrument_tree`` wraps slash command callbacks and the cron scheduler
+    wraps its jobs with ``wrap``. Every call records its wall time, how long
+    it actually ran on the loop, how many times it awaited and, for commands,
+    how long it took until the interaction was answered. ``report`` ranks
+    them by time spent holding the loop.
+    """
+
+    def __init__(self, loop_lag=None, slow_callback_history=50):
+        self.loop_lag = loop_lag  # metrics.LoopLagMonitor
+        self.stats = {}
+        self.slow_callbacks = deque(maxlen=slow_callback_history)
+        self.slow_callback_counts = {}
+
+    def wrap(self, name, func):
+        stats = self.stats.setdefault(name, CallStats(name))
+
+        @functools.wraps(func)
+        async def profiled(*args, **kwargs):
+            interaction = next((arg for arg in args if isinstance(arg, discord.Interaction)), None)
+            run = _Profiled(func(*args, **kwargs), interaction)
+            try:
+                return await run
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.calls += 1
+                stats.awaits += run.awaits
+                stats.busy += run.busy
+                stats.max_busy = max(stats.max_busy, run.max_step)
+                stats.wall.observe(time.perf_counter() - run.started)
+                if run.first_response is not None:
+                    stats.first_response.observe(run.first_response)
+
+        return profiled
+
+    def instrument_tree(self, tree):
+        """Wrap the callback of every slash command registered on ``tree``."""
+        for command in tree.walk_commands():
+            if isinstance(command, discord.app_commands.Command):
+                command._callback = self.wrap(f"/{command.qualified_name}", command._callback)
+
+    def enable_slow_callback_capture(self, loop, threshold):
+        """Turn on asyncio debug mode and record every callback that runs longer than ``threshold`` seconds.
+
+        Debug mode adds overhead to every callback, so this is meant to be switched on while investigating.
+        """
+        loop.set_debug(True)
+        loop.slow_callback_duration = threshold
+        logging.getLogger('asyncio').addHandler(_SlowCallbackHandler(self))
+
+    def record_slow_callback(self, description, duration):
+        self.slow_callbacks.append((time.time(), description, duration))
+        count, total = self.slow_callback_counts.get(description, (0, 0.0))
+        self.slow_callback_counts[description] = (count + 1, total + duration)
+
+    def report(self, top=10):
+        """The ``top`` hot paths and slow callbacks, worst first."""
+        hot_paths = sorted(self.stats.values(), key=lambda stats: stats.busy, reverse=True)
+        slow = sorted(self.slow_callback_counts.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            "loop_lag": self.loop_lag.histogram.summary() if self.loop_lag is not None else None,
+            "hot_paths": [stats.summary() for stats in hot_paths[:top] if stats.calls],
+            "slow_callbacks": [
+                {"callback": description, "count": count, "total": total}
+                for description, (count, total) in slow[:top]
+            ],
+        }
+
+    def format_report(self, top=10):
+        """``report`` as plain text, one line per hot path."""
+        report = self.report(top)
+        lines = []
+        if report["loop_lag"] is not None:
+            lag = report["loop_lag"]
+            lines.append(f"Loop lag: p50 {lag['p50'] * 1000:.0f} ms, p99 {lag['p99'] * 1000:.0f} ms over {lag['count']} samples")
+        lines.append("Hot paths (time holding the loop):")
+        for stats in report["hot_paths"]:
+            line = (
+                f"{stats['name']}: {stats['calls']} calls, {stats['busy_total'] * 1000:.1f} ms busy"
+                f" (max step {stats['busy_max'] * 1000:.1f} ms), {stats['awaits_mean']:.1f} awaits,"
+                f" wall p50/p99 {stats['wall_p50']}/{stats['wall_p99']} s"
+            )
+            if stats['first_response_p99'] is not None:
+                line += f", first response p99 {stats['first_response_p99']} s"
+            lines.append(f"{line}, {stats['errors']} errors")
+        if report["slow_callbacks"]:
+            lines.append("Slow callbacks:")
+            for slow in report["slow_callbacks"]:
+                lines.append(f"{slow['count']}x {slow['total'] * 1000:.0f} ms {slow['callback'][:200]}")
+        return "\n".join(lines)
+
+
+class _SlowCallbackHandler(logging.Handler):
+    # asyncio's debug mode logs "Executing <handle> took 0.123 seconds" for slow callbacks
+    def __init__(self, profiler):
+        super().__init__(logging.WARNING)
+        self.profiler = profiler
+
+    def emit(self, record):
+        if record.msg.startswith('Executing %s took') and len(record.args) == 2:
+            description, duration = record.args
+            self.profiler.record_slow_callback(str(description), duration)
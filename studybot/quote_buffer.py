@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteBuffer:
+    """Ring buffer of remote quotes, refilled in the background.
+
+    ``pop`` never touches the network: it serves from memory and, once the
+    buffer drops below ``low_water``, schedules ``fetch_batch`` to top it up.
+    Quotes already buffered or served within the last ``history_size`` pops
+    are skipped when refilling, so the same quote does not come back soon.
+    """
+
+    def __init__(self, fetch_batch, capacity=100, low_water=20, history_size=200):
+        self.fetch_batch = fetch_batch
+        self.low_water = low_water
+        self._quotes = deque(maxlen=capacity)
+        self._buffered = set()
+        self._recent = deque(maxlen=history_size)
+        self._recent_set = set()
+        self._refill_task = None
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.refill_errors = 0
+
+    def __len__(self):
+        return len(self._quotes)
+
+    def pop(self):
+        """Return the next buffered quote, or None if the buffer is empty."""
+        if len(self._quotes) < self.low_water:
+            self.request_refill()
+        if not self._quotes:
+            self.misses += 1
+            return None
+        quote = self._quotes.popleft()
+        self._buffered.discard(quote)
+        self._remember(quote)
+        self.hits += 1
+        return quote
+
+    def _remember(self, quote):
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_set.discard(self._recent[0])
+        self._recent.append(quote)
+        self._recent_set.add(quote)
+
+    def add(self, quotes):
+        """Buffer new quotes, skipping any that are buffered or were served recently."""
+        added = 0
+        for quote in quotes:
+            if quote in self._buffered or quote in self._recent_set:
+                continue
+            if len(self._quotes) == self._quotes.maxlen:
+                break
+            self._quotes.append(quote)
+            self._buffered.add(quote)
+            added += 1
+        return added
+
+    def request_refill(self):
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.get_running_loop().create_task(self.refill())
+
+    async def refill(self):
+        try:
+            quotes = await self.fetch_batch()
+        except Exception as e:
+            self.refill_errors += 1
+            logger.warning("Error refilling quote buffer: %s", e)
+            return
+        self.refills += 1
+        self.add(quotes)
+
+    def stats(self):
+        return {
+            "buffered": len(self._quotes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refills": self.refills,
+            "refill_errors": self.refill_errors,
+        }
@@ -0,0 +1,135 @@
+import time
+from collections import Counter, OrderedDict
+
+from discord import app_commands
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, holding at most ``capacity``."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def try_acquire(self, now=None, amount=1):
+        """Take ``amount`` tokens if they are available and report whether it worked."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    def delay(self, now=None, amount=1):
+        """Seconds until ``amount`` tokens will be available (0 if they already are)."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def drain(self, now=None):
+        """Empty the bucket, e.g. after the remote side told us to back off."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens = 0
+
+
+class TokenBuckets:
+    """A ``TokenBucket`` per key, e.g. per channel, created on first use.
+
+    Buckets live in LRU order and are dropped once they have been idle for
+    ``idle_after`` seconds, by which time they would be full again anyway,
+    so memory follows the keys used recently.
+    """
+
+    def __init__(self, rate, capacity, idle_after=600):
+        self.rate = rate
+        self.capacity = capacity
+        self.idle_after = idle_after
+        self._buckets = OrderedDict()  # Key -> TokenBucket, least recently used first
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def get(self, key, now=None):
+        """The bucket for ``key``; idle buckets are dropped first."""
+        now = time.monotonic() if now is None else now
+        self.evict_idle(now)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.capacity)
+            bucket.updated = now
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def evict_idle(self, now=None):
+        now = time.monotonic() if now is None else now
+        while self._buckets:
+            bucket = next(iter(self._buckets.values()))
+            if now - bucket.updated < self.idle_after:
+                break
+            self._buckets.popitem(last=False)
+
+
+class CommandRateLimited(app_commands.CheckFailure):
+    """Raised by ``CommandLimiter.check`` when a user or server used up its command budget."""
+
+    def __init__(self, retry_after, scope):
+        super().__init__(f"Rate limited per {scope}, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+        self.scope = scope  # 'user' or 'guild'
+
+
+class CommandLimiter:
+    """Token buckets per user and per server for slash commands.
+
+    A command goes through only if both the user's and the server's bucket
+    hold ``cost`` tokens. Idle buckets are dropped after ``idle_after``
+    seconds (see ``TokenBuckets``), so memory follows the users active recently.
+    """
+
+    def __init__(self, user_rate=0.5, user_burst=5, guild_rate=5.0, guild_burst=30, idle_after=600):
+        self._user_buckets = TokenBuckets(user_rate, user_burst, idle_after)
+        self._guild_buckets = TokenBuckets(guild_rate, guild_burst, idle_after)
+        self.decisions = Counter()  # (command, 'allowed' or the scope that was limited) -> commands
+
+    def __len__(self):
+        return len(self._user_buckets) + len(self._guild_buckets)
+
+    def acquire(self, user_id, guild_id, cost=1, now=None):
+        """Take ``cost`` tokens from both buckets; returns None, or the limited scope and seconds until it has them."""
+        now = time.monotonic() if now is None else now
+        buckets = [('user', self._user_buckets.get(user_id, now))]
+        if guild_id is not None:
+            buckets.append(('guild', self._guild_buckets.get(guild_id, now)))
+        for scope, bucket in buckets:
+            delay = bucket.delay(now, cost)
+            if delay > 0:
+                return scope, delay
+        for _, bucket in buckets:
+            bucket.try_acquire(now, cost)
+        return None
+
+    def check(self, cost=1):
+        """Slash command check decorator taking ``cost`` tokens per use; raises ``CommandRateLimited`` when out."""
+        async def predicate(interaction):
+            name = interaction.command.qualified_name if interaction.command else None
+            limited = self.acquire(interaction.user.id, interaction.guild_id, cost)
+            if limited is not None:
+                self.decisions[name, limited[0]] += 1
+                raise CommandRateLimited(limited[1], limited[0])
+            self.decisions[name, 'allowed'] += 1
+            return True
+
+        return app_commands.check(predicate)
@@ -0,0 +1,541 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+
+from studybot.study_history import DAY, HOUR, split_into_buckets
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# Hour buckets are only read for the first, partial day of a period, so a month and a bit is enough.
+HOUR_BUCKET_RETENTION = 35 * DAY
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_times (
+    guild_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    seconds INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS study_times (
+    guild_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    seconds INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS todo_tasks (
+    guild_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    task TEXT NOT NULL,
+    done INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id, task_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pomodoro_sessions (
+    guild_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    user_name TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    thread_id INTEGER,
+    phase TEXT NOT NULL,
+    work_minutes INTEGER NOT NULL,
+    break_minutes INTEGER NOT NULL,
+    phase_total INTEGER NOT NULL,
+    phase_ends_at REAL NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS voice_sessions (
+    guild_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS tracked_channels (
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, channel_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS study_hours (
+    hour INTEGER NOT NULL,
+    guild_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    work_seconds REAL NOT NULL,
+    study_seconds REAL NOT NULL,
+    PRIMARY KEY (hour, guild_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS study_days (
+    day INTEGER NOT NULL,
+    guild_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    work_seconds REAL NOT NULL,
+    study_seconds REAL NOT NULL,
+    PRIMARY KEY (day, guild_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS guild_settings (
+    guild_id INTEGER PRIMARY KEY,
+    timezone TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+    guild_id INTEGER NOT NULL,
+    job TEXT NOT NULL,
+    next_fire REAL NOT NULL,
+    PRIMARY KEY (guild_id, job)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS heartbeats (
+    shards TEXT PRIMARY KEY,
+    seen_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recent_picks (
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    bag TEXT NOT NULL,
+    recent TEXT NOT NULL,
+    PRIMARY KEY (guild_id, channel_id, bag)
+) WITHOUT ROWID;
+"""
+
+# Seconds per user since a period start: hour buckets up to the first UTC midnight, day buckets after it. Periods
+# of servers in other timezones start on the hour, except in the few zones with a half-hour offset, where the
+# first hour counts from the full hour before.
+SECONDS_SINCE = """
+SELECT guild_id, user_id, work_seconds + study_seconds AS seconds FROM study_hours WHERE hour >= ? AND hour < ?
+UNION ALL SELECT guild_id, user_id, work_seconds + study_seconds FROM study_days WHERE day >= ?
+"""
+
+BUCKET_UPSERT = (
+    "INSERT INTO {table} ({bucket}, guild_id, user_id, work_seconds, study_seconds) VALUES (?, ?, ?, ?, ?)"
+    " ON CONFLICT({bucket}, guild_id, user_id) DO UPDATE SET"
+    " work_seconds = work_seconds + excluded.work_seconds, study_seconds = study_seconds + excluded.study_seconds"
+)
+
+POMODORO_COLUMNS = (
+    "guild_id", "user_id", "user_name", "channel_id", "thread_id", "phase",
+    "work_minutes", "break_minutes", "phase_total", "phase_ends_at",
+)
+
+# A session whose break ended while the bot was down has nothing left to resume.
+POMODORO_STILL_RUNNING = "phase_ends_at + CASE phase WHEN 'Work' THEN break_minutes * 60 ELSE 0 END > ?"
+
+
+class SessionStore:
+    """Durable copy of the bot's in-memory state, kept in a local SQLite database.
+
+    Commands only record the latest value for a key in memory; a background
+    task writes everything that changed in one transaction every
+    ``flush_interval`` seconds. Repeated updates to the same user between
+    flushes collapse into a single row write. Every flush also records a
+    heartbeat, so after a crash the bot knows until when it was running.
+
+    Every row is keyed by guild, so several shard processes can share one
+    database file: each one only writes the guilds it owns.
+    """
+
+    def __init__(self, path, flush_interval=5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._conn = None
+        self._db_lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+        self._work_times = {}
+        self._study_times = {}
+        self._todo_clears = set()
+        self._todo_tasks = {}  # (guild_id, user_id) -> {task_id: (task, done) or None}
+        self._pomodoro_sessions = {}
+        self._voice_sessions = {}
+        self._tracked_channels = {}
+        self._hour_buckets = {}  # (hour, guild_id, user_id) -> [work seconds, study seconds] still to be added
+        self._day_buckets = {}
+        self._timezones = {}
+        self._next_fires = {}  # (guild_id, job) -> next fire time, or None once unscheduled
+        self._recent_picks = {}  # (guild_id, channel_id, bag) -> item indices, oldest first
+        self._hours_pruned_before = 0
+        self._shards = ''  # Which shards' guilds this process writes; set by load()
+        self.last_heartbeat = None  # When the previous run of these shards last flushed, set by load()
+        self.flushes = 0
+        self.rows_written = 0
+
+    def open(self):
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def load(self, now, shard_count=None, shard_ids=None):
+        """Read what is needed at startup: totals, settings, scheduled jobs and sessions still running at ``now``.
+
+        With ``shard_ids``, only guilds handled by those shards are loaded.
+        Also sets ``last_heartbeat``: when the previous run last flushed, so
+        the bot can tell until when it was up.
+        To-do lists are not loaded here; see ``load_todo``. Period totals
+        depend on each server's timezone; see ``load_period_times``.
+        """
+        where, params = _shard_filter(shard_count, shard_ids)
+        self._shards = ','.join(map(str, shard_ids)) if shard_count and shard_ids else ''
+
+        with self._db_lock:
+            conn = self._conn
+            heartbeat = conn.execute("SELECT seen_at FROM heartbeats WHERE shards = ?", (self._shards,)).fetchone()
+            self.last_heartbeat = heartbeat[0] if heartbeat else None
+            work_times = {
+                (guild_id, user_id): seconds for guild_id, user_id, seconds in
+                conn.execute(f"SELECT guild_id, user_id, seconds FROM work_times WHERE {where}", params)
+            }
+            study_times = {
+                (guild_id, user_id): seconds for guild_id, user_id, seconds in
+                conn.execute(f"SELECT guild_id, user_id, seconds FROM study_times WHERE {where}", params)
+            }
+            pomodoro_sessions = [
+                dict(zip(POMODORO_COLUMNS, row)) for row in conn.execute(
+                    f"SELECT {', '.join(POMODORO_COLUMNS)} FROM pomodoro_sessions"
+                    f" WHERE {where} AND {POMODORO_STILL_RUNNING}",
+                    (*params, now),
+                )
+            ]
+            with conn:
+                conn.execute(
+                    f"DELETE FROM pomodoro_sessions WHERE {where} AND NOT {POMODORO_STILL_RUNNING}",
+                    (*params, now),
+                )
+            voice_sessions = {
+                (guild_id, user_id): (channel_id, started_at)
+                for guild_id, user_id, channel_id, started_at in conn.execute(
+                    f"SELECT guild_id, user_id, channel_id, started_at FROM voice_sessions WHERE {where}", params
+                )
+            }
+            tracked_channels = list(
+                conn.execute(f"SELECT guild_id, channel_id FROM tracked_channels WHERE {where}", params)
+            )
+            timezones = dict(conn.execute(f"SELECT guild_id, timezone FROM guild_settings WHERE {where}", params))
+            next_fires = {
+                (job, guild_id): next_fire for guild_id, job, next_fire in
+                conn.execute(f"SELECT guild_id, job, next_fire FROM scheduled_jobs WHERE {where}", params)
+            }
+        return {
+            "work_times": work_times,
+            "study_times": study_times,
+            "pomodoro_sessions": pomodoro_sessions,
+            "voice_sessions": voice_sessions,
+            "tracked_channels": tracked_channels,
+            "timezones": timezones,
+            "next_fires": next_fires,
+        }
+
+    def load_period_times(self, period_starts, timezone=None, shard_count=None, shard_ids=None):
+        """Seconds studied per ``(guild_id, user_id)`` since each period's wall-clock start in ``period_starts``.
+
+        Only guilds whose saved timezone is ``timezone`` are read; with None,
+        the guilds that never set one.
+        """
+        where, params = _shard_filter(shard_count, shard_ids)
+        if timezone is None:
+            where += " AND guild_id NOT IN (SELECT guild_id FROM guild_settings)"
+        else:
+            where += " AND guild_id IN (SELECT guild_id FROM guild_settings WHERE timezone = ?)"
+            params = (*params, timezone)
+        with self._db_lock:
+            return {
+                period: {
+                    (guild_id, user_id): seconds for guild_id, user_id, seconds in self._conn.execute(
+                        f"SELECT guild_id, user_id, SUM(seconds) FROM ({SECONDS_SINCE})"
+                        f" WHERE {where} GROUP BY guild_id, user_id",
+                        (*_since_params(since), *params),
+                    )
+                }
+                for period, since in period_starts.items()
+            }
+
+    async def load_todo(self, guild_id, user_id):
+        """Return one user's to-do tasks as ``(task_id, task, done)`` rows, including unflushed changes.
+
+        The database is read in a worker thread. Holding the flush lock keeps a
+        flush from writing, or putting back, changes between that read and the
+        merge of the pending ones.
+        """
+        key = (guild_id, user_id)
+        async with self._flush_lock:
+            tasks = await asyncio.to_thread(self._read_todo, key)
+            if key in self._todo_clears:
+                tasks.clear()
+            for task_id, task in self._todo_tasks.get(key, {}).items():
+                if task is None:
+                    tasks.pop(task_id, None)
+                else:
+                    tasks[task_id] = task
+        return [(task_id, task, done) for task_id, (task, done) in sorted(tasks.items())]
+
+    def _read_todo(self, key):
+        with self._db_lock:
+            return {
+                task_id: (task, bool(done)) for task_id, task, done in self._conn.execute(
+                    "SELECT task_id, task, done FROM todo_tasks WHERE guild_id = ? AND user_id = ? ORDER BY task_id",
+                    key,
+                )
+            }
+
+    async def load_recent_picks(self, bag, guild_id, channel_id):
+        """Indices of the items of ``bag`` picked last in a server and channel, oldest first.
+
+        Read in a worker thread under the flush lock, like ``load_todo``.
+        """
+        key = (guild_id, channel_id, bag)
+        async with self._flush_lock:
+            if key in self._recent_picks:
+                return self._recent_picks[key]
+            return await asyncio.to_thread(self._read_recent_picks, key)
+
+    def _read_recent_picks(self, key):
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT recent FROM recent_picks WHERE guild_id = ? AND channel_id = ? AND bag = ?", key
+            ).fetchone()
+        return [int(index) for index in row[0].split(',') if index] if row else []
+
+    def global_top(self, k, since=None):
+        """Top ``k`` users by combined study minutes across every guild and shard process.
+
+        With ``since`` (a wall-clock period start) only time studied from then
+        on counts; otherwise the all-time totals are used.
+        """
+        with self._db_lock:
+            if since is None:
+                return self._conn.execute(
+                    "SELECT user_id, SUM(seconds) / 60 AS total FROM ("
+                    " SELECT user_id, seconds FROM work_times"
+                    " UNION ALL SELECT user_id, seconds FROM study_times"
+                    ") GROUP BY user_id ORDER BY total DESC LIMIT ?",
+                    (k,),
+                ).fetchall()
+            return self._conn.execute(
+                f"SELECT user_id, CAST(SUM(seconds) AS INTEGER) / 60 AS total FROM ({SECONDS_SINCE})"
+                " GROUP BY user_id ORDER BY total DESC LIMIT ?",
+                (*_since_params(since), k),
+            ).fetchall()
+
+    # Write-behind updates. The latest value per key wins; None deletes the row.
+
+    def save_work_time(self, guild_id, user_id, seconds):
+        self._work_times[guild_id, user_id] = seconds
+
+    def save_study_time(self, guild_id, user_id, seconds):
+        self._study_times[guild_id, user_id] = seconds
+
+    def record_study(self, guild_id, user_id, source, started_at, ended_at):
+        """Add the wall-clock stretch ``started_at``..``ended_at`` to the history; ``source`` is 'work' or 'study'."""
+        column = 0 if source == 'work' else 1
+        for pending, size in ((self._hour_buckets, HOUR), (self._day_buckets, DAY)):
+            for bucket, seconds in split_into_buckets(started_at, ended_at, size):
+                pending.setdefault((bucket, guild_id, user_id), [0, 0])[column] += seconds
+
+    def save_task(self, guild_id, user_id, task):
+        self._todo_tasks.setdefault((guild_id, user_id), {})[task.id] = (task.text, task.done)
+
+    def delete_task(self, guild_id, user_id, task_id):
+        self._todo_tasks.setdefault((guild_id, user_id), {})[task_id] = None
+
+    def clear_todo(self, guild_id, user_id):
+        """Forget every task of one user's to-do list."""
+        self._todo_clears.add((guild_id, user_id))
+        self._todo_tasks.pop((guild_id, user_id), None)
+
+    def save_pomodoro(self, guild_id, user_id, session):
+        self._pomodoro_sessions[guild_id, user_id] = session
+
+    def save_voice(self, guild_id, user_id, session):
+        self._voice_sessions[guild_id, user_id] = session
+
+    def save_tracked_channel(self, guild_id, channel_id, tracked):
+        self._tracked_channels[guild_id, channel_id] = tracked
+
+    def save_timezone(self, guild_id, timezone):
+        self._timezones[guild_id] = timezone
+
+    def save_next_fire(self, job, guild_id, next_fire):
+        self._next_fires[guild_id, job] = next_fire
+
+    def save_recent_picks(self, bag, guild_id, channel_id, recent):
+        self._recent_picks[guild_id, channel_id, bag] = recent
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def is_running(self):
+        return self._task is not None and not self._task.done()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except sqlite3.Error as e:
+                logger.error("Error flushing session store: %s", e)
+
+    async def flush(self):
+        async with self._flush_lock:
+            batch = (
+                self._hour_buckets, self._day_buckets, self._work_times, self._study_times, self._todo_clears,
+                self._todo_tasks, self._pomodoro_sessions, self._voice_sessions, self._tracked_channels,
+                self._timezones, self._next_fires, self._recent_picks,
+            )
+            self._hour_buckets = {}
+            self._day_buckets = {}
+            self._work_times = {}
+            self._study_times = {}
+            self._todo_clears = set()
+            self._todo_tasks = {}
+            self._pomodoro_sessions = {}
+            self._voice_sessions = {}
+            self._tracked_channels = {}
+            self._timezones = {}
+            self._next_fires = {}
+            self._recent_picks = {}
+            try:
+                await asyncio.to_thread(self._write, *batch, heartbeat=time.time())
+            except sqlite3.Error:
+                self._requeue(*batch)
+                raise
+
+    def _requeue(self, hour_buckets, day_buckets, work_times, study_times, todo_clears, todo_tasks, *failed_batches):
+        """Put a failed batch back without overwriting anything newer that arrived meanwhile."""
+        for pending, failed in ((self._hour_buckets, hour_buckets), (self._day_buckets, day_buckets)):
+            for key, (work, study) in failed.items():
+                seconds = pending.setdefault(key, [0, 0])
+                seconds[0] += work
+                seconds[1] += study
+        for key, tasks in todo_tasks.items():
+            if key not in self._todo_clears:  # A newer clear already supersedes them
+                pending = self._todo_tasks.setdefault(key, {})
+                for task_id, task in tasks.items():
+                    pending.setdefault(task_id, task)
+        self._todo_clears |= todo_clears
+        failed_batches = (work_times, study_times, *failed_batches)
+        pending_batches = (
+            self._work_times, self._study_times,
+            self._pomodoro_sessions, self._voice_sessions, self._tracked_channels, self._timezones, self._next_fires,
+            self._recent_picks,
+        )
+        for pending, failed in zip(pending_batches, failed_batches):
+            for key, value in failed.items():
+                pending.setdefault(key, value)
+
+    def _write(self, hour_buckets, day_buckets, work_times, study_times, todo_clears, todo_tasks, pomodoro_sessions,
+               voice_sessions, tracked_channels, timezones, next_fires, recent_picks, heartbeat=None):
+        prune_before = int(time.time() - HOUR_BUCKET_RETENTION) // HOUR * HOUR
+        with self._db_lock, self._conn as conn:
+            conn.executemany(
+                BUCKET_UPSERT.format(table='study_hours', bucket='hour'),
+                ((*key, work, study) for key, (work, study) in hour_buckets.items()),
+            )
+            conn.executemany(
+                BUCKET_UPSERT.format(table='study_days', bucket='day'),
+                ((*key, work, study) for key, (work, study) in day_buckets.items()),
+            )
+            if prune_before > self._hours_pruned_before:  # At most once an hour
+                conn.execute("DELETE FROM study_hours WHERE hour < ?", (prune_before,))
+            conn.executemany(
+                "INSERT INTO work_times (guild_id, user_id, seconds) VALUES (?, ?, ?)"
+                " ON CONFLICT(guild_id, user_id) DO UPDATE SET seconds = excluded.seconds",
+                ((*key, seconds) for key, seconds in work_times.items()),
+            )
+            conn.executemany(
+                "INSERT INTO study_times (guild_id, user_id, seconds) VALUES (?, ?, ?)"
+                " ON CONFLICT(guild_id, user_id) DO UPDATE SET seconds = excluded.seconds",
+                ((*key, seconds) for key, seconds in study_times.items()),
+            )
+            conn.executemany("DELETE FROM todo_tasks WHERE guild_id = ? AND user_id = ?", todo_clears)
+            conn.executemany(
+                "DELETE FROM todo_tasks WHERE guild_id = ? AND user_id = ? AND task_id = ?",
+                ((*key, task_id) for key, tasks in todo_tasks.items() for task_id, task in tasks.items() if task is None),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO todo_tasks (guild_id, user_id, task_id, task, done) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (*key, task_id, task[0], int(task[1]))
+                    for key, tasks in todo_tasks.items() for task_id, task in tasks.items() if task is not None
+                ),
+            )
+            conn.executemany(
+                "DELETE FROM pomodoro_sessions WHERE guild_id = ? AND user_id = ?",
+                (key for key, session in pomodoro_sessions.items() if session is None),
+            )
+            conn.executemany(
+                f"INSERT OR REPLACE INTO pomodoro_sessions ({', '.join(POMODORO_COLUMNS)})"
+                f" VALUES ({', '.join(':' + column for column in POMODORO_COLUMNS)})",
+                (session for session in pomodoro_sessions.values() if session is not None),
+            )
+            conn.executemany(
+                "DELETE FROM voice_sessions WHERE guild_id = ? AND user_id = ?",
+                (key for key, session in voice_sessions.items() if session is None),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO voice_sessions (guild_id, user_id, channel_id, started_at) VALUES (?, ?, ?, ?)",
+                ((*key, *session) for key, session in voice_sessions.items() if session is not None),
+            )
+            conn.executemany(
+                "DELETE FROM tracked_channels WHERE guild_id = ? AND channel_id = ?",
+                (key for key, tracked in tracked_channels.items() if not tracked),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO tracked_channels (guild_id, channel_id) VALUES (?, ?)",
+                (key for key, tracked in tracked_channels.items() if tracked),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO guild_settings (guild_id, timezone) VALUES (?, ?)", timezones.items()
+            )
+            conn.executemany(
+                "DELETE FROM scheduled_jobs WHERE guild_id = ? AND job = ?",
+                (key for key, next_fire in next_fires.items() if next_fire is None),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO scheduled_jobs (guild_id, job, next_fire) VALUES (?, ?, ?)",
+                ((*key, next_fire) for key, next_fire in next_fires.items() if next_fire is not None),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO recent_picks (guild_id, channel_id, bag, recent) VALUES (?, ?, ?, ?)",
+                ((*key, ','.join(map(str, recent))) for key, recent in recent_picks.items()),
+            )
+            if heartbeat is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO heartbeats (shards, seen_at) VALUES (?, ?)", (self._shards, heartbeat)
+                )
+        self._hours_pruned_before = max(self._hours_pruned_before, prune_before)
+        self.flushes += 1
+        self.rows_written += (
+            len(hour_buckets) + len(day_buckets) + len(work_times) + len(study_times) + len(todo_clears) + sum(map(len, todo_tasks.values())) + len(pomodoro_sessions)
+            + len(voice_sessions) + len(tracked_channels) + len(timezones) + len(next_fires)
+            + len(recent_picks)
+        )
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._conn is not None:
+            await self.flush()
+            self._conn.close()
+            self._conn = None
+
+
+def _shard_filter(shard_count, shard_ids):
+    """SQL condition and parameters selecting the guilds of ``shard_ids``, or every guild."""
+    if shard_ids is None:
+        return "1", ()
+    # Discord assigns a guild to shard (guild_id >> 22) % shard_count
+    return f"(guild_id >> 22) % ? IN ({', '.join('?' * len(shard_ids))})", (shard_count, *shard_ids)
+
+
+def _since_params(since):
+    """Parameters for ``SECONDS_SINCE``: the hour ``since`` falls in, the midnight after it and that midnight again."""
+    first_day = -(-int(since) // DAY) * DAY
+    return int(since) // HOUR * HOUR, first_day, first_day
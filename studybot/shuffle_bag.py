@@ -0,0 +1,68 @@
+import random
+from collections import OrderedDict, deque
+
+
+class ShuffleBag:
+    """Random picks from ``size`` items where no item comes up again within ``window`` picks.
+
+    Items not picked recently sit in ``available``; a pick swaps a random one
+    out and puts back the item picked ``window`` picks ago, so every pick is
+    O(1) with no re-rolls. Only ``recent`` needs saving: everything else is
+    available.
+    """
+
+    __slots__ = ('window', 'recent', 'available')
+
+    def __init__(self, size, window, recent=()):
+        self.window = max(0, min(window, size - 1))
+        recent = [index for index in dict.fromkeys(recent) if 0 <= index < size]  # The items may have changed
+        self.recent = deque(recent[len(recent) - self.window:] if self.window else ())
+        taken = set(self.recent)
+        self.available = [index for index in range(size) if index not in taken]
+
+    def pick(self):
+        """Return the index of a random item not among the last ``window`` picks."""
+        i = random.randrange(len(self.available))
+        index = self.available[i]
+        self.available[i] = self.available[-1]
+        self.available.pop()
+        self.recent.append(index)
+        if len(self.recent) > self.window:
+            self.available.append(self.recent.popleft())
+        return index
+
+
+class ShuffleBags:
+    """A ``ShuffleBag`` over the same ``items`` per key, e.g. per server and channel.
+
+    Bags are created on first use from what ``await load(key)`` returns and
+    every pick is handed to ``save(key, recent)``; past ``max_bags``, the
+    least recently used bag is dropped and loaded again when needed.
+    """
+
+    def __init__(self, items, window, load=None, save=None, max_bags=10000):
+        self.items = items
+        self.window = window
+        self._load = load
+        self._save = save
+        self.max_bags = max_bags
+        self._bags = OrderedDict()
+
+    def __len__(self):
+        return len(self._bags)
+
+    async def pick(self, key):
+        bag = self._bags.get(key)
+        if bag is None:
+            recent = await self._load(key) if self._load else ()
+            bag = self._bags.get(key)  # Another pick may have loaded it meanwhile
+            if bag is None:
+                bag = self._bags[key] = ShuffleBag(len(self.items), self.window, recent)
+                if len(self._bags) > self.max_bags:
+                    self._bags.popitem(last=False)
+        else:
+            self._bags.move_to_end(key)
+        index = bag.pick()
+        if self._save is not None:
+            self._save(key, list(bag.recent))
+        return self.items[index]
@@ -0,0 +1,70 @@
+"""Leaderboard periods and the time buckets study history is aggregated into.
+
+Study time is never cleared. Every credited stretch is split into UTC hour
+and day buckets (``split_into_buckets``) and added to them in the session
+store, so the total for any period since ``start`` is at most 24 hour
+buckets plus one day bucket per remaining day. Daily, weekly and monthly
+leaderboards only start over at period boundaries (``period_bounds``), in
+each server's own timezone, while everything before stays in the buckets.
+"""
+import functools
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+PERIODS = ('daily', 'weekly', 'monthly', 'all_time')
+
+
+def period_bounds(period, when, tz=timezone.utc):
+    """Wall-clock ``(start, end)`` of the ``period`` containing ``when``; all-time is ``(-inf, inf)``."""
+    if period == 'all_time':
+        return -math.inf, math.inf
+    local = datetime.fromtimestamp(when, tz)
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'daily':
+        start, end = midnight, midnight + timedelta(days=1)
+    elif period == 'weekly':
+        start = midnight - timedelta(days=local.weekday())  # Weeks start on Monday
+        end = start + timedelta(weeks=1)
+    elif period == 'monthly':
+        start = midnight.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+    else:
+        raise ValueError(f"Unknown leaderboard period {period!r}")
+    return start.timestamp(), end.timestamp()
+
+
+def load_timezone(name):
+    """``ZoneInfo`` for an IANA name such as ``Europe/Berlin``; raises ValueError for unknown names."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone {name!r}") from None
+
+
+@functools.cache
+def timezone_names():
+    return sorted(available_timezones())
+
+
+def split_into_buckets(started, ended, size):
+    """Yield ``(bucket_start, seconds)`` for the stretch ``started``..``ended`` cut at multiples of ``size``."""
+    bucket = started // size * size
+    while bucket < ended:
+        seconds = min(ended, bucket + size) - max(started, bucket)
+        if seconds > 0:
+            yield int(bucket), seconds
+        bucket += size
+
+
+# Sessions are timed with time.monotonic() so clock changes never skew them; the
+# store keeps wall-clock times so sessions and periods survive a restart.
+def to_wall_time(monotonic_time):
+    return time.time() - (time.monotonic() - monotonic_time)
+
+def from_wall_time(wall_time):
+    return time.monotonic() - (time.time() - wall_time)
@@ -0,0 +1,108 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TimerHandle:
+    """A scheduled callback that can be cancelled before it fires."""
+
+    __slots__ = ('when', 'callback', 'cancelled')
+
+    def __init__(self, when, callback):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerScheduler:
+    """Run coroutine callbacks at monotonic deadlines from one background task.
+
+    Deadlines are kept in a heap, so the task sleeps until the earliest one is
+    due instead of every timer polling on its own. Cancelled handles are
+    dropped lazily when they reach the top of the heap.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._running_callbacks = set()
+
+    @staticmethod
+    def time():
+        return time.monotonic()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def is_running(self):
+        return self._task is not None and not self._task.done()
+
+    def call_at(self, when, callback):
+        """Schedule ``callback()`` (a coroutine function) to run at ``when``."""
+        handle = TimerHandle(when, callback)
+        heapq.heappush(self._heap, (when, next(self._counter), handle))
+        if self._heap[0][2] is handle:
+            self._wakeup.set()
+        if not self.is_running():
+            self.start()
+        return handle
+
+    def call_later(self, delay, callback):
+        return self.call_at(self.time() + delay, callback)
+
+    def start(self):
+        if not self.is_running():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - self.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Fire everything that is due in this wakeup.
+            now = self.time()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, handle = heapq.heappop(self._heap)
+                if handle.cancelled:
+                    continue
+                task = loop.create_task(handle.callback())
+                self._running_callbacks.add(task)
+                task.add_done_callback(self._callback_done)
+
+    def _callback_done(self, task):
+        self._running_callbacks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Error in scheduled timer callback", exc_info=task.exception())
@@ -0,0 +1,104 @@
+from bisect import bisect_left
+
+
+class Task:
+    __slots__ = ('id', 'text', 'done')
+
+    def __init__(self, task_id, text, done=False):
+        self.id = task_id
+        self.text = text
+        self.done = done
+
+
+class TodoList:
+    """One user's to-do list with stable task IDs.
+
+    Tasks live in a dict keyed by ID and the number of completed tasks is
+    kept up to date, so marking ``k`` tasks costs O(k) no matter how long the
+    list is. IDs only grow, so a list of them in order doubles as a position
+    index: a page of tasks is found by index, and removing a task is a binary
+    search plus a list delete, which is a memmove of pointers.
+    """
+
+    __slots__ = ('_tasks', '_ids', '_next_id', 'completed')
+
+    def __init__(self, rows=()):
+        """Build a list from ``(task_id, text, done)`` rows."""
+        self._tasks = {}
+        self.completed = 0
+        for task_id, text, done in sorted(rows):
+            self._tasks[task_id] = Task(task_id, text, bool(done))
+            self.completed += bool(done)
+        self._ids = list(self._tasks)
+        self._next_id = max(self._tasks, default=0) + 1
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __iter__(self):
+        return iter(self._tasks.values())
+
+    def tasks_from(self, start):
+        """Iterate over the tasks from the ``start``-th one on, without copying the list."""
+        tasks, ids = self._tasks, self._ids
+        return (tasks[ids[i]] for i in range(start, len(ids)))
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    def add(self, text):
+        task = Task(self._next_id, text)
+        self._tasks[task.id] = task
+        self._ids.append(task.id)
+        self._next_id += 1
+        return task
+
+    def missing(self, task_ids):
+        """The IDs in ``task_ids`` that are not in the list."""
+        return [task_id for task_id in task_ids if task_id not in self._tasks]
+
+    def mark_done(self, task_ids):
+        """Mark the given tasks as done and return them."""
+        marked = []
+        for task_id in task_ids:
+            task = self._tasks[task_id]
+            if not task.done:
+                task.done = True
+                self.completed += 1
+            marked.append(task)
+        return marked
+
+    def remove(self, task_ids):
+        """Remove the given tasks and return them."""
+        removed = []
+        for task_id in task_ids:
+            task = self._tasks.pop(task_id)
+            del self._ids[bisect_left(self._ids, task_id)]
+            self.completed -= task.done
+            removed.append(task)
+        return removed
+
+    def all_done(self):
+        return bool(self._tasks) and self.completed == len(self._tasks)
+
+    def completion_percentage(self):
+        return self.completed / len(self._tasks) * 100 if self._tasks else 0.0
+
+    def take_all(self):
+        """Move every task into a new list and leave this one empty, numbering from 1 again."""
+        taken = TodoList()
+        taken._tasks, taken._ids = self._tasks, self._ids
+        taken.completed, taken._next_id = self.completed, self._next_id
+        self._tasks, self._ids = {}, []
+        self.clear()
+        return taken
+
+    def clear(self):
+        """Empty the list; numbering starts again from 1."""
+        self._tasks.clear()
+        self._ids.clear()
+        self.completed = 0
+        self._next_id = 1
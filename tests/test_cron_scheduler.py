@@ -0,0 +1,118 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from studybot.cron_scheduler import CronSchedule, CronScheduler
+from studybot.study_history import load_timezone
+
+
+def at(*args, tz=timezone.utc):
+    return datetime(*args, tzinfo=tz).timestamp()
+
+
+def test_steps_ranges_and_lists():
+    schedule = CronSchedule('0-30/10 1,13 * * *')
+    assert schedule.minutes == {0, 10, 20, 30}
+    assert schedule.hours == {1, 13}
+
+
+def test_weekday_seven_is_sunday():
+    assert CronSchedule('0 0 * * 7').weekdays == {0}
+
+
+@pytest.mark.parametrize('expression', ['0 0 * *', '60 * * * *', '* 24 * * *', '*/0 * * * *', 'a * * * *', '5-1 * * * *'])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_next_after_is_strictly_later():
+    schedule = CronSchedule('0 */3 * * *')
+    assert schedule.next_after(at(2024, 5, 1, 3, 0)) == at(2024, 5, 1, 6, 0)
+    assert schedule.next_after(at(2024, 5, 1, 22, 59, 59)) == at(2024, 5, 2, 0, 0)
+
+
+def test_next_after_crosses_month_and_year():
+    assert CronSchedule('0 0 1 * *').next_after(at(2024, 12, 15)) == at(2025, 1, 1)
+
+
+def test_february_29_waits_for_leap_year():
+    assert CronSchedule('0 0 29 2 *').next_after(at(2025, 3, 1)) == at(2028, 2, 29)
+
+
+def test_day_of_month_or_weekday():
+    # The 13th, or any Friday: 2024-09-06 is a Friday
+    assert CronSchedule('0 0 13 * 5').next_after(at(2024, 9, 1)) == at(2024, 9, 6)
+
+
+def test_follows_timezone():
+    berlin = load_timezone('Europe/Berlin')
+    assert CronSchedule('0 0 * * *').next_after(at(2024, 1, 10, 12), berlin) == at(2024, 1, 11, tz=berlin)
+
+
+def test_repeated_hour_fires_once_when_clocks_go_back():
+    berlin = load_timezone('Europe/Berlin')
+    schedule = CronSchedule('30 2 * * *')
+    first = schedule.next_after(at(2024, 10, 27, 0, 0), berlin)
+    second = schedule.next_after(first, berlin)
+    assert second - first > 12 * 3600
+
+
+def test_never_fires():
+    with pytest.raises(ValueError):
+        CronSchedule('0 0 31 2 *').next_after(at(2024, 1, 1))
+
+
+class FakeTimers:
+    def __init__(self):
+        self.calls = []
+
+    def call_later(self, delay, callback):
+        handle = SimpleNamespace(delay=delay, callback=callback, cancelled=False)
+        handle.cancel = lambda: setattr(handle, 'cancelled', True)
+        self.calls.append(handle)
+        return handle
+
+
+def test_missed_fire_runs_once_and_reschedules():
+    timers, saved, runs = FakeTimers(), [], []
+
+    async def job():
+        runs.append(1)
+
+    scheduler = CronScheduler(timers, save_next_fire=lambda *args: saved.append(args))
+    scheduler.restore({('reset', 1): time.time() - 3 * 86400})
+    scheduler.add('reset', 1, CronSchedule('0 0 * * *'), job)
+    assert timers.calls[-1].delay == 0.0
+
+    asyncio.run(timers.calls[-1].callback())
+    name, guild_id, next_fire = saved[-1]
+    assert runs == [1] and (name, guild_id) == ('reset', 1)
+    assert time.time() < next_fire <= time.time() + 86400
+    assert scheduler.runs['reset', 'ok'] == 1
+
+
+def test_failing_job_is_counted_and_stays_scheduled():
+    timers = FakeTimers()
+
+    async def job():
+        raise RuntimeError
+
+    scheduler = CronScheduler(timers)
+    scheduler.restore({('reset', 1): time.time() - 1})
+    scheduler.add('reset', 1, CronSchedule('0 0 * * *'), job)
+    asyncio.run(timers.calls[-1].callback())
+    assert scheduler.runs['reset', 'error'] == 1
+    assert len(timers.calls) == 2 and not timers.calls[-1].cancelled
+
+
+def test_remove_forgets_the_saved_fire_time():
+    timers, saved = FakeTimers(), []
+    scheduler = CronScheduler(timers, save_next_fire=lambda *args: saved.append(args))
+    scheduler.add('reset', 1, CronSchedule('0 0 * * *'), None)
+    scheduler.remove('reset', 1)
+    assert timers.calls[-1].cancelled
+    assert saved[-1] == ('reset', 1, None) and len(scheduler) == 0
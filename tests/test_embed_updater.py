@@ -0,0 +1,84 @@
+import asyncio
+import types
+
+import discord
+
+from studybot.embed_updater import EmbedUpdateQueue
+
+
+class FakeMessage:
+    def __init__(self, message_id, channel_id, error=None):
+        self.id = message_id
+        self.channel = types.SimpleNamespace(id=channel_id)
+        self.error = error
+        self.edits = []
+
+    async def edit(self, embed):
+        if self.error is not None:
+            raise self.error
+        self.edits.append(embed)
+
+
+def test_newer_state_replaces_an_unsent_one():
+    message = FakeMessage(1, 10)
+
+    async def main():
+        queue = EmbedUpdateQueue()
+        for state in ('1:00', '0:59', '0:58'):
+            queue.submit(message, state)
+        await asyncio.sleep(0.05)
+        return queue
+
+    queue = asyncio.run(main())
+    assert message.edits == ['0:58']
+    assert queue.stats()['edits_coalesced'] == 2
+    assert queue.stats()['edits_sent'] == 1
+
+
+def test_channel_bucket_paces_edits():
+    messages = [FakeMessage(i, 10) for i in range(4)]
+    other = FakeMessage(99, 11)
+
+    async def main():
+        queue = EmbedUpdateQueue(channel_rate=0.1, channel_burst=2)
+        for message in messages + [other]:
+            queue.submit(message, 'state')
+        await asyncio.sleep(0.05)
+        return queue
+
+    queue = asyncio.run(main())
+    assert sum(len(message.edits) for message in messages) == 2
+    assert other.edits == ['state']  # Another channel is not held up
+    assert len(queue) == 2
+
+
+def test_discarded_edit_is_not_sent():
+    message = FakeMessage(1, 10)
+
+    async def main():
+        queue = EmbedUpdateQueue()
+        queue.submit(message, 'state')
+        queue.discard(message)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert message.edits == []
+
+
+def test_missing_message_calls_on_missing():
+    response = types.SimpleNamespace(status=404, reason='Not Found')
+    message = FakeMessage(1, 10, error=discord.NotFound(response, 'gone'))
+    replaced = []
+
+    async def on_missing():
+        replaced.append(True)
+
+    async def main():
+        queue = EmbedUpdateQueue()
+        queue.submit(message, 'state', on_missing=on_missing)
+        await asyncio.sleep(0.05)
+        return queue
+
+    queue = asyncio.run(main())
+    assert replaced == [True]
+    assert queue.stats()['edits_failed'] == 1
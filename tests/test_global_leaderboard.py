@@ -0,0 +1,54 @@
+import asyncio
+
+from studybot.global_leaderboard import GlobalLeaderboardCache
+
+
+class FakeStore:
+    def __init__(self):
+        self.reads = []
+
+    def global_top(self, k, since):
+        self.reads.append((k, since))
+        return [('a', len(self.reads))]
+
+
+def test_results_are_reused_until_they_expire():
+    store, now = FakeStore(), [0.0]
+    cache = GlobalLeaderboardCache(store.global_top, k=5, ttl=60, clock=lambda: now[0])
+
+    async def run():
+        first = await cache.top('all_time')
+        now[0] = 59
+        second = await cache.top('all_time')
+        now[0] = 61
+        third = await cache.top('all_time')
+        return first, second, third
+
+    assert asyncio.run(run()) == ([('a', 1)], [('a', 1)], [('a', 2)])
+    assert store.reads == [(5, None), (5, None)]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_concurrent_misses_share_one_read():
+    store = FakeStore()
+    cache = GlobalLeaderboardCache(store.global_top, ttl=60)
+
+    async def run():
+        return await asyncio.gather(*(cache.top('weekly') for _ in range(5)))
+
+    assert asyncio.run(run()) == [[('a', 1)]] * 5
+    assert len(store.reads) == 1
+
+
+def test_periods_are_cached_separately():
+    store = FakeStore()
+    cache = GlobalLeaderboardCache(store.global_top, ttl=60)
+
+    async def run():
+        for period in ('daily', 'weekly', 'daily', 'all_time', 'weekly'):
+            await cache.top(period)
+
+    asyncio.run(run())
+    assert len(store.reads) == 3
+    daily, weekly, _ = (since for _, since in store.reads)
+    assert weekly <= daily
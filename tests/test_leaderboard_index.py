@@ -0,0 +1,97 @@
+import random
+
+from studybot.leaderboard_index import LeaderboardIndex, LiveLeaderboard
+
+
+def test_index_orders_and_ranks():
+    index = LeaderboardIndex()
+    index.rebuild({'a': 10, 'b': 30, 'c': 20})
+    index.update('a', 40)
+    index.remove('c')
+    assert index.top(5) == [('a', 40), ('b', 30)]
+    assert index.rank('b') == 2
+    assert index.rank('c') is None
+
+
+def test_equal_scores_share_a_rank():
+    index = LeaderboardIndex()
+    index.rebuild({'a': 5, 'b': 5, 'c': 1})
+    assert index.rank('a') == index.rank('b') == 1
+    assert index.rank('c') == 3
+
+
+def test_top_pages_from_start():
+    index = LeaderboardIndex()
+    index.rebuild({f'user{i}': i for i in range(25)})
+    assert index.top(3, start=10) == [('user14', 14), ('user13', 13), ('user12', 12)]
+    assert index.top(10, start=20) == [(f'user{i}', i) for i in range(4, -1, -1)]
+
+
+def test_update_matches_a_rebuild():
+    updated, rebuilt = LeaderboardIndex(), LeaderboardIndex()
+    scores = {}
+    for step in range(200):
+        user_id, score = f'user{step * 7 % 13}', step * 31 % 97
+        updated.update(user_id, score)
+        scores[user_id] = score
+    rebuilt.rebuild(scores)
+    assert updated.top(len(scores)) == rebuilt.top(len(scores))
+
+
+def test_running_sessions_count_live():
+    board = LiveLeaderboard(clock=lambda: 0)
+    board.update('settled', 100)
+    board.start('runner', 50, started=0)
+    assert board.score('runner', now=30) == 80
+    assert board.top(2, now=30) == [('settled', 100), ('runner', 80)]
+    assert board.top(2, now=70) == [('runner', 120), ('settled', 100)]
+    assert board.rank('runner', now=70) == 1
+    assert board.rank('settled', now=70) == 2
+
+
+def test_live_pages_match_a_full_ranking():
+    board = LiveLeaderboard(clock=lambda: 0)
+    board.rebuild({f's{i}': i * 10 for i in range(10)})
+    for i in range(5):
+        board.start(f'r{i}', i * 7, started=i)
+    full = board.top(len(board), now=20)
+    assert [entry for start in range(0, 15, 4) for entry in board.top(4, start, now=20)] == full
+    assert [score for _, score in full] == sorted((score for _, score in full), reverse=True)
+
+
+def test_stop_settles_the_session():
+    board = LiveLeaderboard(clock=lambda: 0)
+    board.start('a', 0, started=0)
+    board.stop('a', 60)
+    assert not board.is_running('a')
+    assert board.score('a', now=1000) == 60
+    assert len(board) == 1
+
+
+def test_update_while_running_keeps_the_session():
+    board = LiveLeaderboard(clock=lambda: 0)
+    board.start('a', 10, started=0)
+    board.update('a', 40)
+    assert board.score('a', now=5) == 45
+
+
+def test_clear_zeroes_scores_but_keeps_running_sessions():
+    board = LiveLeaderboard(clock=lambda: 0)
+    board.update('settled', 100)
+    board.start('runner', 50, started=0)
+    board.clear(now=100)
+    assert 'settled' not in board
+    assert board.top(5, now=110) == [('runner', 10)]
+
+
+def test_live_pages_from_any_start_match_a_full_merge():
+    rng = random.Random(7)
+    for _ in range(50):
+        board = LiveLeaderboard(clock=lambda: 0)
+        board.rebuild({f's{i}': rng.randrange(0, 50, 5) for i in range(rng.randrange(12))})
+        for i in range(rng.randrange(12)):
+            board.start(f'r{i}', rng.randrange(0, 30, 5), started=rng.randrange(0, 20, 5))
+        full = board.top(len(board) + 1, now=20)
+        assert [score for _, score in full] == sorted((score for _, score in full), reverse=True)
+        for start in range(len(board) + 2):
+            assert board.top(3, start, now=20) == full[start:start + 3]
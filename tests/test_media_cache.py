@@ -0,0 +1,60 @@
+import asyncio
+import os
+
+from studybot.media_cache import CatMediaCache
+
+
+async def no_fetch():
+    return None
+
+
+def cache(directory, **limits):
+    return CatMediaCache(no_fetch, no_fetch, str(directory), pool_size=0, fact_pool_size=0, **limits)
+
+
+def test_memory_overflow_spills_to_disk_and_reads_back(tmp_path):
+    media = cache(tmp_path, memory_bytes=20, disk_bytes=100)
+
+    async def main():
+        for name in ('a', 'b', 'c'):
+            await media.add_media(f'{name}.png', name.encode() * 10)
+        return [await media.get_media() for _ in range(3)]
+
+    served = asyncio.run(main())
+    assert media.spills == 1 and media.memory_used == 20 and media.disk_used == 10
+    assert os.listdir(tmp_path) == ['0-a.png']
+    assert served == [('a.png', b'a' * 10), ('b.png', b'b' * 10), ('c.png', b'c' * 10)]  # Unsent files first
+
+
+def test_disk_overflow_evicts_least_recently_used(tmp_path):
+    media = cache(tmp_path, memory_bytes=10, disk_bytes=10)
+
+    async def main():
+        for name in ('a', 'b', 'c'):
+            await media.add_media(f'{name}.png', name.encode() * 10)
+        return [await media.get_media() for _ in range(3)]
+
+    served = asyncio.run(main())
+    assert media.evictions == 1 and media.disk_used == 10
+    assert os.listdir(tmp_path) == ['1-b.png']
+    assert [filename for filename, _ in served] == ['b.png', 'c.png', 'b.png']  # Reuses the oldest sent one
+
+
+def test_empty_cache_misses(tmp_path):
+    media = cache(tmp_path)
+    assert asyncio.run(media.get_media()) is None
+    assert media.get_fact() is None
+    assert (media.hits, media.misses) == (0, 2)
+
+
+def test_start_clears_files_spilled_by_a_previous_run(tmp_path):
+    (tmp_path / '3-old.gif').write_bytes(b'x')
+    (tmp_path / 'keep.txt').write_bytes(b'x')
+    media = cache(tmp_path)
+
+    async def main():
+        await media.start()
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert os.listdir(tmp_path) == ['keep.txt']
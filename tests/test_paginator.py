@@ -0,0 +1,72 @@
+import asyncio
+
+import discord
+
+from studybot.paginator import PaginatedView
+from studybot.todo_store import TodoList
+
+
+def make_view(items, consumed, page_size=3, **kwargs):
+    def render(start):
+        for item in items[start:]:
+            consumed.append(item)
+            yield item
+
+    return PaginatedView(lambda text: discord.Embed(description=text), render, lambda: len(items),
+                         page_size=page_size, **kwargs)
+
+
+def render(view, page):
+    async def run():
+        view.page = page
+        return view.render_page()
+    return asyncio.run(run())
+
+
+def build(*args, **kwargs):
+    async def run():
+        return make_view(*args, **kwargs)
+    return asyncio.run(run())
+
+
+def test_only_one_page_is_rendered():
+    items, consumed = [f'line {i}' for i in range(10)], []
+    view = build(items, consumed)
+    embed = render(view, 1)
+    assert embed.description == 'line 3\nline 4\nline 5'
+    assert consumed == ['line 3', 'line 4', 'line 5']
+    assert view.page_indicator.label == '2/4'
+
+
+def test_buttons_follow_the_page():
+    view = build(list('abcdefg'), [])
+    render(view, 0)
+    assert view.previous_page.disabled and not view.next_page.disabled
+    render(view, 2)
+    assert view.next_page.disabled and not view.previous_page.disabled
+    assert render(view, 2).description == 'g'
+
+
+def test_page_is_clamped_when_the_list_shrinks():
+    items = list('abcdefg')
+    view = build(items, [])
+    render(view, 2)
+    del items[3:]
+    assert render(view, view.page).description == 'a\nb\nc'
+    assert view.page == 0
+
+
+def test_long_lines_fit_in_one_embed():
+    view = build(['x' * 5000] * 10, [], page_size=10)
+    embed = render(view, 0)
+    assert len(embed.description) <= 4096
+    assert embed.description.split('\n')[0].endswith('…')
+
+
+def test_tasks_from_starts_at_the_given_position():
+    tasks = TodoList()
+    for text in 'abcde':
+        tasks.add(text)
+    tasks.remove([2])
+    assert [task.text for task in tasks.tasks_from(2)] == ['d', 'e']
+    assert list(tasks.tasks_from(10)) == []
@@ -0,0 +1,112 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from studybot.cogs import pomodoro
+from studybot.guild_state import GuildStates
+from studybot.session_store import SessionStore
+from studybot.timer_scheduler import TimerHandle
+
+
+class FakeTimers:
+    def __init__(self):
+        self.now = 1000.0
+        self.handles = []
+
+    def time(self):
+        return self.now
+
+    def call_at(self, when, callback):
+        handle = TimerHandle(when, callback)
+        self.handles.append(handle)
+        return handle
+
+
+class FakeChannel:
+    id = 10
+
+    def __init__(self):
+        self.sent = []
+        self.gate = None  # While set, send() waits for it
+
+    async def send(self, embed):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(embed.title)
+        return SimpleNamespace(id=len(self.sent), channel=self, embeds=[embed])
+
+
+@pytest.fixture
+def timers(monkeypatch, tmp_path):
+    store = SessionStore(str(tmp_path / 'state.db'))
+    timers = FakeTimers()
+    monkeypatch.setattr(pomodoro, 'session_store', store)
+    monkeypatch.setattr(pomodoro, 'guilds', GuildStates(store))
+    monkeypatch.setattr(pomodoro, 'timer_scheduler', timers)
+    monkeypatch.setattr(pomodoro, 'user_timers', {})
+    return timers
+
+
+def start_session(work_minutes=1, break_minutes=5):
+    channel = FakeChannel()
+    message = SimpleNamespace(id=0, channel=channel, embeds=[discord.Embed(title='Pomodoro Timer')])
+    return pomodoro.PomodoroSession(1, 'a', 'Ada', channel, message, work_minutes, break_minutes)
+
+
+def work_seconds():
+    return pomodoro.guilds[1].work_times['a']
+
+
+def test_stop_during_work_returns_the_elapsed_seconds(timers):
+    session = start_session()
+    timers.now += 25.4
+    assert session.stop() == 25
+    assert session.cancelled and all(handle.cancelled for handle in timers.handles)
+
+
+def test_finished_work_phase_is_credited_once(timers):
+    session = start_session()
+    timers.now += 60
+    asyncio.run(session.finish_phase())
+    assert work_seconds() == 60
+    assert session.phase == 'Break' and session.message.embeds[0].title == 'Break Timer'
+    assert session.message.channel.sent == ['Work Session Complete', 'Break Timer']
+    timers.now += 30
+    assert session.stop() == 0
+
+
+def test_stop_while_the_phase_end_is_being_sent_credits_nothing_more(timers):
+    session = start_session()
+    session.channel.gate = asyncio.Event()
+    timers.now += 60
+
+    async def run():
+        finish = asyncio.create_task(session.finish_phase())
+        await asyncio.sleep(0)  # finish_phase is now waiting to send its first message
+        stopped = session.stop()
+        session.channel.gate.set()
+        await finish
+        return stopped
+
+    assert asyncio.run(run()) == 0
+    assert work_seconds() == 60
+    assert all(handle.cancelled for handle in timers.handles)  # The break was never scheduled
+
+
+def test_break_is_saved_before_the_phase_end_messages(timers):
+    session = start_session()
+    session.channel.gate = asyncio.Event()
+    timers.now += 60
+
+    async def run():
+        finish = asyncio.create_task(session.finish_phase())
+        await asyncio.sleep(0)
+        saved = pomodoro.session_store._pomodoro_sessions[1, 'a']
+        session.channel.gate.set()
+        await finish
+        return saved
+
+    saved = asyncio.run(run())
+    assert saved['phase'] == 'Break' and saved['phase_total'] == 5 * 60
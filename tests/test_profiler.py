@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import pytest
+
+from studybot.profiler import Profiler
+
+
+def test_wrap_records_calls_awaits_and_errors():
+    profiler = Profiler()
+
+    async def command(fail):
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        if fail:
+            raise ValueError
+        return 'done'
+
+    wrapped = profiler.wrap('/command', command)
+    assert asyncio.run(wrapped(False)) == 'done'
+    with pytest.raises(ValueError):
+        asyncio.run(wrapped(True))
+
+    stats = profiler.stats['/command']
+    assert (stats.calls, stats.errors, stats.awaits) == (2, 1, 4)
+    assert stats.wall.count == 2
+
+
+def test_time_spent_waiting_is_not_busy_time():
+    profiler = Profiler()
+
+    async def sleeper():
+        await asyncio.sleep(0.05)
+
+    asyncio.run(profiler.wrap('sleeper', sleeper)())
+    stats = profiler.stats['sleeper']
+    assert stats.busy < 0.04
+    assert stats.wall.quantile(1.0) >= 0.05
+
+
+def test_report_ranks_by_busy_time_and_skips_idle_commands():
+    profiler = Profiler()
+
+    async def spin(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    asyncio.run(profiler.wrap('light', spin)(0.001))
+    asyncio.run(profiler.wrap('heavy', spin)(0.02))
+    profiler.wrap('unused', spin)
+    profiler.record_slow_callback('cb', 0.3)
+    profiler.record_slow_callback('cb', 0.2)
+
+    report = profiler.report()
+    assert [stats['name'] for stats in report['hot_paths']] == ['heavy', 'light']
+    assert report['slow_callbacks'] == [{'callback': 'cb', 'count': 2, 'total': 0.5}]
+    assert report['loop_lag'] is None
+    assert profiler.format_report().splitlines()[1].startswith('heavy: 1 calls')
@@ -0,0 +1,67 @@
+import pytest
+
+from studybot.rate_limit import CommandLimiter, TokenBucket, TokenBuckets
+
+
+def test_token_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(rate=2.0, capacity=4)
+    bucket.updated = 0
+    assert all(bucket.try_acquire(now=0) for _ in range(4))
+    assert not bucket.try_acquire(now=0)
+    assert bucket.delay(now=0) == pytest.approx(0.5)
+    assert bucket.try_acquire(now=0.5)
+    assert bucket.delay(now=100, amount=4) == 0
+    assert bucket.tokens == 4
+
+
+def test_token_bucket_drain():
+    bucket = TokenBucket(rate=1.0, capacity=5)
+    bucket.updated = 0
+    bucket.drain(now=0)
+    assert bucket.delay(now=0, amount=2) == pytest.approx(2.0)
+
+
+def test_token_buckets_drop_idle_keys():
+    buckets = TokenBuckets(rate=1.0, capacity=5, idle_after=10)
+    first = buckets.get('a', now=0)
+    buckets.get('b', now=5).try_acquire(now=5)
+    assert buckets.get('a', now=6) is first
+    first.try_acquire(now=6)
+    buckets.get('c', now=14).try_acquire(now=14)  # 'a' was last used at 6, 'b' at 5
+    assert len(buckets) == 3
+    buckets.get('c', now=16.5)
+    assert len(buckets) == 1
+    assert buckets.get('a', now=16.5) is not first
+
+
+def test_command_limiter_user_burst_then_rate():
+    limiter = CommandLimiter(user_rate=0.5, user_burst=2, guild_rate=100, guild_burst=100)
+    assert limiter.acquire(1, 10, now=0) is None
+    assert limiter.acquire(1, 10, now=0) is None
+    scope, delay = limiter.acquire(1, 10, now=0)
+    assert scope == 'user' and delay == pytest.approx(2.0)
+    assert limiter.acquire(2, 10, now=0) is None  # Other users are not affected
+    assert limiter.acquire(1, 10, now=2) is None
+
+
+def test_command_limiter_guild_budget_is_shared():
+    limiter = CommandLimiter(user_rate=1, user_burst=5, guild_rate=1, guild_burst=3)
+    results = [limiter.acquire(user_id, 99, now=0) for user_id in range(4)]
+    assert results[:3] == [None, None, None]
+    assert results[3][0] == 'guild'
+    assert limiter.acquire(4, None, now=0) is None  # Direct messages only count per user
+
+
+def test_command_limiter_limited_call_takes_no_tokens():
+    limiter = CommandLimiter(user_rate=1, user_burst=3, guild_rate=1, guild_burst=1)
+    assert limiter.acquire(1, 99, now=0) is None
+    assert limiter.acquire(1, 99, now=0)[0] == 'guild'
+    assert limiter.acquire(1, None, now=0) is None
+    assert limiter.acquire(1, None, now=0) is None
+    assert limiter.acquire(1, None, now=0)[0] == 'user'
+
+
+def test_command_limiter_cost():
+    limiter = CommandLimiter(user_rate=1, user_burst=3, guild_rate=10, guild_burst=10)
+    assert limiter.acquire(1, None, cost=2, now=0) is None
+    assert limiter.acquire(1, None, cost=2, now=0) == ('user', pytest.approx(1.0))
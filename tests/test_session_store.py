@@ -0,0 +1,185 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from studybot.session_store import SessionStore
+from studybot.todo_store import Task
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / 'state.db'))
+    store.open()
+    yield store
+    asyncio.run(store.close())
+
+
+def reopen(store):
+    again = SessionStore(store.path)
+    again.open()
+    return again
+
+
+def pomodoro(user_id, phase_ends_at, phase='Work', guild_id=1):
+    return {
+        "guild_id": guild_id, "user_id": user_id, "user_name": user_id, "channel_id": 1, "thread_id": None,
+        "phase": phase, "work_minutes": 25, "break_minutes": 5, "phase_total": 1500, "phase_ends_at": phase_ends_at,
+    }
+
+
+def test_nothing_is_written_until_a_flush(store):
+    store.save_work_time(1, 'a', 60)
+    assert reopen(store).load(0)["work_times"] == {}
+    asyncio.run(store.flush())
+    assert reopen(store).load(0)["work_times"] == {(1, 'a'): 60}
+
+
+def test_repeated_updates_collapse_into_one_row(store):
+    for seconds in (60, 120, 180):
+        store.save_work_time(1, 'a', seconds)
+    asyncio.run(store.flush())
+    assert store.rows_written == 1
+    assert reopen(store).load(0)["work_times"] == {(1, 'a'): 180}
+
+
+def test_none_deletes_a_session(store):
+    store.save_voice(1, 'a', (7, 100.0))
+    store.save_voice(1, 'b', (7, 200.0))
+    asyncio.run(store.flush())
+    store.save_voice(1, 'a', None)
+    asyncio.run(store.flush())
+    assert reopen(store).load(0)["voice_sessions"] == {(1, 'b'): (7, 200.0)}
+
+
+def test_load_drops_pomodoro_sessions_that_ended(store):
+    store.save_pomodoro(1, 'running', pomodoro('running', phase_ends_at=1000))
+    store.save_pomodoro(1, 'in_break', pomodoro('in_break', phase_ends_at=900))  # Break runs until 1200
+    store.save_pomodoro(1, 'done', pomodoro('done', phase_ends_at=500))
+    asyncio.run(store.flush())
+    assert sorted(row["user_id"] for row in store.load(1100)["pomodoro_sessions"]) == ['in_break', 'running']
+    assert len(store.load(0)["pomodoro_sessions"]) == 2  # The finished one was deleted
+
+
+def test_load_only_reads_the_guilds_of_its_shards(store):
+    guild_on_shard_0, guild_on_shard_1 = 0 << 22, 1 << 22
+    store.save_work_time(guild_on_shard_0, 'a', 60)
+    store.save_work_time(guild_on_shard_1, 'a', 90)
+    asyncio.run(store.flush())
+    assert store.load(0, shard_count=2, shard_ids=[1])["work_times"] == {(guild_on_shard_1, 'a'): 90}
+    assert len(store.load(0)["work_times"]) == 2
+
+
+def test_failed_flush_is_requeued_without_overwriting_newer_values(store, monkeypatch):
+    store.save_work_time(1, 'a', 60)
+    store.save_work_time(1, 'b', 60)
+
+    def fail(*batch, **kwargs):
+        store.save_work_time(1, 'a', 90)  # Arrives while the batch is being written
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, '_write', fail)
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(store.flush())
+    monkeypatch.undo()
+    asyncio.run(store.flush())
+    assert reopen(store).load(0)["work_times"] == {(1, 'a'): 90, (1, 'b'): 60}
+
+
+def test_load_todo_sees_unflushed_changes(store):
+    read, write = Task(1, 'read'), Task(2, 'write')
+    store.save_task(1, 'a', read)
+    assert asyncio.run(store.load_todo(1, 'a')) == [(1, 'read', False)]
+    asyncio.run(store.flush())
+    read.done = True
+    store.save_task(1, 'a', read)
+    store.save_task(1, 'a', write)
+    assert asyncio.run(store.load_todo(1, 'a')) == [(1, 'read', True), (2, 'write', False)]
+    asyncio.run(store.flush())
+    assert asyncio.run(reopen(store).load_todo(1, 'a')) == [(1, 'read', True), (2, 'write', False)]
+    store.delete_task(1, 'a', 1)
+    assert asyncio.run(store.load_todo(1, 'a')) == [(2, 'write', False)]
+    assert asyncio.run(store.load_todo(2, 'a')) == []
+
+
+def test_clear_then_add_keeps_only_the_new_task(store):
+    for task_id in (1, 2, 3):
+        store.save_task(1, 'a', Task(task_id, f'task {task_id}'))
+    asyncio.run(store.flush())
+    store.clear_todo(1, 'a')
+    store.save_task(1, 'a', Task(1, 'fresh'))
+    assert asyncio.run(store.load_todo(1, 'a')) == [(1, 'fresh', False)]
+    asyncio.run(store.flush())
+    assert asyncio.run(reopen(store).load_todo(1, 'a')) == [(1, 'fresh', False)]
+
+
+def test_period_totals_use_hours_then_days(store):
+    day, hour = 86400, 3600
+    midnight = int(time.time()) // day * day - 5 * day  # Recent enough for the hour buckets to be kept
+    store.record_study(1, 'a', 'study', midnight - 4 * hour, midnight + 2 * hour)
+    store.record_study(1, 'b', 'work', midnight - 2 * day, midnight - 2 * day + hour)
+    asyncio.run(store.flush())
+    evening = midnight - 3 * hour
+    period_times = reopen(store).load_period_times({'today': midnight, 'evening': evening})
+    assert period_times == {'today': {(1, 'a'): 2 * hour}, 'evening': {(1, 'a'): 5 * hour}}
+    assert store.global_top(5, since=evening) == [('a', 300)]
+
+
+def test_period_totals_are_read_per_timezone(store):
+    midnight = int(time.time()) // 86400 * 86400 - 86400
+    store.record_study(1, 'a', 'study', midnight, midnight + 60)
+    store.record_study(2, 'b', 'study', midnight, midnight + 60)
+    store.save_timezone(2, 'Asia/Kolkata')
+    asyncio.run(store.flush())
+    assert store.load_period_times({'daily': midnight}) == {'daily': {(1, 'a'): 60}}
+    assert store.load_period_times({'daily': midnight}, 'Asia/Kolkata') == {'daily': {(2, 'b'): 60}}
+
+
+def test_next_fire_times_survive_a_restart(store):
+    store.save_next_fire('reset', 1, 1000.0)
+    store.save_next_fire('announce', 1, 2000.0)
+    asyncio.run(store.flush())
+    store.save_next_fire('announce', 1, None)
+    asyncio.run(store.flush())
+    assert reopen(store).load(0)['next_fires'] == {('reset', 1): 1000.0}
+
+
+def test_recent_picks_round_trip(store):
+    store.save_recent_picks('quotes', 1, 10, [3, 1, 4])
+    assert asyncio.run(store.load_recent_picks('quotes', 1, 10)) == [3, 1, 4]
+    asyncio.run(store.flush())
+    assert asyncio.run(reopen(store).load_recent_picks('quotes', 1, 10)) == [3, 1, 4]
+    assert asyncio.run(store.load_recent_picks('quotes', 1, 11)) == []
+
+
+def test_load_reports_the_last_heartbeat_of_its_shards(store):
+    store.load(0, shard_count=2, shard_ids=[1])
+    assert store.last_heartbeat is None
+    before = time.time()
+    asyncio.run(store.flush())
+    other = reopen(store)
+    other.load(0, shard_count=2, shard_ids=[0])
+    assert other.last_heartbeat is None
+    other.load(0, shard_count=2, shard_ids=[1])
+    assert before <= other.last_heartbeat <= time.time()
+
+
+def test_load_todo_waits_for_a_flush_in_progress(store, monkeypatch):
+    store.save_task(1, 'a', Task(1, 'read'))
+    write = store._write
+
+    def slow_write(*batch, **kwargs):
+        time.sleep(0.05)  # The rows are neither pending nor in the database yet
+        write(*batch, **kwargs)
+
+    monkeypatch.setattr(store, '_write', slow_write)
+
+    async def run():
+        flush = asyncio.create_task(store.flush())
+        await asyncio.sleep(0)
+        rows = await store.load_todo(1, 'a')
+        await flush
+        return rows
+
+    assert asyncio.run(run()) == [(1, 'read', False)]
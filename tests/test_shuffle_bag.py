@@ -0,0 +1,58 @@
+import asyncio
+
+from studybot.shuffle_bag import ShuffleBag, ShuffleBags
+
+
+def test_no_repeat_within_window():
+    bag = ShuffleBag(size=10, window=6)
+    picks = [bag.pick() for _ in range(200)]
+    for i in range(len(picks) - 6):
+        assert len(set(picks[i:i + 7])) == 7
+
+
+def test_window_is_capped_below_size():
+    bag = ShuffleBag(size=3, window=10)
+    assert bag.window == 2
+    picks = [bag.pick() for _ in range(30)]
+    assert set(picks) == {0, 1, 2}
+
+
+def test_single_item():
+    bag = ShuffleBag(size=1, window=5)
+    assert [bag.pick() for _ in range(3)] == [0, 0, 0]
+
+
+def test_restored_recent_picks_are_honoured():
+    bag = ShuffleBag(size=5, window=3, recent=[0, 1, 2, 7, 2])  # Out-of-range and repeated indices are dropped
+    assert list(bag.recent) == [0, 1, 2]
+    assert bag.pick() in {3, 4}
+
+
+def test_bags_load_once_and_save_every_pick():
+    loads, saves = [], []
+
+    async def load(key):
+        loads.append(key)
+        return [0]
+
+    bags = ShuffleBags(['a', 'b', 'c'], window=2, load=load, save=lambda key, recent: saves.append((key, recent)))
+
+    async def run():
+        return [await bags.pick(key) for key in ('x', 'x', 'y')]
+
+    picks = asyncio.run(run())
+    assert picks[0] != 'a' and picks[1] not in {'a', picks[0]}
+    assert loads == ['x', 'y']
+    assert [key for key, _ in saves] == ['x', 'x', 'y']
+    assert saves[1][1] == [bags.items.index(picks[0]), bags.items.index(picks[1])]
+
+
+def test_bags_drop_least_recently_used():
+    bags = ShuffleBags(['a', 'b'], window=1, max_bags=2)
+
+    async def run():
+        for key in ('x', 'y', 'x', 'z'):
+            await bags.pick(key)
+
+    asyncio.run(run())
+    assert list(bags._bags) == ['x', 'z']
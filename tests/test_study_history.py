@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from studybot.study_history import load_timezone, period_bounds, split_into_buckets
+
+
+def at(*args, tz=timezone.utc):
+    return datetime(*args, tzinfo=tz).timestamp()
+
+
+def test_daily_weekly_monthly_bounds():
+    when = at(2024, 2, 29, 15, 30)  # A Thursday
+    assert period_bounds('daily', when) == (at(2024, 2, 29), at(2024, 3, 1))
+    assert period_bounds('weekly', when) == (at(2024, 2, 26), at(2024, 3, 4))
+    assert period_bounds('monthly', when) == (at(2024, 2, 1), at(2024, 3, 1))
+
+
+def test_all_time_is_unbounded():
+    start, end = period_bounds('all_time', at(2024, 1, 1))
+    assert start == float('-inf') and end == float('inf')
+
+
+def test_bounds_follow_the_timezone():
+    kolkata = load_timezone('Asia/Kolkata')
+    when = at(2024, 6, 30, 20, 0)  # Already 1 July in India
+    assert period_bounds('daily', when, kolkata) == (at(2024, 7, 1, tz=kolkata), at(2024, 7, 2, tz=kolkata))
+    assert period_bounds('monthly', when, kolkata)[0] == at(2024, 7, 1, tz=kolkata)
+
+
+def test_day_with_a_clock_change_is_23_hours():
+    berlin = load_timezone('Europe/Berlin')
+    start, end = period_bounds('daily', at(2024, 3, 31, 12, tz=berlin), berlin)
+    assert end - start == 23 * 3600
+
+
+def test_unknown_period_and_timezone():
+    with pytest.raises(ValueError):
+        period_bounds('yearly', at(2024, 1, 1))
+    with pytest.raises(ValueError):
+        load_timezone('Mars/Olympus_Mons')
+
+
+def test_split_into_buckets():
+    assert list(split_into_buckets(3500, 7300, 3600)) == [(0, 100), (3600, 3600), (7200, 100)]
+    assert list(split_into_buckets(10, 10, 3600)) == []
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from studybot.cogs import study
+from studybot.guild_state import GuildStates
+from studybot.session_store import SessionStore
+
+STUDY_ROOM, OTHER_ROOM = 10, 11
+
+
+def voice(channel_id):
+    return SimpleNamespace(channel=SimpleNamespace(id=channel_id) if channel_id else None)
+
+
+class PublicGuild:
+    """Only what discord.py documents: per-channel voice states and ``Member.voice``."""
+
+    id = 1
+
+    def __init__(self, rooms):
+        self.rooms = rooms  # Channel ID -> {member ID: voice state}
+
+    def get_channel(self, channel_id):
+        members = self.rooms.get(channel_id)
+        return None if members is None else SimpleNamespace(id=channel_id, voice_states=members)
+
+    def get_member(self, member_id):
+        for channel_id, members in self.rooms.items():
+            if member_id in members:
+                return SimpleNamespace(id=member_id, bot=False, voice=members[member_id])
+        return SimpleNamespace(id=member_id, bot=False, voice=None)
+
+
+class CachedGuild(PublicGuild):
+    """Also keeps discord.py's guild-wide voice state cache."""
+
+    def __init__(self, rooms):
+        super().__init__(rooms)
+        self._voice_states = {member_id: state for members in rooms.values() for member_id, state in members.items()}
+
+    def get_channel(self, channel_id):
+        raise AssertionError("the guild's voice state cache should be read instead")
+
+
+@pytest.fixture
+def state(monkeypatch, tmp_path):
+    store = SessionStore(str(tmp_path / 'state.db'))
+    states = GuildStates(store)
+    monkeypatch.setattr(study, 'session_store', store)
+    monkeypatch.setattr(study, 'guilds', states)
+    state = states[1]
+    state.tracked_channels.add(STUDY_ROOM)
+    state.start_voice_session('2', STUDY_ROOM, time.monotonic() - 120)  # Left while the bot was away
+    state.start_voice_session('4', STUDY_ROOM, time.monotonic() - 60)  # Still there
+    return state
+
+
+@pytest.mark.parametrize('guild_class', [PublicGuild, CachedGuild])
+def test_reconcile_starts_and_ends_sessions(state, guild_class):
+    guild = guild_class({
+        STUDY_ROOM: {1: voice(STUDY_ROOM), 4: voice(STUDY_ROOM)},
+        OTHER_ROOM: {3: voice(OTHER_ROOM)},
+    })
+    cog = study.Study(SimpleNamespace(guilds=[guild]))
+    asyncio.run(cog.reconcile_voice_sessions())
+    assert set(state.voice_channels) == {'1', '4'}
+    assert state.study_times['2'] == pytest.approx(120, abs=2)
+    assert '4' not in state.study_times
@@ -0,0 +1,83 @@
+import asyncio
+
+from studybot.timer_scheduler import TimerScheduler
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_callbacks_fire_in_deadline_order():
+    fired = []
+
+    async def main():
+        timers = TimerScheduler()
+        now = timers.time()
+        for delay, name in ((0.03, 'c'), (0.01, 'a'), (0.02, 'b')):
+            timers.call_at(now + delay, lambda name=name: record(name))
+        await asyncio.sleep(0.08)
+        await timers.stop()
+
+    async def record(name):
+        fired.append(name)
+
+    run(main())
+    assert fired == ['a', 'b', 'c']
+
+
+def test_cancelled_handles_do_not_fire():
+    fired = []
+
+    async def record():
+        fired.append(True)
+
+    async def main():
+        timers = TimerScheduler()
+        handle = timers.call_later(0.01, record)
+        handle.cancel()
+        await asyncio.sleep(0.05)
+        await timers.stop()
+
+    run(main())
+    assert fired == []
+
+
+def test_earlier_deadline_wakes_the_sleeping_task():
+    fired = []
+
+    async def record():
+        fired.append(asyncio.get_running_loop().time())
+
+    async def main():
+        timers = TimerScheduler()
+        timers.call_later(10, record)
+        await asyncio.sleep(0.01)  # The task is now sleeping until the far deadline
+        started = asyncio.get_running_loop().time()
+        timers.call_later(0.01, record)
+        await asyncio.sleep(0.05)
+        await timers.stop()
+        return started
+
+    started = run(main())
+    assert len(fired) == 1 and fired[0] - started < 0.04
+
+
+def test_failing_callback_does_not_stop_the_scheduler():
+    fired = []
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def record():
+        fired.append(True)
+
+    async def main():
+        timers = TimerScheduler()
+        timers.call_later(0.01, fail)
+        timers.call_later(0.02, record)
+        await asyncio.sleep(0.05)
+        assert timers.is_running()
+        await timers.stop()
+
+    run(main())
+    assert fired == [True]
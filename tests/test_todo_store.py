@@ -0,0 +1,58 @@
+from studybot.todo_store import TodoList
+
+
+def test_ids_stay_stable_when_tasks_are_removed():
+    tasks = TodoList()
+    for text in ('read', 'write', 'revise'):
+        tasks.add(text)
+    tasks.remove([2])
+    added = tasks.add('rest')
+    assert [(task.id, task.text) for task in tasks] == [(1, 'read'), (3, 'revise'), (4, 'rest')]
+    assert added.id == 4
+
+
+def test_ids_continue_after_the_highest_loaded_one():
+    tasks = TodoList([(2, 'read', False), (7, 'write', True)])
+    assert tasks.add('revise').id == 8
+    assert tasks.completed == 1
+
+
+def test_mark_done_counts_each_task_once():
+    tasks = TodoList([(1, 'read', False), (2, 'write', False)])
+    tasks.mark_done([1])
+    tasks.mark_done([1])
+    assert tasks.completed == 1
+    assert tasks.completion_percentage() == 50.0
+    assert not tasks.all_done()
+    tasks.mark_done([2])
+    assert tasks.all_done()
+
+
+def test_removing_a_done_task_updates_the_count():
+    tasks = TodoList([(1, 'read', True), (2, 'write', False)])
+    tasks.remove([1])
+    assert tasks.completed == 0 and len(tasks) == 1
+
+
+def test_missing_ids():
+    tasks = TodoList([(1, 'read', False), (3, 'write', False)])
+    assert tasks.missing([1, 2, 3, 4]) == [2, 4]
+
+
+def test_clear_restarts_numbering():
+    tasks = TodoList([(5, 'read', True)])
+    tasks.clear()
+    assert len(tasks) == 0 and tasks.completed == 0
+    assert tasks.add('write').id == 1
+    assert tasks.completion_percentage() == 0.0
+
+
+def test_tasks_from_jumps_to_the_position_after_removals():
+    tasks = TodoList([(task_id, f'task {task_id}', False) for task_id in range(1, 11)])
+    tasks.remove([2, 5, 9])
+    tasks.add('new')
+    assert [task.id for task in tasks.tasks_from(0)] == [1, 3, 4, 6, 7, 8, 10, 11]
+    assert [task.id for task in tasks.tasks_from(5)] == [8, 10, 11]
+    taken = tasks.take_all()
+    assert [task.id for task in taken.tasks_from(6)] == [10, 11]
+    assert list(tasks.tasks_from(0)) == []